@@ -0,0 +1,27 @@
+"""Cost of projecting rotation curves to beam-smeared velocity fields."""
+import numpy as np
+
+from galactic_dynamics.forward_model import SkyProjection
+
+from .common import radial_grid
+
+
+class VelocityFieldProjection:
+    params = ([128, 512], [1, 16])
+    param_names = ["map_size", "n_models"]
+
+    def setup(self, map_size, n_models):
+        self.r = radial_grid(1000)
+        self.v = np.tile(2e5 * np.tanh(self.r / 6e19), (n_models, 1))
+        pixel_scale = 2 * self.r[-1] / map_size
+        self.sharp = SkyProjection(self.r, (map_size, map_size), pixel_scale, 60.0, 30.0)
+        self.smeared = SkyProjection(self.r, (map_size, map_size), pixel_scale, 60.0, 30.0, beam=4 * pixel_scale)
+
+    def time_project(self, map_size, n_models):
+        self.sharp.project(self.v)
+
+    def time_beam_smeared(self, map_size, n_models):
+        self.smeared(self.v)
+
+    def peakmem_beam_smeared(self, map_size, n_models):
+        self.smeared(self.v)
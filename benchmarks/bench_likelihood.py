@@ -0,0 +1,26 @@
+"""Vectorized likelihood against per-walker solves."""
+import numpy as np
+from galactic_dynamics.likelihood import RotationCurveLikelihood
+from galactic_dynamics.velocity_solver import solve_velocity
+
+from .common import parameter_batch, radial_grid
+
+
+class EnsembleLikelihood:
+    params = [16, 64, 256]
+    param_names = ["n_walkers"]
+    timeout = 300
+
+    def setup(self, n_walkers):
+        galaxy, gas = parameter_batch(n_walkers)
+        self.theta = np.hstack([galaxy, gas])
+        self.r = radial_grid(50)
+        v_obs = np.full(len(self.r), 2e5)
+        self.likelihood = RotationCurveLikelihood(self.r, v_obs, 1e4)
+
+    def time_vectorized(self, n_walkers):
+        self.likelihood(self.theta)
+
+    def time_per_walker_loop(self, n_walkers):
+        for theta in self.theta:
+            solve_velocity(self.r, tuple(theta[:6]), tuple(theta[6:]))
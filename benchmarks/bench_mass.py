@@ -0,0 +1,38 @@
+"""Cost of the enclosed-mass integration."""
+from galactic_dynamics.mass_models import MassProfile, enclosed_mass
+
+from .common import GALAXY_PARAMS, radial_grid
+
+
+class EnclosedMass:
+    params = ([100, 1000, 10000], [1000, 10000, 100000])
+    param_names = ["n_radii", "n_grid"]
+
+    def setup(self, n_radii, n_grid):
+        self.galaxy_params = GALAXY_PARAMS
+        self.r = radial_grid(n_radii)
+
+    def time_enclosed_mass(self, n_radii, n_grid):
+        enclosed_mass(self.r, self.galaxy_params, n_grid=n_grid)
+
+    def peakmem_enclosed_mass(self, n_radii, n_grid):
+        enclosed_mass(self.r, self.galaxy_params, n_grid=n_grid)
+
+
+class MassProfileTable:
+    params = [1000, 4000, 16000]
+    param_names = ["n_grid"]
+
+    def setup(self, n_grid):
+        self.galaxy_params = GALAXY_PARAMS
+        self.profile = MassProfile(self.galaxy_params, n_grid=n_grid)
+        self.r = radial_grid(10000)
+
+    def time_build(self, n_grid):
+        MassProfile(self.galaxy_params, n_grid=n_grid)
+
+    def time_lookup_scalar(self, n_grid):
+        self.profile(self.r[5000])
+
+    def time_lookup_grid(self, n_grid):
+        self.profile(self.r)
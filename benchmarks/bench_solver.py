@@ -0,0 +1,48 @@
+"""Wall time, RHS evaluations and memory of the velocity solvers."""
+from galactic_dynamics.velocity_solver import get_force_table, solve_velocity
+from galactic_dynamics.mass_models import get_mass_profile
+
+from .common import GALAXY_PARAMS, GAS_PARAMS, CountingForceTable, radial_grid
+
+
+class SolveVelocity:
+    params = (["rk4", "odeint", "adaptive"], [100, 1000, 10000])
+    param_names = ["method", "n_radii"]
+    timeout = 300
+
+    def setup(self, method, n_radii):
+        self.galaxy_params, self.gas_params = GALAXY_PARAMS, GAS_PARAMS
+        self.r = radial_grid(n_radii)
+        # Warm the mass and force caches so repeated solves measure the integrator
+        get_mass_profile(self.galaxy_params)
+        get_force_table(self.gas_params)
+
+    def time_solve_velocity(self, method, n_radii):
+        solve_velocity(self.r, self.galaxy_params, self.gas_params, method=method)
+
+    def peakmem_solve_velocity(self, method, n_radii):
+        solve_velocity(self.r, self.galaxy_params, self.gas_params, method=method)
+
+    def track_rhs_evaluations(self, method, n_radii):
+        table = CountingForceTable(get_force_table(self.gas_params))
+        solve_velocity(self.r, self.galaxy_params, self.gas_params, method=method, force_table=table)
+        return table.calls
+
+    track_rhs_evaluations.unit = "evaluations"
+
+
+class SolveVelocityCold:
+    """Solves that include building the mass and force tables."""
+    params = [100, 1000, 10000]
+    param_names = ["n_radii"]
+
+    def setup(self, n_radii):
+        self.galaxy_params, self.gas_params = GALAXY_PARAMS, GAS_PARAMS
+        self.r = radial_grid(n_radii)
+
+    def time_solve_velocity_rk4(self, n_radii):
+        from galactic_dynamics.mass_models import _cached_mass_profile
+        from galactic_dynamics.velocity_solver import _cached_force_table
+        _cached_mass_profile.cache_clear()
+        _cached_force_table.cache_clear()
+        solve_velocity(self.r, self.galaxy_params, self.gas_params, method="rk4")
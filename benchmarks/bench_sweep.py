@@ -0,0 +1,56 @@
+"""Throughput of batched and parallel multi-model solves."""
+from galactic_dynamics.parameter_sweep import sweep
+from galactic_dynamics.velocity_solver import solve_velocity_batch
+
+from .common import parameter_batch, radial_grid
+
+
+class BatchThroughput:
+    params = ([10, 100, 1000], [100, 1000])
+    param_names = ["n_models", "n_radii"]
+    timeout = 300
+
+    def setup(self, n_models, n_radii):
+        self.galaxy_params, self.gas_params = parameter_batch(n_models)
+        self.r = radial_grid(n_radii)
+
+    def time_solve_velocity_batch(self, n_models, n_radii):
+        solve_velocity_batch(self.r, self.galaxy_params, self.gas_params)
+
+    def peakmem_solve_velocity_batch(self, n_models, n_radii):
+        solve_velocity_batch(self.r, self.galaxy_params, self.gas_params)
+
+
+class SweepThroughput:
+    params = ([100, 1000], [1, 2, 4])
+    param_names = ["n_models", "n_workers"]
+    timeout = 300
+
+    def setup(self, n_models, n_workers):
+        self.galaxy_params, self.gas_params = parameter_batch(n_models)
+        self.r = radial_grid(1000)
+
+    def time_sweep(self, n_models, n_workers):
+        sweep(self.r, self.galaxy_params, self.gas_params, n_workers=n_workers)
+
+    def track_models_per_second(self, n_models, n_workers):
+        import time
+        start = time.perf_counter()
+        sweep(self.r, self.galaxy_params, self.gas_params, n_workers=n_workers)
+        return n_models / (time.perf_counter() - start)
+
+    track_models_per_second.unit = "models/s"
+
+
+class ExecutorThroughput:
+    """Thread against process backend of `sweep` from small to large batches."""
+    params = ([16, 256, 4096], [100, 1000], ["thread", "process"])
+    param_names = ["n_models", "n_radii", "executor"]
+    timeout = 600
+
+    def setup(self, n_models, n_radii, executor):
+        self.galaxy_params, self.gas_params = parameter_batch(n_models)
+        self.r = radial_grid(n_radii)
+
+    def time_sweep(self, n_models, n_radii, executor):
+        sweep(self.r, self.galaxy_params, self.gas_params, n_workers=4, executor=executor)
@@ -0,0 +1,34 @@
+"""Shared inputs for the benchmark suite."""
+import numpy as np
+from galactic_dynamics.constants import M_sun, pc
+
+# The galaxy and gas of the test suite. The solutions for
+# data/example_galaxy_parameters.json overflow within the first steps, so
+# timing them would measure inf/NaN arithmetic rather than the solvers.
+GALAXY_PARAMS = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+GAS_PARAMS = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+
+
+def radial_grid(n):
+    """Log-spaced radii from 100 pc to 50 kpc, where the curves of GALAXY_PARAMS stay finite."""
+    return np.geomspace(100*pc, 50e3*pc, n)
+
+
+def parameter_batch(n_models):
+    """Tile GALAXY_PARAMS and GAS_PARAMS into a batch with component masses varied by +-20%."""
+    galaxy = np.tile(GALAXY_PARAMS, (n_models, 1))
+    galaxy[:, 1::2] *= np.linspace(0.8, 1.2, n_models)[:, None]
+    gas = np.tile(GAS_PARAMS, (n_models, 1))
+    return galaxy, gas
+
+
+class CountingForceTable:
+    """Wrap a ForceTable and count how often the integrator evaluates the RHS."""
+
+    def __init__(self, table):
+        self.table = table
+        self.calls = 0
+
+    def __call__(self, r, v):
+        self.calls += 1
+        return self.table(r, v)
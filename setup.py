@@ -29,7 +29,12 @@ setup(
         "matplotlib>=3.1.0",
     ],
     extras_require={
-        "dev": ["pytest>=6.0", "sphinx>=3.0"],
+        "dev": ["pytest>=6.0", "sphinx>=3.0", "asv>=0.6"],
+        "fast": ["numba>=0.57"],
+        "parquet": ["pyarrow>=10.0"],
+    },
+    entry_points={
+        "console_scripts": ["galactic-dynamics=galactic_dynamics.cli:main"],
     },
     license="CC BY-NC-SA 4.0",
     license_files=("LICENSE",),
@@ -1,23 +1,68 @@
-from .mass_models import mass_density, enclosed_mass
-from .gas_models import gas_density, pressure_gradient, turbulence_pressure
-from .magnetic_models import magnetic_field_strength, magnetic_pressure
-from .cosmic_ray_models import cosmic_ray_pressure
-from .velocity_solver import solve_velocity
+import importlib
 
 __version__ = "0.1.0"
-__all__ = [
-    "mass_density",
-    "enclosed_mass",
-    "gas_density",
-    "pressure_gradient",
-    "turbulence_pressure",
-    "magnetic_field_strength",
-    "magnetic_pressure",
-    "cosmic_ray_pressure",
-    "solve_velocity",
-    "kpc_to_m",
-    "m_to_kpc",
-    "km_s_to_m_s",
-    "m_s_to_km_s",
-    "calculate_circular_velocity",
-]
\ No newline at end of file
+
+# Public names and the submodules defining them. Submodules are imported on
+# first attribute access, so `import galactic_dynamics` stays cheap and scipy
+# is only loaded by the functions that need it.
+_EXPORTS = {
+    "mass_density": "mass_models",
+    "enclosed_mass": "mass_models",
+    "MassProfile": "mass_models",
+    "MassModel": "profiles",
+    "Component": "profiles",
+    "TabulatedComponent": "profiles",
+    "register_component": "profiles",
+    "gas_density": "gas_models",
+    "pressure_gradient": "gas_models",
+    "turbulence_pressure": "gas_models",
+    "magnetic_field_strength": "magnetic_models",
+    "magnetic_pressure": "magnetic_models",
+    "cosmic_ray_pressure": "cosmic_ray_models",
+    "solve_velocity": "velocity_solver",
+    "solve_velocity_batch": "velocity_solver",
+    "IncrementalSolver": "incremental",
+    "SolverState": "checkpoint",
+    "SkyProjection": "forward_model",
+    "BeamKernel": "forward_model",
+    "velocity_field": "forward_model",
+    "ForceTable": "velocity_solver",
+    "SplineProfile": "gradients",
+    "radial_gradient": "gradients",
+    "sweep": "parameter_sweep",
+    "profile_solver": "profiling",
+    "SolverProfile": "profiling",
+    "write_results": "storage",
+    "open_results": "storage",
+    "fit_rotation_curve": "fitting",
+    "RotationCurveLikelihood": "likelihood",
+    "RotationCurveEmulator": "emulator",
+    "DiskCache": "cache",
+    "AsyncSolver": "aio",
+    "solve_velocity_async": "aio",
+    "enclosed_mass_async": "aio",
+    "GalaxyParams": "parameters",
+    "GasParams": "parameters",
+    "GalaxyBatch": "parameters",
+    "GasBatch": "parameters",
+    "load_parameters": "parameters",
+    "save_parameters": "parameters",
+    "kpc_to_m": "utils",
+    "m_to_kpc": "utils",
+    "km_s_to_m_s": "utils",
+    "m_s_to_km_s": "utils",
+    "calculate_circular_velocity": "utils",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,229 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .cache import DiskCache
+from .mass_models import enclosed_mass
+from .velocity_solver import solve_velocity, solve_velocity_batch
+
+class _Batch:
+    """Requests for one radial grid and solver configuration waiting to be solved together."""
+
+    def __init__(self, r, method, options):
+        self.r = r
+        self.method = method
+        self.options = options
+        self.requests = []
+        self.timer = None
+
+class AsyncSolver:
+    """
+    Asyncio front end to `solve_velocity` and `enclosed_mass`.
+    
+    Computations run in a bounded executor so the event loop stays
+    responsive. Concurrent requests with identical inputs are coalesced: the
+    first starts the computation and the others await the same result.
+    
+    With `batch_window` set, single-model `solve_velocity` requests that share
+    a radial grid, method and options and arrive within `batch_window`
+    seconds of each other are grouped into one `solve_velocity_batch` call.
+    A batch is solved early once it holds `max_batch_size` requests. Batched
+    curves come from the batched mass and force tables, and 'adaptive' and
+    'odeint' take one step size for the whole batch, so they agree with
+    individual solves to the accuracy of the tables and the solver
+    tolerance. If a batch fails, its requests are solved one by one and only
+    the failing ones raise.
+    
+    Every caller receives its own copy of the result. Use the solver as an
+    async context manager, or call `aclose`, to flush waiting batches and
+    shut down the executor it created.
+    
+    Args:
+        max_workers (int): Threads of the executor created when none is given.
+        executor (Executor, optional): Executor to run computations in; it
+            is not shut down by `aclose`.
+        batch_window (float, optional): Micro-batching window in seconds.
+            Requests are solved one by one if None.
+        max_batch_size (int): Largest micro-batch.
+    
+    Attributes:
+        stats (dict): Counts of 'requests', 'coalesced' requests, executor
+            'computations' and micro-'batches'.
+    """
+
+    def __init__(self, max_workers=4, executor=None, batch_window=None, max_batch_size=64):
+        self._owns_executor = executor is None
+        self._executor = ThreadPoolExecutor(max_workers) if executor is None else executor
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.stats = {'requests': 0, 'coalesced': 0, 'computations': 0, 'batches': 0}
+        self._pending = {}
+        self._batches = {}
+        self._tasks = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _run(self, function, *args, **kwargs):
+        """Run `function` in the executor."""
+        self.stats['computations'] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def _coalesced(self, key, compute):
+        """Await the computation for `key`, starting it with `compute()` unless one is already running."""
+        self.stats['requests'] += 1
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(compute())
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self.stats['coalesced'] += 1
+        # Shielded so that a cancelled caller does not cancel the others
+        result = await asyncio.shield(future)
+        return np.copy(result)
+
+    async def solve_velocity(self, r, galaxy_params, gas_params, method='rk4', **options):
+        """
+        Asynchronous `solve_velocity`.
+        
+        Args:
+            r (array): Radial distances in meters.
+            galaxy_params (tuple or array): Galaxy parameters.
+            gas_params (tuple or array): Gas parameters.
+            method (str): Integration method.
+            **options: Extra keyword options passed to the solver.
+        
+        Returns:
+            array: Velocities in m/s.
+        """
+        r = np.asarray(r, dtype=float)
+        key = DiskCache.key("solve_velocity", r, (galaxy_params, gas_params), method=method, options=options)
+        if self.batch_window is None or np.ndim(galaxy_params) != 1:
+            compute = functools.partial(self._run, solve_velocity, r, galaxy_params, gas_params, method, **options)
+        else:
+            compute = functools.partial(self._batched, r, galaxy_params, gas_params, method, options)
+        return await self._coalesced(key, compute)
+
+    async def enclosed_mass(self, r, params, **options):
+        """
+        Asynchronous `enclosed_mass`.
+        
+        Args:
+            r (float or array): Radial distance(s) in meters.
+            params (tuple): Galaxy parameters.
+            **options: Extra keyword options passed to `enclosed_mass`.
+        
+        Returns:
+            array: Enclosed mass in kg.
+        """
+        key = DiskCache.key("enclosed_mass", r, (params,), options=options)
+        return await self._coalesced(key, functools.partial(self._run, enclosed_mass, r, params, **options))
+
+    async def _batched(self, r, galaxy_params, gas_params, method, options):
+        """Queue one model in the micro-batch of its grid and configuration and await its curve."""
+        # Validated here so that a malformed request fails alone instead of the whole batch
+        galaxy_params = np.asarray(galaxy_params, dtype=float)
+        gas_params = np.asarray(gas_params, dtype=float)
+        if galaxy_params.shape != (6,) or gas_params.shape != (10,):
+            raise ValueError(f"Expected galaxy_params of shape (6,) and gas_params of shape (10,), got "
+                             f"{galaxy_params.shape} and {gas_params.shape}.")
+        loop = asyncio.get_running_loop()
+        group = DiskCache.key("batch", r, (), method=method, options=options)
+        batch = self._batches.get(group)
+        if batch is None:
+            batch = self._batches[group] = _Batch(r, method, options)
+            batch.timer = loop.call_later(self.batch_window, self._flush, group)
+        future = loop.create_future()
+        batch.requests.append((galaxy_params, gas_params, future))
+        if len(batch.requests) >= self.max_batch_size:
+            self._flush(group)
+        return await future
+
+    def _flush(self, group):
+        """Start solving the micro-batch `group`."""
+        batch = self._batches.pop(group, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        task = asyncio.ensure_future(self._solve_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _solve_batch(self, batch):
+        galaxy_params = np.array([request[0] for request in batch.requests])
+        gas_params = np.array([request[1] for request in batch.requests])
+        self.stats['batches'] += 1
+        try:
+            v = await self._run(solve_velocity_batch, batch.r, galaxy_params, gas_params, batch.method,
+                                **batch.options)
+        except Exception:
+            # Solve the requests one by one so that only the failing ones get the exception
+            await asyncio.gather(*(self._solve_request(batch, *request) for request in batch.requests))
+            return
+        for i, (_, _, future) in enumerate(batch.requests):
+            if not future.done():
+                future.set_result(v[i])
+
+    async def _solve_request(self, batch, galaxy_params, gas_params, future):
+        """Solve one request of a failed micro-batch on its own."""
+        try:
+            v = await self._run(solve_velocity, batch.r, galaxy_params, gas_params, batch.method, **batch.options)
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            if not future.done():
+                future.set_result(v)
+
+    async def aclose(self):
+        """Solve the waiting micro-batches, wait for running work and shut down the owned executor."""
+        for group in list(self._batches):
+            self._flush(group)
+        await asyncio.gather(*self._tasks, *self._pending.values(), return_exceptions=True)
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+# Solver behind the module-level functions, created on first use
+_default_solver = None
+
+def _get_default_solver():
+    global _default_solver
+    if _default_solver is None:
+        _default_solver = AsyncSolver()
+    return _default_solver
+
+async def solve_velocity_async(r, galaxy_params, gas_params, method='rk4', **options):
+    """
+    Asynchronous `solve_velocity` on a shared `AsyncSolver` without
+    micro-batching.
+    
+    Args:
+        r (array): Radial distances in meters.
+        galaxy_params (tuple or array): Galaxy parameters.
+        gas_params (tuple or array): Gas parameters.
+        method (str): Integration method.
+        **options: Extra keyword options passed to the solver.
+    
+    Returns:
+        array: Velocities in m/s.
+    """
+    return await _get_default_solver().solve_velocity(r, galaxy_params, gas_params, method, **options)
+
+async def enclosed_mass_async(r, params, **options):
+    """
+    Asynchronous `enclosed_mass` on a shared `AsyncSolver`.
+    
+    Args:
+        r (float or array): Radial distance(s) in meters.
+        params (tuple): Galaxy parameters.
+        **options: Extra keyword options passed to `enclosed_mass`.
+    
+    Returns:
+        array: Enclosed mass in kg.
+    """
+    return await _get_default_solver().enclosed_mass(r, params, **options)
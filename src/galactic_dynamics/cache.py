@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+from . import __version__
+from .mass_models import enclosed_mass
+from .velocity_solver import solve_velocity
+
+# Directory used when none is given and GALACTIC_DYNAMICS_CACHE is not set
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "galactic_dynamics")
+
+# Eviction shrinks the cache to this fraction of `max_bytes`, so that the
+# directory is not rescanned on every write once the cache is full
+_LOW_WATER = 0.9
+
+def _encode(value):
+    """JSON encoding of the non-JSON values accepted in cache keys."""
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        return {'dtype': array.dtype.str, 'shape': array.shape, 'sha256': hashlib.sha256(array.tobytes()).hexdigest()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot use a value of type {type(value).__name__} in a cache key.")
+
+class DiskCache:
+    """
+    Content-addressed on-disk cache of `solve_velocity` and `enclosed_mass`
+    results.
+    
+    Each result is stored as a `.npy` file named by the SHA-256 hash of
+    everything that determines it: the function, the radial grid, the
+    parameters, the solver method and options, and the package version.
+    Files are written to a temporary name and moved into place with
+    `os.replace`, so concurrent processes sharing a cache directory never see
+    partial results. Reading a file refreshes its modification time, and when
+    the cache grows beyond `max_bytes` the least recently used files are
+    deleted. The size is tracked incrementally from the writes of this
+    instance and the directory is only scanned when that estimate passes the
+    cap, so files written by other processes in the meantime are counted at
+    the next scan.
+    
+    Args:
+        directory (str, optional): Cache directory. Defaults to the
+            GALACTIC_DYNAMICS_CACHE environment variable, or
+            ~/.cache/galactic_dynamics.
+        max_bytes (int): Size cap of the cache in bytes.
+    
+    Attributes:
+        hits (int): Lookups served from disk by this instance.
+        misses (int): Lookups that had to be computed.
+        evictions (int): Files deleted to respect the size cap.
+    """
+
+    def __init__(self, directory=None, max_bytes=2**30):
+        if directory is None:
+            directory = os.environ.get("GALACTIC_DYNAMICS_CACHE", DEFAULT_CACHE_DIR)
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Estimated size of the directory in bytes, or None before the first scan
+        self._size = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(function, r, params, **extra):
+        """
+        Hash the inputs of a cached call.
+        
+        Args:
+            function (str): Name of the cached function.
+            r (float or array): Radial distances in meters.
+            params (sequence of tuple or array): Parameter sets of the call.
+            **extra: Further arguments, such as the method and solver
+                options. Values must be JSON serializable, NumPy scalars or
+                arrays; arrays are hashed by their dtype, shape and data.
+        
+        Returns:
+            str: Hex digest identifying the result.
+        
+        Raises:
+            TypeError: If an extra value has an unsupported type.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([__version__, function, extra], sort_keys=True, default=_encode).encode())
+        for array in (r, *params):
+            array = np.ascontiguousarray(array, dtype=float)
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".npy")
+
+    def get(self, key):
+        """
+        Return the cached array for `key`, or None on a miss.
+        
+        Args:
+            key (str): Hash from `key`.
+        
+        Returns:
+            array or None: The stored result.
+        """
+        path = self._path(key)
+        try:
+            value = np.load(path)
+            os.utime(path)
+        except (FileNotFoundError, ValueError, EOFError):
+            # Missing, or evicted by another process while being read
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store an array under `key` and evict old entries if over the cap.
+        
+        Args:
+            key (str): Hash from `key`.
+            value (array): Result to store.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(value))
+            size = os.path.getsize(tmp)
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += size - replaced
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        """List (mtime, size, path) of every stored result."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".npy"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        """Delete least recently used results until the cache fits in `_LOW_WATER * max_bytes`."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= _LOW_WATER * self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def stats(self):
+        """
+        Report hit/miss counts and the current size of the cache.
+        
+        Returns:
+            dict: 'hits', 'misses', 'evictions' (for this instance),
+            'entries' and 'bytes' (for the whole directory, which is scanned).
+        """
+        entries = self._entries()
+        self._size = sum(size for _, size, _ in entries)
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(entries), 'bytes': sum(size for _, size, _ in entries)}
+
+    def clear(self):
+        """Delete every stored result."""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._size = 0
+
+    def solve_velocity(self, r, galaxy_params, gas_params, method='rk4', **options):
+        """
+        Cached `solve_velocity`.
+        
+        Args:
+            r (array): Radial distances in meters.
+            galaxy_params (tuple or array): Galaxy parameters.
+            gas_params (tuple or array): Gas parameters.
+            method (str): Integration method.
+            **options: Extra keyword options passed to the solver.
+        
+        Returns:
+            array: Velocities in m/s.
+        """
+        key = self.key("solve_velocity", r, (galaxy_params, gas_params), method=method, options=options)
+        v = self.get(key)
+        if v is None:
+            v = solve_velocity(r, galaxy_params, gas_params, method, **options)
+            self.put(key, v)
+        return v
+
+    def enclosed_mass(self, r, params, **options):
+        """
+        Cached `enclosed_mass`.
+        
+        Args:
+            r (float or array): Radial distance(s) in meters.
+            params (tuple): Galaxy parameters.
+            **options: Extra keyword options passed to `enclosed_mass`.
+        
+        Returns:
+            array: Enclosed mass in kg.
+        """
+        key = self.key("enclosed_mass", r, (params,), options=options)
+        mass = self.get(key)
+        if mass is None:
+            mass = enclosed_mass(r, params, **options)
+            self.put(key, mass)
+        return mass
@@ -0,0 +1,193 @@
+import json
+import os
+import tempfile
+import numpy as np
+from . import __version__
+from .constants import G
+from .mass_models import MassProfile
+from .velocity_solver import (ForceTable, _adaptive_advance, _default_force_table, _default_mass_profile,
+                              _initial_step, rk4_step, total_acceleration)
+
+METHODS = ('rk4', 'odeint', 'adaptive')
+
+class SolverState:
+    """
+    Resumable state of a rotation-curve integration.
+    
+    The state holds the last radius and velocity, the mass and force tables
+    and, for the adaptive method, the integrator history (step size, the
+    derivative at the current point and the last accepted step for dense
+    output). `advance` continues the integration over a new radial segment
+    and `save`/`load` write the state to disk, so a long run can be split
+    into segments, checkpointed and restarted after an interruption.
+    
+    Continuing from a state gives the same velocities, bit for bit, as one
+    `advance` over the whole grid: for 'rk4' this is exactly
+    `solve_velocity_rk4`. The adaptive steps are not shortened at the end
+    of a segment, so its results agree with `solve_velocity_adaptive` (which
+    ends its last step on r[-1]) to the solver tolerance. LSODA keeps its
+    history in Fortran common blocks that scipy does not expose, so 'odeint'
+    restarts at the last radius of every segment and agrees with a single
+    run to the solver tolerance only.
+    
+    Args:
+        r (float): Starting radius in meters.
+        galaxy_params (tuple or array): Galaxy parameters, or an array of
+            shape (n_models, 6).
+        gas_params (tuple or array): Gas parameters, or an array of shape
+            (n_models, 10).
+        method (str): 'rk4', 'odeint' or 'adaptive'.
+        mass_profile (MassProfile, optional): Precomputed mass table.
+        force_table (ForceTable, optional): Precomputed force terms.
+        r_end (float, optional): Outer radius of the whole run, used to
+            choose the first adaptive step so that it does not depend on how
+            the run is split into segments. Required for 'adaptive'.
+        **options: 'rtol', 'atol' and 'max_steps' of the adaptive method.
+    
+    Attributes:
+        r (float): Radius reached in meters.
+        v (float or array): Velocity at `r` in m/s, one per model for batches.
+        history (dict or None): Adaptive integrator history.
+    """
+
+    def __init__(self, r, galaxy_params, gas_params, method='rk4', mass_profile=None, force_table=None, r_end=None,
+                 **options):
+        if method not in METHODS:
+            raise ValueError("Invalid method. Choose 'odeint', 'rk4' or 'adaptive'.")
+        if options and method != 'adaptive':
+            raise TypeError(f"Unexpected options for method '{method}': {sorted(options)}.")
+        if method == 'adaptive' and r_end is None:
+            raise ValueError("method='adaptive' requires r_end, the outer radius of the whole run.")
+        self.galaxy_params = np.asarray(galaxy_params, dtype=float)
+        self.gas_params = np.asarray(gas_params, dtype=float)
+        self.method = method
+        self.options = options
+        self.r_end = r_end
+        self.mass_profile = _default_mass_profile(galaxy_params) if mass_profile is None else mass_profile
+        self.force_table = _default_force_table(gas_params) if force_table is None else force_table
+        self.r = float(r)
+        self.v = np.sqrt(G * self.mass_profile(self.r) / self.r)
+        self.history = None
+
+    def __repr__(self):
+        return f"SolverState(method={self.method!r}, r={self.r:.6e}, n_models={np.size(self.v)})"
+
+    def _acceleration(self, r, v):
+        return total_acceleration(r, v, self.galaxy_params, self.gas_params, self.mass_profile, self.force_table)
+
+    def advance(self, r):
+        """
+        Continue the integration through new radii.
+        
+        Args:
+            r (array): Increasing radii in meters, starting at or beyond the
+                current radius; a first radius equal to it returns the current
+                velocity.
+        
+        Returns:
+            array: Velocities in m/s, shape (len(r),) or (n_models, len(r)).
+        """
+        r = np.atleast_1d(np.asarray(r, dtype=float))
+        if r.ndim != 1 or np.any(np.diff(r) <= 0) or r[0] < self.r:
+            raise ValueError(f"Radii must increase from the current radius {self.r:.6e} m.")
+        out = np.empty((np.size(self.v), len(r)))
+        start = int(r[0] == self.r)
+        out[:, :start] = np.reshape(self.v, (-1, 1))
+        segment = r[start:]
+        
+        if len(segment) and self.method == 'rk4':
+            r_i, v_i = self.r, self.v
+            for i, r_next in enumerate(segment, start):
+                v_i = rk4_step(r_i, v_i, r_next - r_i, self.galaxy_params, self.gas_params, self.mass_profile,
+                               self.force_table)
+                out[:, i] = v_i
+                r_i = r_next
+        elif len(segment) and self.method == 'odeint':
+            from scipy.integrate import odeint
+            v = odeint(lambda v, r: self._acceleration(r, v), np.ravel(self.v), np.concatenate([[self.r], segment]))
+            out[:, start:] = v[1:].T
+        elif len(segment):
+            if self.history is None:
+                rtol, atol = self.options.get('rtol', 1e-6), self.options.get('atol', 1e-6)
+                v0 = np.atleast_1d(self.v).astype(float)
+                k1 = self._acceleration(self.r, v0)
+                span = self.r_end - self.r
+                self.history = {'r': self.r, 'v': v0, 'k1': k1, 'h': _initial_step(v0, k1, span, rtol, atol),
+                                'step': None, 'info': {'nfev': 1, 'nstep': 0, 'nreject': 0}}
+            _adaptive_advance(segment, out[:, start:], self.history, self.galaxy_params, self.gas_params,
+                              self.mass_profile, self.force_table, self.options.get('rtol', 1e-6),
+                              self.options.get('atol', 1e-6), self.options.get('max_steps', 100000))
+        
+        self.r = float(r[-1])
+        self.v = out[:, -1].copy() if np.ndim(self.v) else out[0, -1]
+        return out if np.ndim(self.v) else out[0]
+
+    def save(self, path):
+        """
+        Write the state to a .npz file.
+        
+        The file is written under a temporary name and moved into place, so
+        an interrupted save leaves any previous checkpoint at `path` intact.
+        
+        Args:
+            path (str): Output file.
+        """
+        if not isinstance(self.mass_profile, MassProfile) or not isinstance(self.force_table, ForceTable):
+            raise TypeError("Only states using a MassProfile and a ForceTable can be saved.")
+        metadata = {'version': __version__, 'method': self.method, 'options': self.options, 'r_end': self.r_end}
+        arrays = {
+            'r': self.r, 'v': self.v, 'galaxy_params': self.galaxy_params, 'gas_params': self.gas_params,
+            'mass_params': self.mass_profile.params, 'mass_r_grid': self.mass_profile.r_grid,
+            'mass': self.mass_profile.mass, 'force_params': self.force_table.params,
+            'force_r_grid': self.force_table.r_grid, 'force_values': self.force_table.values,
+            'force_derivatives': self.force_table.derivatives,
+        }
+        if self.history is not None:
+            metadata['info'] = self.history['info']
+            arrays.update({f'history_{name}': self.history[name] for name in ('r', 'v', 'k1', 'h')})
+            if self.history['step'] is not None:
+                arrays.update(zip(('step_r', 'step_v', 'step_h', 'step_K'), self.history['step']))
+        arrays['metadata'] = np.array(json.dumps(metadata))
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a state written by `save`.
+        
+        Args:
+            path (str): Checkpoint file.
+        
+        Returns:
+            SolverState: The state, ready to `advance`.
+        """
+        with np.load(path) as data:
+            metadata = json.loads(str(data['metadata']))
+            state = cls.__new__(cls)
+            state.method = metadata['method']
+            state.options = metadata['options']
+            state.r_end = metadata['r_end']
+            state.galaxy_params = data['galaxy_params']
+            state.gas_params = data['gas_params']
+            state.mass_profile = MassProfile.from_table(data['mass_params'], data['mass_r_grid'], data['mass'])
+            state.force_table = ForceTable.from_table(data['force_params'], data['force_r_grid'],
+                                                      data['force_values'], data['force_derivatives'])
+            state.r = float(data['r'])
+            state.v = data['v'][()]
+            state.history = None
+            if 'history_r' in data:
+                state.history = {'r': float(data['history_r']), 'v': data['history_v'], 'k1': data['history_k1'],
+                                 'h': float(data['history_h']), 'info': metadata['info'], 'step': None}
+                if 'step_r' in data:
+                    state.history['step'] = (float(data['step_r']), data['step_v'], float(data['step_h']),
+                                             data['step_K'])
+        return state
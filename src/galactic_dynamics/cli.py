@@ -0,0 +1,289 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from .constants import pc
+from .parameters import GalaxyParams, GasParams, PARAM_NAMES
+from .parameter_sweep import sweep
+
+# Input and output formats, keyed by file extension
+INPUT_FORMATS = {'.jsonl': 'jsonl', '.json': 'json', '.csv': 'csv'}
+OUTPUT_FORMATS = {'.npz': 'npz', '.parquet': 'parquet', '.csv': 'csv'}
+
+def _format(path, explicit, formats, kind):
+    """Pick a file format from an explicit choice or the file extension."""
+    if explicit is not None:
+        return explicit
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in formats:
+        raise ValueError(f"Cannot infer the {kind} format of {path!r}; pass --{kind}-format.")
+    return formats[extension]
+
+def _parameter_vector(record):
+    """Validate one record and return its 16 parameters in PARAM_NAMES order."""
+    return np.concatenate([np.asarray(GalaxyParams.from_dict(record['galaxy_params'])),
+                           np.asarray(GasParams.from_dict(record['gas_params']))])
+
+def read_parameter_sets(f, fmt):
+    """
+    Yield parameter vectors one record at a time from an open text file.
+    
+    JSONL files hold one object per line in the schema of
+    data/example_galaxy_parameters.json, with "galaxy_params" and
+    "gas_params" objects mapping names to values; blank lines are skipped.
+    JSON files hold one such object, or a list of them, as a single document
+    that is read whole. CSV files have a header naming every parameter of
+    PARAM_NAMES; other columns are ignored.
+    
+    Args:
+        f (file): Open text file.
+        fmt (str): 'jsonl', 'json' or 'csv'.
+    
+    Yields:
+        array: Parameters (galaxy_params followed by gas_params), shape (16,).
+    
+    Raises:
+        ValueError: If a record is malformed or a value is out of range; the
+            message names the offending line (or record, for JSON).
+    """
+    parse = None
+    if fmt == 'jsonl':
+        records = ((f"Line {i}", line) for i, line in enumerate(f, 1) if line.strip())
+        parse = json.loads
+    elif fmt == 'json':
+        try:
+            document = json.load(f)
+        except ValueError as exc:
+            raise ValueError(f"Invalid JSON document ({exc}).") from exc
+        if not isinstance(document, list):
+            document = [document]
+        records = ((f"Record {i}", record) for i, record in enumerate(document, 1))
+    elif fmt == 'csv':
+        reader = csv.DictReader(f)
+        missing = set(PARAM_NAMES) - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"CSV header is missing parameters: {sorted(missing)}.")
+        records = ((f"Line {reader.line_num}", {'galaxy_params': row, 'gas_params': row}) for row in reader)
+    else:
+        raise ValueError("Invalid input format. Choose 'jsonl', 'json' or 'csv'.")
+    for where, record in records:
+        try:
+            yield _parameter_vector(parse(record) if parse else record)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"{where}: invalid parameter set ({exc}).") from exc
+
+def batched(parameter_sets, batch_size):
+    """Group parameter vectors into (n, 16) arrays of at most `batch_size` rows."""
+    batch = []
+    for params in parameter_sets:
+        batch.append(params)
+        if len(batch) == batch_size:
+            yield np.array(batch)
+            batch = []
+    if batch:
+        yield np.array(batch)
+
+class _Writer:
+    """Base class of the incremental result writers; subclasses implement `write` and `close`."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class NpzWriter(_Writer):
+    """
+    Write results to an uncompressed .npz archive, one pair of members per
+    batch.
+    
+    The archive holds 'r' and, for every batch i, 'params_i' of shape
+    (n, 16) and 'velocity_i' of shape (n, len(r)), with i zero-padded to six
+    digits so that sorted keys follow the input order.
+    """
+
+    def __init__(self, path, r):
+        self._zip = zipfile.ZipFile(path, 'w', allowZip64=True)
+        self._n_batches = 0
+        self._add('r', r)
+
+    def _add(self, name, array):
+        with self._zip.open(f'{name}.npy', 'w', force_zip64=True) as f:
+            np.lib.format.write_array(f, np.ascontiguousarray(array))
+
+    def write(self, params, velocity):
+        self._add(f'params_{self._n_batches:06d}', params)
+        self._add(f'velocity_{self._n_batches:06d}', velocity)
+        self._n_batches += 1
+
+    def close(self):
+        self._zip.close()
+
+class CsvWriter(_Writer):
+    """
+    Write results to a CSV file, one row per model.
+    
+    Columns are the 16 parameters followed by one velocity column per
+    radius, named after the radius in kpc (e.g. 'v_12.5kpc').
+    """
+
+    def __init__(self, path, r):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(list(PARAM_NAMES) + [f'v_{radius:.6g}kpc' for radius in r / (1e3 * pc)])
+
+    def write(self, params, velocity):
+        self._writer.writerows(np.hstack([params, velocity]).tolist())
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class ParquetWriter(_Writer):
+    """
+    Write results to a Parquet file, one row group per batch.
+    
+    Columns are the 16 parameters and a fixed-size list column 'velocity';
+    the radii in meters are stored as JSON under the 'r' key of the schema
+    metadata. Requires pyarrow.
+    """
+
+    def __init__(self, path, r):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet output requires pyarrow; install it or write NPZ or CSV.") from exc
+        self._pa = pa
+        self._n_radii = len(r)
+        self._schema = pa.schema([(name, pa.float64()) for name in PARAM_NAMES]
+                                 + [('velocity', pa.list_(pa.float64(), len(r)))],
+                                 metadata={'r': json.dumps(np.asarray(r).tolist())})
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, params, velocity):
+        pa = self._pa
+        columns = [pa.array(params[:, i]) for i in range(len(PARAM_NAMES))]
+        columns.append(pa.FixedSizeListArray.from_arrays(pa.array(np.ravel(velocity)), self._n_radii))
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+WRITERS = {'npz': NpzWriter, 'csv': CsvWriter, 'parquet': ParquetWriter}
+
+def run(parameter_sets, writer, r, method='rk4', batch_size=1000, n_workers=None, chunk_size=None, progress=None,
+        executor='process'):
+    """
+    Solve parameter sets batch by batch and hand each batch to a writer.
+    
+    Only one batch of parameters and velocities is held in memory at a time.
+    The worker pool is started once and reused for every batch.
+    
+    Args:
+        parameter_sets (iterable): Parameter vectors of shape (16,), e.g.
+            from `read_parameter_sets`.
+        writer: Object with a `write(params, velocity)` method.
+        r (array): Radial distances in meters.
+        method (str): Integration method passed to `solve_velocity`.
+        batch_size (int): Models solved per batch.
+        n_workers (int, optional): Worker processes or threads. Defaults to the
+            number of CPUs.
+        chunk_size (int, optional): Models per `sweep` task.
+        progress (callable, optional): Called after every batch with the
+            number of models done and the elapsed time in seconds.
+        executor (str): 'process' or 'thread' backend of `sweep`.
+    
+    Returns:
+        tuple: (n_models, elapsed) with the total number of models solved and
+        the wall time in seconds.
+    """
+    if executor not in ('process', 'thread'):
+        raise ValueError("Invalid executor. Choose 'process' or 'thread'.")
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    n_models = 0
+    if n_workers == 1:
+        pool = contextlib.nullcontext(executor)
+    else:
+        pool = (ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor)(n_workers)
+    with pool as executor:
+        for params in batched(parameter_sets, batch_size):
+            velocity = sweep(r, params[:, :6], params[:, 6:], method, n_workers, chunk_size, executor=executor)
+            writer.write(params, velocity)
+            n_models += len(params)
+            if progress is not None:
+                progress(n_models, time.perf_counter() - start)
+    return n_models, time.perf_counter() - start
+
+def _report(n_models, elapsed):
+    print(f"{n_models} models in {elapsed:.1f} s ({n_models / max(elapsed, 1e-9):.1f} models/s)",
+          file=sys.stderr, flush=True)
+
+def build_parser():
+    """Return the argument parser of the galactic-dynamics command."""
+    parser = argparse.ArgumentParser(
+        prog='galactic-dynamics',
+        description="Solve rotation curves for parameter sets streamed from a JSONL, JSON or CSV file.")
+    parser.add_argument('input', help="JSONL, JSON or CSV file of parameter sets, or '-' for standard input")
+    parser.add_argument('output', help="Output file (.npz, .parquet or .csv)")
+    parser.add_argument('--input-format', choices=('jsonl', 'json', 'csv'),
+                        help="Input format (default: from extension)")
+    parser.add_argument('--output-format', choices=tuple(WRITERS), help="Output format (default: from extension)")
+    parser.add_argument('--method', default='rk4', choices=('rk4', 'odeint', 'adaptive'),
+                        help="Integration method (default: rk4)")
+    parser.add_argument('--r-min', type=float, default=0.1, help="Innermost radius in kpc (default: 0.1)")
+    parser.add_argument('--r-max', type=float, default=50.0, help="Outermost radius in kpc (default: 50)")
+    parser.add_argument('--n-radii', type=int, default=100, help="Number of log-spaced radii (default: 100)")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Models per batch (default: 1000)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: number of CPUs)")
+    parser.add_argument('--executor', default='process', choices=('process', 'thread'),
+                        help="Parallel backend; threads start faster for small batches (default: process)")
+    parser.add_argument('--chunk-size', type=int, help="Models per worker task (default: automatic)")
+    parser.add_argument('--quiet', action='store_true', help="Do not report progress")
+    return parser
+
+def main(argv=None):
+    """Entry point of the galactic-dynamics console script."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.n_radii < 2 or not 0 < args.r_min < args.r_max:
+        parser.error("need --batch-size >= 1, --n-radii >= 2 and 0 < --r-min < --r-max.")
+    r = np.logspace(np.log10(args.r_min * 1e3 * pc), np.log10(args.r_max * 1e3 * pc), args.n_radii)
+    
+    opened = False
+    try:
+        if args.input == '-':
+            input_format = args.input_format or 'jsonl'
+        else:
+            input_format = _format(args.input, args.input_format, INPUT_FORMATS, 'input')
+        output_format = _format(args.output, args.output_format, OUTPUT_FORMATS, 'output')
+        f = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+        try:
+            with WRITERS[output_format](args.output, r) as writer:
+                opened = True
+                n_models, elapsed = run(read_parameter_sets(f, input_format), writer, r, args.method,
+                                        args.batch_size, args.workers, args.chunk_size,
+                                        None if args.quiet else _report, args.executor)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    except (OSError, ImportError, RuntimeError, ValueError) as exc:
+        if opened:
+            # Do not leave a partially written output behind
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(args.output)
+        parser.exit(1, f"{parser.prog}: error: {exc}\n")
+    if not args.quiet:
+        print(f"Wrote {n_models} models to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
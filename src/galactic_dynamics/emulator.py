@@ -0,0 +1,195 @@
+import json
+import numpy as np
+from .parameters import PARAM_NAMES
+from .parameter_sweep import sweep
+from .velocity_solver import solve_velocity_batch
+
+class RotationCurveEmulator:
+    """
+    Precomputed rotation curves on a regular parameter grid, served by
+    interpolation.
+    
+    A subset of the 16 parameters spans a regular grid (log-spaced for
+    positive ranges) while the others stay at fixed base values. The curve of
+    every grid node is solved once with `sweep`; new parameter points are
+    then interpolated between nodes, multilinearly or with tensor-product
+    cubic splines, which takes microseconds instead of an ODE integration.
+    
+    Build emulators with `RotationCurveEmulator.build` and restore saved ones
+    with `RotationCurveEmulator.load`.
+    
+    Attributes:
+        r (array): Radial grid of the curves in meters.
+        names (tuple): Names of the gridded parameters, from PARAM_NAMES.
+        axes (tuple): Parameter values of the grid along each axis.
+        log (array): Whether each axis is interpolated in log space.
+        base_params (array): The 16 parameters used off the grid axes.
+        table (array): Velocities in m/s, shape (len(axes[0]), ...,
+            len(axes[-1]), len(r)).
+        method (str): Integration method used for the table.
+        error (dict): Accuracy report from `validate`, or None.
+    """
+
+    def __init__(self, r, names, axes, log, base_params, table, method, error=None):
+        self.r = np.asarray(r, dtype=float)
+        self.names = tuple(names)
+        self.axes = tuple(np.asarray(axis, dtype=float) for axis in axes)
+        self.log = np.asarray(log, dtype=bool)
+        self.base_params = np.asarray(base_params, dtype=float)
+        self.table = np.asarray(table)
+        self.method = method
+        self.error = error
+        self._coords = tuple(np.log(axis) if log else axis for axis, log in zip(self.axes, self.log))
+        self._splines = {}
+
+    @classmethod
+    def build(cls, r, axes, galaxy_params, gas_params, method='rk4', n_workers=None, chunk_size=None,
+              dtype=np.float64):
+        """
+        Solve the curves of every grid node and wrap them in an emulator.
+        
+        Args:
+            r (array): Radial distances in meters.
+            axes (dict): Maps parameter names from PARAM_NAMES to (low, high,
+                n) ranges. Ranges with a positive lower bound are spaced
+                logarithmically, others linearly.
+            galaxy_params (tuple): Galaxy parameters off the grid axes.
+            gas_params (tuple): Gas parameters off the grid axes.
+            method (str): Integration method passed to `solve_velocity`.
+            n_workers (int, optional): Worker processes for `sweep`.
+            chunk_size (int, optional): Models per `sweep` task.
+            dtype (dtype): Storage type of the table, e.g. np.float32.
+        
+        Returns:
+            RotationCurveEmulator: The emulator.
+        """
+        unknown = set(axes) - set(PARAM_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown parameter names: {sorted(unknown)}.")
+        names = tuple(axes)
+        log = np.array([axes[name][0] > 0 for name in names])
+        values = [np.geomspace(*axes[name]) if is_log else np.linspace(*axes[name]) for name, is_log in zip(names, log)]
+        base_params = np.concatenate([np.asarray(galaxy_params, dtype=float), np.asarray(gas_params, dtype=float)])
+        
+        nodes = np.tile(base_params, (int(np.prod([len(v) for v in values])), 1))
+        mesh = np.meshgrid(*values, indexing='ij')
+        for name, grid in zip(names, mesh):
+            nodes[:, PARAM_NAMES.index(name)] = grid.ravel()
+        v = sweep(r, nodes[:, :6], nodes[:, 6:], method, n_workers, chunk_size)
+        table = v.reshape(mesh[0].shape + (len(r),)).astype(dtype)
+        return cls(r, names, values, log, base_params, table, method)
+
+    def _weights(self, points, kind):
+        """Interpolation weights of every grid node along each axis, one (n_points, n_nodes) array per axis."""
+        if kind not in ('linear', 'cubic'):
+            raise ValueError("Invalid kind. Choose 'linear' or 'cubic'.")
+        if kind not in self._splines:
+            from scipy.interpolate import make_interp_spline
+            # Splines through unit vectors give the weight of each node as a function of position
+            k = 1 if kind == 'linear' else 3
+            self._splines[kind] = [make_interp_spline(axis, np.eye(len(axis)), k=min(k, len(axis) - 1))
+                                   for axis in self._coords]
+        weights = []
+        for i, (axis, is_log, spline) in enumerate(zip(self._coords, self.log, self._splines[kind])):
+            x = np.log(points[:, i]) if is_log else points[:, i]
+            if np.any((x < axis[0] - 1e-12 * abs(axis[0])) | (x > axis[-1] + 1e-12 * abs(axis[-1]))):
+                raise ValueError(f"Parameter '{self.names[i]}' outside the emulator grid.")
+            weights.append(spline(np.clip(x, axis[0], axis[-1])))
+        return weights
+
+    def __call__(self, points, kind='linear'):
+        """
+        Interpolate rotation curves at new parameter points.
+        
+        Args:
+            points (array or dict): Values of the gridded parameters, shape
+                (n_points, n_axes) in the order of `names` or (n_axes,) for a
+                single point, or a dict mapping names to values.
+            kind (str): 'linear' for multilinear or 'cubic' for not-a-knot
+                cubic spline interpolation along every axis.
+        
+        Returns:
+            array: Velocities in m/s, shape (n_points, len(r)) or (len(r),).
+        """
+        if isinstance(points, dict):
+            points = np.stack(np.broadcast_arrays(*(np.asarray(points[name], dtype=float) for name in self.names)), -1)
+        points = np.asarray(points, dtype=float)
+        single = points.ndim == 1
+        points = np.atleast_2d(points)
+        
+        weights = self._weights(points, kind)
+        v = np.tensordot(weights[0], self.table, axes=(1, 0))
+        for w in weights[1:]:
+            v = np.einsum('pi,pi...->p...', w, v)
+        return v[0] if single else v
+
+    def parameters(self, points):
+        """Return the full (n_points, 16) parameter vectors for gridded points of shape (n_points, n_axes)."""
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        params = np.tile(self.base_params, (len(points), 1))
+        for i, name in enumerate(self.names):
+            params[:, PARAM_NAMES.index(name)] = points[:, i]
+        return params
+
+    def validate(self, n_samples=32, kind='linear', seed=0):
+        """
+        Measure the interpolation error against direct solves.
+        
+        Random points inside the grid are emulated and solved with
+        `solve_velocity_batch` using the table's method; the result is stored
+        in `error` and saved with the emulator.
+        
+        Args:
+            n_samples (int): Number of random parameter points.
+            kind (str): Interpolation kind to validate.
+            seed (int): Seed of the random points.
+        
+        Returns:
+            dict: 'max_abs' (m/s), 'rms_abs' (m/s) and 'max_rel' (relative to
+            the peak of each curve) errors, plus 'kind' and 'n_samples'.
+        """
+        rng = np.random.default_rng(seed)
+        u = rng.random((n_samples, len(self.names)))
+        coords = [axis[0] + u[:, i] * (axis[-1] - axis[0]) for i, axis in enumerate(self._coords)]
+        points = np.stack([np.exp(x) if is_log else x for x, is_log in zip(coords, self.log)], -1)
+        params = self.parameters(points)
+        v_direct = solve_velocity_batch(self.r, params[:, :6], params[:, 6:], self.method)
+        error = self(points, kind) - v_direct
+        peak = np.max(np.abs(v_direct), axis=1, keepdims=True)
+        self.error = {
+            'kind': kind,
+            'n_samples': n_samples,
+            'max_abs': float(np.max(np.abs(error))),
+            'rms_abs': float(np.sqrt(np.mean(error**2))),
+            'max_rel': float(np.max(np.abs(error) / peak)),
+        }
+        return self.error
+
+    def save(self, path):
+        """
+        Write the emulator to a compressed .npz file.
+        
+        Args:
+            path (str): Output file name.
+        """
+        axes = {f'axis_{i}': axis for i, axis in enumerate(self.axes)}
+        np.savez_compressed(path, r=self.r, names=np.array(self.names), log=self.log, base_params=self.base_params,
+                            table=self.table, method=np.array(self.method), error=np.array(json.dumps(self.error)),
+                            **axes)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an emulator written by `save`.
+        
+        Args:
+            path (str): File name.
+        
+        Returns:
+            RotationCurveEmulator: The emulator.
+        """
+        with np.load(path) as data:
+            names = tuple(str(name) for name in data['names'])
+            axes = [data[f'axis_{i}'] for i in range(len(names))]
+            return cls(data['r'], names, axes, data['log'], data['base_params'], data['table'], str(data['method']),
+                       json.loads(str(data['error'])))
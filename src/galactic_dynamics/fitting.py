@@ -0,0 +1,217 @@
+import warnings
+import numpy as np
+from .constants import G, c, k_B, m_p
+from .mass_models import enclosed_mass_gradient
+from .gas_models import gas_density
+from .magnetic_models import magnetic_field_strength, magnetic_pressure_gradient, magnetic_reconnection_heating
+from .cosmic_ray_models import cosmic_ray_gradient
+from .parameters import GALAXY_PARAM_NAMES, PARAM_NAMES
+
+def acceleration_gradient(r, v, galaxy_params, gas_params):
+    """
+    Calculate the total acceleration and its derivatives.
+    
+    Uses the same physics as the tabulated solvers (`ForceTable`), with the
+    enclosed mass integrated in closed form, and differentiates every term
+    analytically.
+    
+    Args:
+        r (float or array): Radial distance(s) in meters.
+        v (float or array): Rotation velocity in m/s.
+        galaxy_params (tuple): Galaxy parameters.
+        gas_params (tuple): Gas parameters.
+    
+    Returns:
+        tuple: (a, da_dv, da_dp) where `a` is the acceleration in m/s^2,
+        `da_dv` its derivative with respect to v and `da_dp` stacks the
+        derivatives with respect to the 16 parameters of PARAM_NAMES along
+        a leading axis.
+    """
+    M, dM = enclosed_mass_gradient(r, galaxy_params)
+    r_g, M_g, T, v_turb, B0, r_B, reconnection_rate, P_cr0, r_cr, v_flow = gas_params
+    rho_gas = gas_density(r, r_g, M_g)
+    
+    # Each term per unit of its amplitude parameter
+    pressure_unit = -k_B / (m_p * r * r_g)
+    magnetic_unit = -magnetic_pressure_gradient(r, 1, r_B) / rho_gas
+    cr_unit = cosmic_ray_gradient(r, 1, r_cr) / rho_gas
+    reconnection_unit = magnetic_reconnection_heating(r, magnetic_field_strength(r, 1, r_B), 1) / (rho_gas * v)
+    
+    a_grav = -G * M / r**2
+    a_gm = v**3 / (2 * c**2)
+    a_pressure = T * pressure_unit
+    a_turb = v_turb**2 / r_g
+    a_magnetic = B0**2 * magnetic_unit
+    a_cr = P_cr0 * cr_unit
+    a_reconnection = reconnection_rate * B0**2 * reconnection_unit
+    a = a_grav + a_gm + a_pressure + a_turb + a_magnetic + a_cr + a_reconnection
+    da_dv = 3 * v**2 / (2 * c**2) - a_reconnection / v
+    
+    # Magnetic, cosmic-ray and reconnection terms scale with 1/rho_gas
+    a_inverse_rho = a_magnetic + a_cr + a_reconnection
+    da_dp = np.stack(np.broadcast_arrays(
+        *(-G * dM / r**2),
+        -(a_pressure + a_turb) / r_g + a_inverse_rho * (2/r_g - r/r_g**2),
+        -a_inverse_rho / M_g,
+        pressure_unit,
+        2 * v_turb / r_g,
+        2 * B0 * (magnetic_unit + reconnection_rate * reconnection_unit),
+        a_magnetic * (2*r/r_B**2 - 1/r_B) + a_reconnection * 2*r/r_B**2,
+        B0**2 * reconnection_unit,
+        cr_unit,
+        a_cr * (r/r_cr**2 - 1/r_cr),
+        0 * a,
+    ))
+    return a, da_dv, da_dp
+
+class RotationCurveModel:
+    """
+    Rotation curve on a fixed radial grid with forward parameter sensitivities.
+    
+    The velocity is integrated together with its derivatives with respect to
+    the logarithms of the free parameters, dS/dr = (da/dv) S + p da/dp, so
+    one integration yields both the curve and its Jacobian. The last solve is
+    memoised, so an optimizer asking for the residuals and the Jacobian at
+    the same point pays for one integration, and the step size the
+    integrator settled on is reused as the initial step of the next solve.
+    
+    Args:
+        r (array): Increasing radii in meters; the initial condition is
+            circular Newtonian velocity at r[0], as in `solve_velocity`.
+        galaxy_params (tuple): Galaxy parameters.
+        gas_params (tuple): Gas parameters.
+        free (sequence of str): Names of the parameters to vary, from
+            PARAM_NAMES. They must be positive.
+        rtol (float): Relative tolerance of the integration.
+        atol (float, optional): Absolute tolerance of the integration in m/s.
+            Defaults to 1e-3 * rtol times the initial velocity.
+    """
+
+    def __init__(self, r, galaxy_params, gas_params, free=GALAXY_PARAM_NAMES, rtol=1e-8, atol=None):
+        self.r = np.asarray(r, dtype=float)
+        self.params = np.concatenate([np.asarray(galaxy_params, dtype=float), np.asarray(gas_params, dtype=float)])
+        unknown = set(free) - set(PARAM_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown parameter names: {sorted(unknown)}.")
+        self.free = np.array([PARAM_NAMES.index(name) for name in free], dtype=int)
+        if np.any(self.params[self.free] <= 0):
+            raise ValueError("Free parameters must be positive; they are fitted in log space.")
+        self.rtol = rtol
+        self.atol = atol
+        self.h0 = 0.0
+        self.nsolve = 0
+        self._last = None
+
+    @property
+    def x0(self):
+        """Logarithms of the current free parameters."""
+        return np.log(self.params[self.free])
+
+    def parameters(self, x):
+        """Return the full (galaxy_params, gas_params) for log free parameters `x`."""
+        params = self.params.copy()
+        params[self.free] = np.exp(x)
+        return params[:6], params[6:]
+
+    def solve(self, x):
+        """
+        Integrate the velocity and its sensitivities.
+        
+        Args:
+            x (array): Logarithms of the free parameters.
+        
+        Returns:
+            tuple: (v, jacobian) with v of shape (len(r),) in m/s and the
+            Jacobian dv/d(ln p) of shape (len(r), len(free)). Both are NaN if
+            the integration fails, so that an optimizer rejects the step.
+        """
+        from scipy.integrate import ODEintWarning, odeint
+        x = np.array(x, dtype=float)
+        if self._last is not None and np.array_equal(x, self._last[0]):
+            return self._last[1], self._last[2]
+        galaxy_params, gas_params = self.parameters(x)
+        scale = np.exp(x)
+
+        def rhs(y, r):
+            a, da_dv, da_dp = acceleration_gradient(r, y[0], galaxy_params, gas_params)
+            return np.concatenate([[a], da_dv * y[1:] + scale * da_dp[self.free]])
+        
+        r0 = self.r[0]
+        M0, dM0 = enclosed_mass_gradient(r0, galaxy_params)
+        v0 = np.sqrt(G * M0 / r0)
+        s0 = np.zeros(len(self.free))
+        galaxy_free = self.free < 6
+        s0[galaxy_free] = G * dM0[self.free[galaxy_free]] * scale[galaxy_free] / (2 * v0 * r0)
+        
+        atol = 1e-3 * self.rtol * v0 if self.atol is None else self.atol
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', ODEintWarning)
+            y, info = odeint(rhs, np.concatenate([[v0], s0]), self.r, rtol=self.rtol, atol=atol, h0=self.h0,
+                             full_output=True)
+        self.nsolve += 1
+        if info['message'] != 'Integration successful.':
+            return np.full(len(self.r), np.nan), np.full((len(self.r), len(self.free)), np.nan)
+        self.h0 = info['hu'][0]
+        self._last = (x, y[:, 0], y[:, 1:])
+        return y[:, 0], y[:, 1:]
+
+    def velocity(self, x):
+        """Return the rotation curve in m/s for log free parameters `x`."""
+        return self.solve(x)[0]
+
+    def jacobian(self, x):
+        """Return dv/d(ln p) for log free parameters `x`, shape (len(r), len(free))."""
+        return self.solve(x)[1]
+
+def fit_rotation_curve(r, v_obs, galaxy_params, gas_params, sigma=None, free=GALAXY_PARAM_NAMES,
+                       warm_start=None, rtol=1e-8, atol=None, **options):
+    """
+    Fit galaxy and gas parameters to an observed rotation curve.
+    
+    Minimises the weighted residuals with `scipy.optimize.least_squares`,
+    using the exact Jacobian from the forward sensitivity equations of
+    `RotationCurveModel` instead of finite differences. The free parameters
+    are fitted in log space, which keeps them positive and well scaled.
+    
+    Args:
+        r (array): Increasing observed radii in meters.
+        v_obs (array): Observed velocities in m/s.
+        galaxy_params (tuple): Initial galaxy parameters.
+        gas_params (tuple): Initial gas parameters.
+        sigma (array, optional): Velocity uncertainties in m/s. Defaults to
+            unit weights.
+        free (sequence of str): Names of the parameters to fit, from
+            PARAM_NAMES. The others are held fixed.
+        warm_start (OptimizeResult, optional): Result of a previous fit. Its
+            best-fit parameters replace the initial guess and its integrator
+            step size is reused.
+        rtol (float): Relative tolerance of the integration.
+        atol (float, optional): Absolute tolerance of the integration in m/s.
+            Defaults to 1e-3 * rtol times the initial velocity.
+        **options: Extra keyword options passed to `least_squares`, for
+            example `x_scale` or `max_nfev`.
+    
+    Returns:
+        OptimizeResult: The `least_squares` result with the additional fields
+        `galaxy_params`, `gas_params` (best fit), `velocity` (best-fit curve
+        on `r`), `param_names` (names of the fitted parameters) and `model`
+        (the RotationCurveModel used).
+    """
+    from scipy.optimize import least_squares
+    v_obs = np.asarray(v_obs, dtype=float)
+    sigma = np.ones_like(v_obs) if sigma is None else np.broadcast_to(np.asarray(sigma, dtype=float), v_obs.shape)
+    if warm_start is not None:
+        galaxy_params, gas_params = warm_start.galaxy_params, warm_start.gas_params
+    model = RotationCurveModel(r, galaxy_params, gas_params, free, rtol, atol)
+    if warm_start is not None:
+        model.h0 = warm_start.model.h0
+    
+    result = least_squares(lambda x: (model.velocity(x) - v_obs) / sigma,
+                           model.x0, jac=lambda x: model.jacobian(x) / sigma[:, None], **options)
+    galaxy_best, gas_best = model.parameters(result.x)
+    result.galaxy_params = tuple(galaxy_best)
+    result.gas_params = tuple(gas_best)
+    result.velocity = model.velocity(result.x)
+    result.param_names = tuple(free)
+    result.model = model
+    return result
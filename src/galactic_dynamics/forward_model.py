@@ -0,0 +1,227 @@
+import numpy as np
+
+# FWHM of a Gaussian in units of its standard deviation
+FWHM_TO_SIGMA = 1 / (2 * np.sqrt(2 * np.log(2)))
+
+def _fast_length(n):
+    """Smallest 2^a 3^b 5^c not below n, a size the FFT handles efficiently."""
+    best = 2 * n
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            p = p35
+            while p < n:
+                p *= 2
+            best = min(best, p)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+class BeamKernel:
+    """
+    Beam kernel with its Fourier transform precomputed for a fixed map size.
+    
+    Maps are convolved by zero-padded real FFTs, so there is no wrap-around
+    at the edges, and the transform of the kernel is computed once and
+    reused for every map. The kernel is normalised to unit sum.
+    
+    Args:
+        kernel (array): Beam image of shape (ky, kx), centred on pixel
+            (ky // 2, kx // 2).
+        shape (tuple): (ny, nx) of the maps to convolve.
+    """
+
+    def __init__(self, kernel, shape):
+        kernel = np.asarray(kernel, dtype=float)
+        self.kernel = kernel / kernel.sum()
+        self.shape = tuple(shape)
+        self._padded = tuple(_fast_length(n + k - 1) for n, k in zip(self.shape, kernel.shape))
+        self._offset = tuple(k // 2 for k in kernel.shape)
+        self._transform = np.fft.rfft2(self.kernel, s=self._padded)
+
+    @classmethod
+    def gaussian(cls, fwhm, shape, pixel_scale=1.0, truncate=4.0):
+        """
+        Circular Gaussian beam.
+        
+        Args:
+            fwhm (float): Full width at half maximum, in the units of
+                `pixel_scale`.
+            shape (tuple): (ny, nx) of the maps to convolve.
+            pixel_scale (float): Size of a pixel.
+            truncate (float): Half-width of the kernel in standard deviations.
+        
+        Returns:
+            BeamKernel: The beam.
+        """
+        sigma = fwhm * FWHM_TO_SIGMA / pixel_scale
+        half = max(int(np.ceil(truncate * sigma)), 1)
+        x = np.arange(-half, half + 1)
+        profile = np.exp(-0.5 * (x / sigma)**2)
+        return cls(np.outer(profile, profile), shape)
+
+    def __call__(self, maps):
+        """
+        Convolve maps with the beam.
+        
+        Args:
+            maps (array): Maps of shape (..., ny, nx).
+        
+        Returns:
+            array: Convolved maps of the same shape.
+        """
+        maps = np.asarray(maps, dtype=float)
+        if maps.shape[-2:] != self.shape:
+            raise ValueError(f"Maps of shape {maps.shape[-2:]} do not match the beam shape {self.shape}.")
+        full = np.fft.irfft2(np.fft.rfft2(maps, s=self._padded) * self._transform, s=self._padded)
+        (oy, ox), (ny, nx) = self._offset, self.shape
+        return full[..., oy:oy + ny, ox:ox + nx]
+
+class SkyProjection:
+    """
+    Projection of rotation curves onto the line-of-sight velocity field of
+    an inclined thin disk.
+    
+    The galactocentric radius and azimuth of every pixel depend only on the
+    geometry, so they are computed once, together with the interpolation
+    indices and weights into the radial grid. Projecting a curve is then one
+    gather and a multiply per pixel, for one model or a batch. Inside r[0]
+    the curve falls linearly to zero at the centre; pixels beyond r[-1] are
+    NaN.
+    
+    With a beam, the field is smeared as observed: the velocity weighted by
+    the surface brightness is convolved with the beam and divided by the
+    convolved surface brightness. Both the beam transform and the convolved
+    brightness are precomputed.
+    
+    The position angle is measured from the +y axis of the map towards -x
+    (north through east with east to the left) to the receding half of the
+    major axis.
+    
+    Args:
+        r (array): Increasing radial grid of the curves in meters.
+        shape (tuple): (ny, nx) of the map.
+        pixel_scale (float): Pixel size in meters at the galaxy.
+        inclination (float): Inclination in degrees (0 is face-on).
+        position_angle (float): Position angle in degrees.
+        center (tuple, optional): (y, x) pixel position of the centre.
+            Defaults to the middle of the map.
+        v_sys (float): Systemic velocity in m/s.
+        beam (BeamKernel or float, optional): Beam, or the FWHM of a circular
+            Gaussian beam in meters. No smearing if None.
+        intensity (callable or array, optional): Surface brightness, as a
+            function of galactocentric radius or an (ny, nx) map, used to
+            weight the smearing. Defaults to uniform out to r[-1].
+    """
+
+    def __init__(self, r, shape, pixel_scale, inclination, position_angle, center=None, v_sys=0.0, beam=None,
+                 intensity=None):
+        self.r = np.asarray(r, dtype=float)
+        self.shape = tuple(shape)
+        self.v_sys = v_sys
+        ny, nx = self.shape
+        y0, x0 = ((ny - 1) / 2, (nx - 1) / 2) if center is None else center
+        y, x = np.indices(self.shape, dtype=float)
+        x, y = (x - x0) * pixel_scale, (y - y0) * pixel_scale
+        
+        # Coordinates along the major and minor axes in the plane of the disk
+        inc, pa = np.radians(inclination), np.radians(position_angle)
+        x_major = -x * np.sin(pa) + y * np.cos(pa)
+        y_minor = (-x * np.cos(pa) - y * np.sin(pa)) / np.cos(inc)
+        self.radius = np.hypot(x_major, y_minor)
+        with np.errstate(invalid='ignore'):
+            cos_theta = np.where(self.radius > 0, x_major / self.radius, 0.0)
+        
+        self.inside = (self.radius <= self.r[-1]).ravel()
+        grid = np.concatenate([[0.0], self.r])
+        radius = self.radius.ravel()[self.inside]
+        self._idx = np.clip(np.searchsorted(grid, radius), 1, len(grid) - 1)
+        self._weight = (radius - grid[self._idx - 1]) / (grid[self._idx] - grid[self._idx - 1])
+        self._factor = np.sin(inc) * cos_theta.ravel()[self.inside]
+        
+        if beam is not None and not isinstance(beam, BeamKernel):
+            beam = BeamKernel.gaussian(beam, self.shape, pixel_scale)
+        self.beam = beam
+        if beam is not None:
+            if intensity is None:
+                intensity = np.ones(self.shape)
+            elif callable(intensity):
+                intensity = intensity(self.radius)
+            self._intensity = np.where(self.inside.reshape(self.shape), intensity, 0.0).ravel()
+            self._smeared_intensity = beam(self._intensity.reshape(self.shape))
+
+    def _rotation(self, v):
+        """Interpolate curves of shape (..., len(r)) onto the pixels inside the disk."""
+        v = np.asarray(v, dtype=float)
+        if v.shape[-1:] != self.r.shape:
+            raise ValueError(f"Curves of shape {v.shape} must have len(r) = {len(self.r)} values on the last axis.")
+        grid = np.concatenate([np.zeros(v.shape[:-1] + (1,)), v], axis=-1)
+        return grid[..., self._idx - 1] * (1 - self._weight) + grid[..., self._idx] * self._weight
+
+    def project(self, v):
+        """
+        Line-of-sight velocity field without beam smearing.
+        
+        Args:
+            v (array): Velocities on `r` in m/s, shape (len(r),) or
+                (n_models, len(r)).
+        
+        Returns:
+            array: Velocity field in m/s, shape (ny, nx) or (n_models, ny, nx).
+        """
+        v_los = self._rotation(v) * self._factor
+        field = np.full(v_los.shape[:-1] + self.inside.shape, np.nan)
+        field[..., self.inside] = self.v_sys + v_los
+        return field.reshape(field.shape[:-1] + self.shape)
+
+    def __call__(self, v):
+        """
+        Line-of-sight velocity field, beam-smeared if the projection has a
+        beam.
+        
+        Args:
+            v (array): Velocities on `r` in m/s, shape (len(r),) or
+                (n_models, len(r)).
+        
+        Returns:
+            array: Velocity field in m/s, shape (ny, nx) or (n_models, ny, nx).
+        """
+        if self.beam is None:
+            return self.project(v)
+        weighted = self._rotation(v) * (self._factor * self._intensity[self.inside])
+        field = np.zeros(weighted.shape[:-1] + self.inside.shape)
+        field[..., self.inside] = weighted
+        smeared = self.beam(field.reshape(field.shape[:-1] + self.shape))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            smeared = self.v_sys + smeared / self._smeared_intensity
+        return np.where(self.inside.reshape(self.shape), smeared, np.nan)
+
+def velocity_field(r, v, shape, pixel_scale, inclination, position_angle, center=None, v_sys=0.0, beam=None,
+                   intensity=None):
+    """
+    Project rotation curves to (beam-smeared) line-of-sight velocity maps.
+    
+    Builds a SkyProjection for a single call; keep the projection to reuse
+    its geometry and beam across models, e.g. inside a fit.
+    
+    Args:
+        r (array): Radial grid in meters.
+        v (array): Velocities on `r` in m/s, shape (len(r),) or
+            (n_models, len(r)).
+        shape (tuple): (ny, nx) of the map.
+        pixel_scale (float): Pixel size in meters at the galaxy.
+        inclination (float): Inclination in degrees.
+        position_angle (float): Position angle in degrees.
+        center (tuple, optional): (y, x) pixel position of the centre.
+        v_sys (float): Systemic velocity in m/s.
+        beam (BeamKernel or float, optional): Beam, or the FWHM of a circular
+            Gaussian beam in meters.
+        intensity (callable or array, optional): Surface brightness weighting
+            the smearing.
+    
+    Returns:
+        array: Velocity field in m/s, shape (ny, nx) or (n_models, ny, nx).
+    """
+    projection = SkyProjection(r, shape, pixel_scale, inclination, position_angle, center, v_sys, beam, intensity)
+    return projection(v)
@@ -15,6 +15,20 @@ def gas_density(r, r_g, M_g):
     """
     return M_g / (2 * np.pi * r_g**2) * np.exp(-r / r_g)
 
+def gas_density_gradient(r, r_g, M_g):
+    """
+    Calculate the radial derivative of the gas density.
+    
+    Args:
+        r (float or array): Radial distance(s) in meters.
+        r_g (float): Gas scale radius in meters.
+        M_g (float): Total gas mass in kg.
+    
+    Returns:
+        float or array: Density gradient in kg/m^4.
+    """
+    return -gas_density(r, r_g, M_g) / r_g
+
 def pressure_gradient(r, r_g, M_g, T):
     """
     Calculate the pressure gradient of the gas.
@@ -28,17 +42,7 @@ def pressure_gradient(r, r_g, M_g, T):
     Returns:
         float or array: Pressure gradient in Pa/m.
     """
-    r = np.atleast_1d(r)
-    rho = gas_density(r, r_g, M_g)
-    
-    if len(r) == 1:
-        # For a single point, use the analytical derivative
-        drho_dr = -rho / r_g
-    else:
-        # For multiple points, use np.gradient
-        drho_dr = np.gradient(rho, r)
-    
-    return -k_B * T / (m_p * r) * drho_dr
+    return -k_B * T / (m_p * r) * gas_density_gradient(r, r_g, M_g)
 
 def turbulence_pressure(r, r_g, M_g, v_turb):
     """
@@ -54,4 +58,19 @@ def turbulence_pressure(r, r_g, M_g, v_turb):
         float or array: Turbulence pressure in Pa.
     """
     rho = gas_density(r, r_g, M_g)
-    return rho * v_turb**2
\ No newline at end of file
+    return rho * v_turb**2
+
+def turbulence_pressure_gradient(r, r_g, M_g, v_turb):
+    """
+    Calculate the radial derivative of the turbulence pressure.
+    
+    Args:
+        r (float or array): Radial distance(s) in meters.
+        r_g (float): Gas scale radius in meters.
+        M_g (float): Total gas mass in kg.
+        v_turb (float): Turbulent velocity in m/s.
+    
+    Returns:
+        float or array: Turbulence pressure gradient in Pa/m.
+    """
+    return gas_density_gradient(r, r_g, M_g) * v_turb**2
\ No newline at end of file
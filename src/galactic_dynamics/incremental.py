@@ -0,0 +1,134 @@
+import numpy as np
+from .constants import G, c
+from .parameters import GALAXY_PARAM_NAMES, GAS_PARAM_NAMES
+from .velocity_solver import ForceTable, _default_force_table, _default_mass_profile
+
+# Independent terms of `total_acceleration` and the parameters each depends
+# on: gravity from the solver's mass table, and the ForceTable.COMPONENTS
+# tables of the gas terms, whose grid also depends on the gas scale radii.
+# 'reconnection' is the heating per unit gas density and is divided by v
+# during the integration; the gravitomagnetic term depends on v only.
+TERMS = {
+    'gravity': GALAXY_PARAM_NAMES,
+    'pressure': ('r_g', 'M_g', 'T'),
+    'turb': ('r_g', 'M_g', 'v_turb'),
+    'magnetic': ('r_g', 'M_g', 'B0', 'r_B'),
+    'cr': ('r_g', 'M_g', 'P_cr0', 'r_cr'),
+    'reconnection': ('r_g', 'M_g', 'B0', 'r_B', 'reconnection_rate'),
+}
+
+class IncrementalSolver:
+    """
+    RK4 rotation-curve solver that re-evaluates only the terms whose
+    parameters changed.
+    
+    `total_acceleration` is split into the independent terms of TERMS. Each
+    term is looked up once from the tables `solve_velocity` uses, the shared
+    MassProfile for gravity and the per-term ForceTable components for the
+    gas, at every radius the RK4 stages visit (the start, midpoint and end
+    of each step) and cached together with the values of the parameters it
+    depends on. A new solve looks up only the terms whose parameters differ
+    from the cached ones, sums the cached arrays and runs an integration loop
+    that does a few scalar operations per stage instead of table lookups. In
+    a scan varying one parameter group (e.g. B0 and r_B) most terms are
+    reused. The tables themselves are shared with `solve_velocity` through
+    its caches.
+    
+    The result is that of `solve_velocity(method='rk4')` up to rounding.
+    
+    Args:
+        r (array): Increasing radial grid in meters.
+        galaxy_params (tuple): Initial galaxy parameters.
+        gas_params (tuple): Initial gas parameters.
+    
+    Attributes:
+        recomputed (tuple): Names of the terms evaluated by the last solve.
+        evaluations (dict): Number of evaluations of each term so far.
+    """
+
+    def __init__(self, r, galaxy_params, gas_params):
+        self.r = np.asarray(r, dtype=float)
+        self.params = {}
+        self.update(galaxy_params, gas_params)
+        h = np.diff(self.r)
+        self._stages = np.stack([self.r[:-1], self.r[:-1] + 0.5 * h, self.r[:-1] + h])
+        self._cache = {}
+        self.recomputed = ()
+        self.evaluations = dict.fromkeys(TERMS, 0)
+
+    def update(self, galaxy_params=None, gas_params=None, **params):
+        """
+        Change parameters for the next solve.
+        
+        Args:
+            galaxy_params (tuple, optional): New galaxy parameters.
+            gas_params (tuple, optional): New gas parameters.
+            **params: Individual parameters by name, e.g. B0=1e-10.
+        """
+        if galaxy_params is not None:
+            self.params.update(zip(GALAXY_PARAM_NAMES, map(float, galaxy_params)))
+        if gas_params is not None:
+            self.params.update(zip(GAS_PARAM_NAMES, map(float, gas_params)))
+        unknown = set(params) - set(GALAXY_PARAM_NAMES + GAS_PARAM_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown parameter names: {sorted(unknown)}.")
+        self.params.update((name, float(value)) for name, value in params.items())
+
+    def _term(self, name):
+        """Return the cached stage values of a term, looking them up again if its parameters changed."""
+        key = tuple(self.params[n] for n in TERMS[name])
+        if name != 'gravity':
+            # The component tables are interpolated, so their values depend on the grid too
+            table = _default_force_table(tuple(self.params[n] for n in GAS_PARAM_NAMES))
+            key += (table.r_grid[0], table.r_grid[-1], len(table.r_grid))
+        cached = self._cache.get(name)
+        if cached is None or cached[0] != key:
+            if name == 'gravity':
+                mass_profile = _default_mass_profile(tuple(self.params[n] for n in GALAXY_PARAM_NAMES))
+                values = -G * mass_profile(self._stages) / self._stages**2
+            else:
+                values = table.component(name, self._stages, 1.0)
+            cached = self._cache[name] = (key, values)
+            self.evaluations[name] += 1
+            self.recomputed += (name,)
+        return cached[1]
+
+    def solve(self, galaxy_params=None, gas_params=None, **params):
+        """
+        Solve for the velocity profile, reusing the unchanged terms.
+        
+        Args:
+            galaxy_params (tuple, optional): New galaxy parameters.
+            gas_params (tuple, optional): New gas parameters.
+            **params: Individual parameters by name.
+        
+        Returns:
+            array: Velocities in m/s, shape (len(r),).
+        """
+        self.update(galaxy_params, gas_params, **params)
+        self.recomputed = ()
+        static = sum(self._term(name) for name in ForceTable.COMPONENTS if name != 'reconnection')
+        heating = self._term('reconnection')
+        gravity = self._term('gravity')
+        
+        # Circular Newtonian velocity at r[0], as in `solve_velocity`
+        v = np.empty(len(self.r))
+        v[0] = np.sqrt(-gravity[0, 0] * self.r[0])
+        h = np.diff(self.r)
+        gm = 1 / (2 * c**2)
+        g0, g_mid, g1 = gravity
+        s0, s_mid, s1 = static
+        q0, q_mid, q1 = heating
+        with np.errstate(all='ignore'):
+            vi = v[0]
+            for i in range(len(h)):
+                k1 = g0[i] + vi**3 * gm + (s0[i] + q0[i] / vi)
+                w = vi + 0.5 * h[i] * k1
+                k2 = g_mid[i] + w**3 * gm + (s_mid[i] + q_mid[i] / w)
+                w = vi + 0.5 * h[i] * k2
+                k3 = g_mid[i] + w**3 * gm + (s_mid[i] + q_mid[i] / w)
+                w = vi + h[i] * k3
+                k4 = g1[i] + w**3 * gm + (s1[i] + q1[i] / w)
+                vi = vi + h[i] / 6 * (k1 + 2*k2 + 2*k3 + k4)
+                v[i + 1] = vi
+        return v
@@ -0,0 +1,193 @@
+import importlib.util
+import numpy as np
+from .mass_models import mass_density, mass_density_gradient
+from .gas_models import gas_density, gas_density_gradient, turbulence_pressure, turbulence_pressure_gradient
+from .magnetic_models import magnetic_field_strength, magnetic_pressure, magnetic_pressure_gradient
+from .cosmic_ray_models import cosmic_ray_pressure, cosmic_ray_gradient
+
+# Row order of the profile buffer filled by `evaluate_profiles`; the first
+# MASS_FIELDS rows depend on the galaxy parameters, the rest on the gas
+PROFILE_FIELDS = (
+    'mass_density',
+    'mass_density_gradient',
+    'gas_density',
+    'gas_density_gradient',
+    'turbulence_pressure',
+    'turbulence_pressure_gradient',
+    'magnetic_field_strength',
+    'magnetic_field_gradient',
+    'magnetic_pressure',
+    'magnetic_pressure_gradient',
+    'cosmic_ray_pressure',
+    'cosmic_ray_gradient',
+)
+MASS_FIELDS = PROFILE_FIELDS[:2]
+GAS_FIELDS = PROFILE_FIELDS[2:]
+
+def _fused_mass_profiles(r, galaxy_params, out):
+    """Evaluate the mass density and its derivative point by point into `out`."""
+    for m in range(galaxy_params.shape[0]):
+        r_d, M_d, r_b, M_b, r_h, M_h = galaxy_params[m]
+        disk0 = M_d / (2 * np.pi * r_d**2)
+        bulge0 = M_b / (2 * np.pi * r_b**3)
+        halo0 = M_h / (4 * np.pi * r_h**3)
+        for i in range(r.shape[0]):
+            x = r[i]
+            disk = disk0 * np.exp(-x / r_d)
+            bulge = bulge0 * np.exp(-x / r_b)
+            halo = halo0 / (1 + x / r_h)**2
+            out[0, m, i] = disk + bulge + halo
+            out[1, m, i] = -disk / r_d - bulge / r_b - 2 * halo / (r_h + x)
+
+def _fused_gas_profiles(r, gas_params, out):
+    """Evaluate the gas, magnetic and cosmic-ray profiles point by point into `out`."""
+    mu0 = 4e-7 * np.pi
+    for m in range(gas_params.shape[0]):
+        r_g, M_g, T, v_turb, B0, r_B, reconnection_rate, P_cr0, r_cr, v_flow = gas_params[m]
+        gas0 = M_g / (2 * np.pi * r_g**2)
+        for i in range(r.shape[0]):
+            x = r[i]
+            rho_gas = gas0 * np.exp(-x / r_g)
+            B = B0 * np.exp(-x / r_B)
+            P_B = B * B / (2 * mu0)
+            P_cr = P_cr0 * np.exp(-x / r_cr)
+            out[0, m, i] = rho_gas
+            out[1, m, i] = -rho_gas / r_g
+            out[2, m, i] = rho_gas * v_turb**2
+            out[3, m, i] = -rho_gas / r_g * v_turb**2
+            out[4, m, i] = B
+            out[5, m, i] = -B / r_B
+            out[6, m, i] = P_B
+            out[7, m, i] = -2 * P_B / r_B
+            out[8, m, i] = P_cr
+            out[9, m, i] = -P_cr / r_cr
+
+def _numpy_mass_profiles(r, galaxy_params, out):
+    """Fill `out` with the existing NumPy profile functions."""
+    out[0] = mass_density(r, galaxy_params)
+    out[1] = mass_density_gradient(r, galaxy_params)
+
+def _numpy_gas_profiles(r, gas_params, out):
+    """Fill `out` with the existing NumPy profile functions."""
+    r_g, M_g, T, v_turb, B0, r_B, reconnection_rate, P_cr0, r_cr, v_flow = gas_params.T[..., None]
+    out[0] = gas_density(r, r_g, M_g)
+    out[1] = gas_density_gradient(r, r_g, M_g)
+    out[2] = turbulence_pressure(r, r_g, M_g, v_turb)
+    out[3] = turbulence_pressure_gradient(r, r_g, M_g, v_turb)
+    out[4] = magnetic_field_strength(r, B0, r_B)
+    out[5] = -out[4] / r_B
+    out[6] = magnetic_pressure(out[4])
+    out[7] = magnetic_pressure_gradient(r, B0, r_B)
+    out[8] = cosmic_ray_pressure(r, P_cr0, r_cr)
+    out[9] = cosmic_ray_gradient(r, P_cr0, r_cr)
+
+# Numba-compiled (mass, gas) kernels, built on first use; numba also imports
+# scipy, so it is not loaded unless the 'numba' backend is used
+_compiled = None
+
+def _kernels(backend):
+    """Return the (mass, gas) kernels of a backend."""
+    global _compiled
+    if backend is None:
+        backend = 'numba' if importlib.util.find_spec('numba') is not None else 'numpy'
+    if backend == 'numpy':
+        return _numpy_mass_profiles, _numpy_gas_profiles
+    if backend != 'numba':
+        raise ValueError("Invalid backend. Choose 'numba' or 'numpy'.")
+    if _compiled is None:
+        try:
+            import numba
+        except ImportError:
+            raise ImportError("backend='numba' requires numba to be installed.") from None
+        _compiled = (numba.njit(cache=True)(_fused_mass_profiles), numba.njit(cache=True)(_fused_gas_profiles))
+    return _compiled
+
+def _evaluate(r, params, n_fields, out, kernel):
+    """Run one kernel over `params` into `out`, checking or allocating the buffer."""
+    single = np.ndim(params) == 1
+    params = np.atleast_2d(np.asarray(params, dtype=float))
+    shape = (n_fields, len(params), len(r))
+    expected = shape[:1] + shape[2:] if single else shape
+    if out is None:
+        out = np.empty(expected)
+    if out.dtype != np.float64 or out.shape != expected:
+        raise ValueError(f"out must be a float64 array of shape {expected}.")
+    view = out.reshape(shape)
+    if not np.shares_memory(view, out):
+        raise ValueError("out must be contiguous so that it can be filled in place.")
+    kernel(r, params, view)
+    return out
+
+def evaluate_mass_profiles(r, galaxy_params, out=None, backend=None):
+    """
+    Evaluate the mass density and its radial derivative in one pass.
+    
+    Args:
+        r (array): Radial distances in meters, shape (n_r,).
+        galaxy_params (tuple or array): Galaxy parameters, shape (6,) or
+            (n_models, 6).
+        out (array, optional): Float64 buffer of shape (2, n_r), or
+            (2, n_models, n_r) for batches. Allocated if omitted.
+        backend (str, optional): 'numba' or 'numpy'; see `evaluate_profiles`.
+    
+    Returns:
+        array: `out`, with rows ordered as in MASS_FIELDS.
+    """
+    r = np.ascontiguousarray(r, dtype=float)
+    return _evaluate(r, galaxy_params, len(MASS_FIELDS), out, _kernels(backend)[0])
+
+def evaluate_gas_profiles(r, gas_params, out=None, backend=None):
+    """
+    Evaluate the gas, magnetic and cosmic-ray profiles and their radial
+    derivatives in one pass.
+    
+    Args:
+        r (array): Radial distances in meters, shape (n_r,).
+        gas_params (tuple or array): Gas parameters, shape (10,) or
+            (n_models, 10).
+        out (array, optional): Float64 buffer of shape (10, n_r), or
+            (10, n_models, n_r) for batches. Allocated if omitted.
+        backend (str, optional): 'numba' or 'numpy'; see `evaluate_profiles`.
+    
+    Returns:
+        array: `out`, with rows ordered as in GAS_FIELDS.
+    """
+    r = np.ascontiguousarray(r, dtype=float)
+    return _evaluate(r, gas_params, len(GAS_FIELDS), out, _kernels(backend)[1])
+
+def evaluate_profiles(r, galaxy_params, gas_params, out=None, backend=None):
+    """
+    Evaluate all density and pressure profiles and their radial derivatives.
+    
+    With Numba installed the profiles are computed in one compiled pass over
+    `r` that writes straight into `out`, without temporary arrays. Without
+    Numba (or with backend='numpy') the regular profile functions are used.
+    Numba is imported, and the kernels compiled, on the first call that uses
+    it.
+    
+    Args:
+        r (array): Radial distances in meters, shape (n_r,).
+        galaxy_params (tuple or array): Galaxy parameters, shape (6,) or
+            (n_models, 6).
+        gas_params (tuple or array): Gas parameters, shape (10,) or
+            (n_models, 10).
+        out (array, optional): Float64 buffer of shape
+            (len(PROFILE_FIELDS), n_r), or (len(PROFILE_FIELDS), n_models, n_r)
+            for batches. Allocated if omitted.
+        backend (str, optional): 'numba' or 'numpy'. Defaults to 'numba' when
+            it is installed.
+    
+    Returns:
+        array: `out`, with rows ordered as in PROFILE_FIELDS.
+    """
+    r = np.ascontiguousarray(r, dtype=float)
+    mass_kernel, gas_kernel = _kernels(backend)
+    single = np.ndim(galaxy_params) == 1
+    expected = (len(PROFILE_FIELDS),) + (() if single else (len(galaxy_params),)) + (len(r),)
+    if out is None:
+        out = np.empty(expected)
+    if out.dtype != np.float64 or out.shape != expected:
+        raise ValueError(f"out must be a float64 array of shape {expected}.")
+    _evaluate(r, galaxy_params, len(MASS_FIELDS), out[:len(MASS_FIELDS)], mass_kernel)
+    _evaluate(r, gas_params, len(GAS_FIELDS), out[len(MASS_FIELDS):], gas_kernel)
+    return out
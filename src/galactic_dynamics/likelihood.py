@@ -0,0 +1,122 @@
+import numpy as np
+from .mass_models import MassProfile
+from .parameters import GalaxyParams, GasParams, PARAM_NAMES
+from .velocity_solver import ForceTable, solve_velocity_batch
+
+# Parameters that must be strictly positive (scale radii and masses) and
+# non-negative (amplitudes), by index in the 16-element parameter vector
+_POSITIVE = np.array([PARAM_NAMES.index(name) for name in GalaxyParams.POSITIVE + GasParams.POSITIVE])
+_NON_NEGATIVE = np.array([PARAM_NAMES.index(name) for name in GalaxyParams.NON_NEGATIVE + GasParams.NON_NEGATIVE])
+
+class RotationCurveLikelihood:
+    """
+    Gaussian log-likelihood of an observed rotation curve for an ensemble of
+    parameter vectors.
+    
+    All walkers are solved together with `solve_velocity_batch`, so one call
+    pays a single pass of the integrator's per-radius loop for the whole
+    ensemble. The instance can be passed straight to emcee as a vectorized
+    log-probability function::
+    
+        sampler = emcee.EnsembleSampler(n_walkers, 16, likelihood, vectorize=True)
+    
+    Args:
+        r (array): Increasing observed radii in meters.
+        v_obs (array): Observed velocities in m/s.
+        sigma_v (array): Velocity uncertainties in m/s.
+        method (str): Integration method passed to `solve_velocity`.
+        r_grid (array, optional): Integration grid in meters. Defaults to the
+            observed radii; a finer grid improves the accuracy of 'rk4', and
+            the model is then interpolated linearly onto `r`.
+        log_prior (callable, optional): Function mapping an (n_walkers, 16)
+            array to log-prior values, added to the log-likelihood.
+        **options: Extra keyword options passed to the solver.
+    """
+
+    def __init__(self, r, v_obs, sigma_v, method='rk4', r_grid=None, log_prior=None, **options):
+        self.r = np.asarray(r, dtype=float)
+        self.v_obs = np.asarray(v_obs, dtype=float)
+        self.sigma_v = np.broadcast_to(np.asarray(sigma_v, dtype=float), self.v_obs.shape)
+        if self.r.shape != self.v_obs.shape:
+            raise ValueError("r and v_obs must have the same shape.")
+        self.method = method
+        self.r_grid = self.r if r_grid is None else np.asarray(r_grid, dtype=float)
+        self.log_prior = log_prior
+        self.options = options
+        self._norm = -np.sum(np.log(np.sqrt(2 * np.pi) * self.sigma_v))
+
+    def model_velocity(self, theta):
+        """
+        Solve the rotation curves of an ensemble of parameter vectors.
+        
+        Args:
+            theta (array): Parameter vectors (galaxy_params followed by
+                gas_params), shape (n_walkers, 16).
+        
+        Returns:
+            array: Model velocities at the observed radii, shape
+            (n_walkers, len(r)); NaN for walkers whose integration fails.
+        """
+        theta = np.asarray(theta, dtype=float)
+        v = self._solve(np.ascontiguousarray(theta[:, :6]), np.ascontiguousarray(theta[:, 6:]))
+        if self.r_grid is self.r:
+            return v
+        idx = np.clip(np.searchsorted(self.r_grid, self.r), 1, len(self.r_grid) - 1)
+        w = (self.r - self.r_grid[idx - 1]) / (self.r_grid[idx] - self.r_grid[idx - 1])
+        return v[:, idx - 1] * (1 - w) + v[:, idx] * w
+
+    def _solve(self, galaxy_params, gas_params):
+        """
+        Solve a batch of walkers on the integration grid.
+        
+        The adaptive method takes one step size for the whole batch, so a
+        single divergent walker makes the batch fail. A failed batch is split
+        in halves and solved again until the failing walkers are isolated;
+        they get NaN curves.
+        """
+        try:
+            with np.errstate(all='ignore'):
+                return solve_velocity_batch(self.r_grid, galaxy_params, gas_params, self.method,
+                                            MassProfile(galaxy_params), ForceTable(gas_params), **self.options)
+        except RuntimeError:
+            if len(galaxy_params) == 1:
+                return np.full((1, len(self.r_grid)), np.nan)
+        half = len(galaxy_params) // 2
+        return np.concatenate([self._solve(galaxy_params[:half], gas_params[:half]),
+                               self._solve(galaxy_params[half:], gas_params[half:])])
+
+    def __call__(self, theta):
+        """
+        Evaluate the log-likelihood (plus log-prior).
+        
+        Walkers with non-physical parameters get -inf and are not integrated;
+        walkers whose integration fails or is non-finite also get -inf.
+        
+        Args:
+            theta (array): Parameter vectors, shape (n_walkers, 16), or a
+                single vector of shape (16,).
+        
+        Returns:
+            array or float: Log-probabilities, shape (n_walkers,), or a float
+            for a single vector.
+        """
+        theta = np.asarray(theta, dtype=float)
+        single = theta.ndim == 1
+        theta = np.atleast_2d(theta)
+        if theta.shape[1] != 16:
+            raise ValueError(f"Expected parameter vectors of length 16, got shape {theta.shape}.")
+        
+        log_prob = np.full(len(theta), -np.inf)
+        valid = (np.all(theta[:, _POSITIVE] > 0, axis=1) & np.all(theta[:, _NON_NEGATIVE] >= 0, axis=1)
+                 & np.all(np.isfinite(theta), axis=1))
+        if self.log_prior is not None and np.any(valid):
+            prior = np.full(len(theta), -np.inf)
+            prior[valid] = self.log_prior(theta[valid])
+            valid &= np.isfinite(prior)
+        if np.any(valid):
+            v = self.model_velocity(theta[valid])
+            chi2 = np.sum(((v - self.v_obs) / self.sigma_v)**2, axis=1)
+            log_prob[valid] = np.where(np.isfinite(chi2), self._norm - 0.5 * chi2, -np.inf)
+            if self.log_prior is not None:
+                log_prob[valid] += prior[valid]
+        return log_prob[0] if single else log_prob
@@ -14,6 +14,20 @@ def magnetic_field_strength(r, B0, r_B):
     """
     return B0 * np.exp(-r / r_B)
 
+def magnetic_field_gradient(r, B0, r_B):
+    """
+    Calculate the radial derivative of the magnetic field strength.
+    
+    Args:
+        r (array): Radial distances in meters.
+        B0 (float): Central magnetic field strength in Tesla.
+        r_B (float): Magnetic field scale radius in meters.
+    
+    Returns:
+        array: Magnetic field gradient in Tesla/m.
+    """
+    return -magnetic_field_strength(r, B0, r_B) / r_B
+
 def magnetic_pressure(B):
     """
     Calculate the magnetic pressure.
@@ -26,6 +40,21 @@ def magnetic_pressure(B):
     """
     return B**2 / (2 * np.pi * 4e-7)  # Using mu0 = 4π × 10^-7 N/A^2
 
+def magnetic_pressure_gradient(r, B0, r_B):
+    """
+    Calculate the radial derivative of the magnetic pressure.
+    
+    Args:
+        r (array): Radial distances in meters.
+        B0 (float): Central magnetic field strength in Tesla.
+        r_B (float): Magnetic field scale radius in meters.
+    
+    Returns:
+        array: Magnetic pressure gradient in Pa/m.
+    """
+    B = magnetic_field_strength(r, B0, r_B)
+    return -2 * magnetic_pressure(B) / r_B
+
 def magnetic_reconnection_heating(r, B, reconnection_rate):
     """
     Calculate heating due to magnetic reconnection.
@@ -38,4 +67,21 @@ def magnetic_reconnection_heating(r, B, reconnection_rate):
     Returns:
         array: Heating rate in W/m^3.
     """
-    return reconnection_rate * B**2 / (8 * np.pi * 4e-7)  # Using mu0 = 4π × 10^-7 N/A^2
\ No newline at end of file
+    return reconnection_rate * B**2 / (8 * np.pi * 4e-7)  # Using mu0 = 4π × 10^-7 N/A^2
+
+def magnetic_reconnection_heating_gradient(r, B0, r_B, reconnection_rate):
+    """
+    Calculate the radial derivative of the reconnection heating of the
+    exponential field profile.
+    
+    Args:
+        r (array): Radial distances in meters.
+        B0 (float): Central magnetic field strength in Tesla.
+        r_B (float): Magnetic field scale radius in meters.
+        reconnection_rate (float): Reconnection rate (dimensionless).
+    
+    Returns:
+        array: Heating rate gradient in W/m^4.
+    """
+    B = magnetic_field_strength(r, B0, r_B)
+    return -2 * magnetic_reconnection_heating(r, B, reconnection_rate) / r_B
\ No newline at end of file
@@ -1,6 +1,7 @@
 import numpy as np
-from scipy.integrate import simps
+from functools import lru_cache
 from .constants import G, M_sun, pc
+from .utils import split_params
 
 def mass_density(r, params):
     """
@@ -8,41 +9,230 @@ def mass_density(r, params):
     
     Args:
         r (array): Radial distances in meters.
-        params (tuple): (r_d, M_d, r_b, M_b, r_h, M_h) in SI units.
+        params (tuple or array): (r_d, M_d, r_b, M_b, r_h, M_h) in SI units,
+            or an array of shape (n_models, 6) with one parameter set per row.
     
     Returns:
-        array: Mass density in kg/m^3.
+        array: Mass density in kg/m^3, with a leading model axis for batches.
     """
-    r_d, M_d, r_b, M_b, r_h, M_h = params
+    r_d, M_d, r_b, M_b, r_h, M_h = split_params(params, np.ndim(r))
     disk = M_d / (2 * np.pi * r_d**2) * np.exp(-r / r_d)
     bulge = M_b / (2 * np.pi * r_b**3) * np.exp(-r / r_b)
     halo = M_h / (4 * np.pi * r_h**3) * (1 + r/r_h)**-2
     return disk + bulge + halo
 
-def enclosed_mass(r, params):
+def mass_density_gradient(r, params):
+    """
+    Calculate the radial derivative of the mass density.
+    
+    Args:
+        r (array): Radial distances in meters.
+        params (tuple or array): Galaxy parameters, as for `mass_density`.
+    
+    Returns:
+        array: Density gradient in kg/m^4.
+    """
+    r_d, M_d, r_b, M_b, r_h, M_h = split_params(params, np.ndim(r))
+    disk = M_d / (2 * np.pi * r_d**2) * np.exp(-r / r_d)
+    bulge = M_b / (2 * np.pi * r_b**3) * np.exp(-r / r_b)
+    halo = M_h / (4 * np.pi * r_h**3) * (1 + r/r_h)**-2
+    return -disk / r_d - bulge / r_b - 2 * halo / (r_h + r)
+
+def cumulative_mass(r_grid, params, backend='numpy'):
+    """
+    Tabulate the enclosed mass on a logarithmic radial grid.
+    
+    The integrand 4*pi*r^3*rho is integrated in ln(r) with a single
+    cumulative trapezoid pass, so the mass at every grid point costs one
+    density evaluation in total. The density comes from the profile kernel
+    and the integration runs in place, so besides the result only the
+    kernel buffer is allocated.
+    
+    Args:
+        r_grid (array): Increasing radial grid in meters.
+        params (tuple or array): Galaxy parameters, shape (6,) or
+            (n_models, 6).
+        backend (str): Backend of `kernels.evaluate_mass_profiles`, 'numpy'
+            or 'numba'.
+    
+    Returns:
+        array: Mass enclosed between r_grid[0] and each grid point in kg.
+    """
+    from .kernels import evaluate_mass_profiles
+    r_grid = np.asarray(r_grid, dtype=float)
+    integrand = evaluate_mass_profiles(r_grid, params, backend=backend)[0]
+    integrand *= 4 * np.pi * r_grid**3
+    mass = np.empty_like(integrand)
+    mass[..., 0] = 0
+    segments = mass[..., 1:]
+    np.add(integrand[..., 1:], integrand[..., :-1], out=segments)
+    segments *= 0.5
+    segments *= np.diff(np.log(r_grid))
+    np.cumsum(segments, axis=-1, out=segments)
+    return mass
+
+def enclosed_mass(r, params, n_grid=10000, analytic=False, model=None):
     """
     Calculate the enclosed mass up to radius r.
     
     Args:
         r (float or array): Radial distance(s) in meters.
-        params (tuple): Galaxy parameters.
+        params (tuple): Galaxy parameters, or the parameters of `model`.
+        n_grid (int): Number of points in the integration grid.
+        analytic (bool): If True, use the exact closed form of the enclosed
+            mass of `mass_density` (`profiles.DEFAULT_MODEL`) instead of
+            integrating the density numerically.
+        model (MassModel, optional): Component model from `profiles`, for
+            example `profiles.DEFAULT_MODEL` for the closed form of
+            `mass_density` integrated from the centre. Only its components
+            without a closed-form mass are integrated numerically.
     
     Returns:
         array: Enclosed mass in kg.
     """
     r = np.atleast_1d(r)
+    if model is not None:
+        return model.enclosed_mass(r, params)
+    if analytic:
+        from .profiles import DEFAULT_MODEL
+        return DEFAULT_MODEL.enclosed_mass(r, params)
     r_min = r.min() / 10
     r_max = r.max() * 10
-    r_array = np.geomspace(r_min, r_max, 10000)
-    density = mass_density(r_array, params)
-    integrand = density * 4 * np.pi * r_array**2
-    mass = np.array([simps(integrand[r_array <= ri], r_array[r_array <= ri]) for ri in r])
-    return mass
+    r_array = np.geomspace(r_min, r_max, n_grid)
+    mass = cumulative_mass(r_array, params)
+    return _interp_table(np.log(r), np.log(r_array), mass)
+
+def _interp_table(log_r, log_grid, table):
+    """Linearly interpolate a (possibly batched) table in ln(r), clamping at the ends."""
+    if table.ndim == 1:
+        return np.interp(log_r, log_grid, table)
+    idx = np.clip(np.searchsorted(log_grid, log_r), 1, len(log_grid) - 1)
+    w = (log_r - log_grid[idx - 1]) / (log_grid[idx] - log_grid[idx - 1])
+    w = np.clip(w, 0, 1)
+    return table[..., idx - 1] * (1 - w) + table[..., idx] * w
+
+class MassProfile:
+    """
+    Tabulated enclosed-mass profile M(r) for one or many sets of galaxy
+    parameters.
+    
+    The profile is tabulated once on a logarithmic grid and then served by
+    interpolation in ln(r), so repeated lookups (for example at every stage
+    of an ODE step) cost a single interpolation instead of a new integral.
+    The table holds the exact enclosed mass of `mass_density`, from the
+    closed forms of `profiles.DEFAULT_MODEL`; with integrate=True the density
+    is integrated numerically on the grid instead, with a uniform-density
+    core inside r_min. Below the grid the mass is scaled as that of a
+    uniform core; above it the mass is held at its outermost tabulated
+    value.
+    
+    A batch of parameter sets shares one radial grid and stores a table of
+    shape (n_models, n_grid); lookups then carry a leading model axis.
+    
+    Args:
+        params (tuple or array): (r_d, M_d, r_b, M_b, r_h, M_h) in SI units, or
+            an array of shape (n_models, 6).
+        r_min (float, optional): Inner edge of the table in meters. Defaults to
+            1e-3 times the smallest scale radius.
+        r_max (float, optional): Outer edge of the table in meters. Defaults to
+            1e3 times the largest scale radius.
+        n_grid (int): Number of points in the table.
+        integrate (bool): Integrate the density numerically with
+            `cumulative_mass` instead of using the closed form.
+        backend (str): Backend of the profile kernel used to tabulate the
+            density when integrating, 'numpy' or 'numba'.
+    """
+
+    def __init__(self, params, r_min=None, r_max=None, n_grid=4000, integrate=False, backend='numpy'):
+        self.params = np.asarray(params, dtype=float)
+        default_min, default_max = self._bounds(self.params)
+        r_min = default_min if r_min is None else r_min
+        r_max = default_max if r_max is None else r_max
+        self.r_grid = np.geomspace(r_min, r_max, n_grid)
+        self.log_r = np.log(self.r_grid)
+        if integrate:
+            core = 4 / 3 * np.pi * r_min**3 * mass_density(r_min, self.params)
+            self.mass = cumulative_mass(self.r_grid, self.params, backend)
+            self.mass += np.expand_dims(core, -1)
+        else:
+            from .profiles import DEFAULT_MODEL
+            self.mass = DEFAULT_MODEL.enclosed_mass(self.r_grid, self.params)
+        for table in (self.r_grid, self.log_r, self.mass):
+            table.setflags(write=False)
+
+    @staticmethod
+    def _bounds(params):
+        """Default (r_min, r_max) of the table for one parameter set or a batch."""
+        scales = np.asarray(params, dtype=float)[..., ::2]
+        return 1e-3 * scales.min(), 1e3 * scales.max()
+
+    @classmethod
+    def from_table(cls, params, r_grid, mass):
+        """
+        Wrap an existing mass table without integrating it again.
+        
+        Args:
+            params (tuple or array): Galaxy parameters the table was built from.
+            r_grid (array): Logarithmic radial grid in meters.
+            mass (array): Enclosed mass on `r_grid`, shape (n_grid,) or
+                (n_models, n_grid).
+        
+        Returns:
+            MassProfile: Profile serving lookups from the given table.
+        """
+        profile = cls.__new__(cls)
+        profile.params = np.asarray(params, dtype=float)
+        profile.r_grid = np.asarray(r_grid, dtype=float)
+        profile.log_r = np.log(profile.r_grid)
+        profile.mass = np.asarray(mass, dtype=float)
+        return profile
+
+    def __call__(self, r):
+        """
+        Evaluate the enclosed mass.
+        
+        Args:
+            r (float or array): Radial distance(s) in meters.
+        
+        Returns:
+            float or array: Enclosed mass in kg, with a leading model axis
+            for batches.
+        """
+        r = np.asarray(r, dtype=float)
+        mass = _interp_table(np.log(r), self.log_r, self.mass)
+        inner = r < self.r_grid[0]
+        if np.any(inner):
+            core = self.mass[..., 0].reshape(self.mass.shape[:-1] + (1,) * r.ndim)
+            mass = np.where(inner, core * (r / self.r_grid[0])**3, mass)
+        return mass
+
+@lru_cache(maxsize=128)
+def _cached_mass_profile(params):
+    return MassProfile(params)
+
+def get_mass_profile(params):
+    """
+    Return the shared MassProfile for a set of galaxy parameters.
+    
+    Profiles are kept in an LRU cache keyed on the parameter tuple, so
+    solving the same galaxy repeatedly only integrates its mass once.
+    
+    Args:
+        params (tuple): Galaxy parameters.
+    
+    Returns:
+        MassProfile: Tabulated enclosed-mass profile.
+    """
+    return _cached_mass_profile(tuple(float(p) for p in params))
 
 def analytical_mass(r, params):
     """
     Calculate the analytical enclosed mass for simple profiles.
     
+    These forms (thin exponential disk, Hernquist bulge, NFW halo) differ
+    from the components of `mass_density`; the exact closed form of
+    `mass_density` is `profiles.DEFAULT_MODEL`.
+    
     Args:
         r (float or array): Radial distance(s) in meters.
         params (tuple): Galaxy parameters.
@@ -62,4 +252,42 @@ def analytical_mass(r, params):
     # Halo (NFW profile)
     halo_mass = M_h * (np.log(1 + r/r_h) - (r/r_h) / (1 + r/r_h))
     
-    return disk_mass + bulge_mass + halo_mass
\ No newline at end of file
+    return disk_mass + bulge_mass + halo_mass
+
+def enclosed_mass_gradient(r, params):
+    """
+    Calculate the enclosed mass of `mass_density` and its parameter derivatives.
+    
+    The mass is the closed form of `profiles.DEFAULT_MODEL`, built on the
+    same series-stabilised integrals, so the mass and its derivatives with
+    respect to every galaxy parameter keep their precision as r -> 0.
+    
+    Args:
+        r (float or array): Radial distance(s) in meters.
+        params (tuple): Galaxy parameters (r_d, M_d, r_b, M_b, r_h, M_h).
+    
+    Returns:
+        tuple: (mass, gradient) where `mass` is the enclosed mass in kg and
+        `gradient` stacks d(mass)/d(param) along a leading axis of length 6,
+        in parameter order.
+    """
+    from .profiles import _gamma2, _halo_mass
+    r_d, M_d, r_b, M_b, r_h, M_h = params
+    
+    # Exponential profiles: integral of s^2 exp(-s/a) from 0 to r is a^3 * gamma(r/a),
+    # halo: integral of u^2 / (1 + u)^2 from 0 to y
+    x_d, x_b, y = r / r_d, r / r_b, r / r_h
+    gamma_d, gamma_b, h = _gamma2(x_d), _gamma2(x_b), _halo_mass(y)
+    disk = 2 * M_d * r_d * gamma_d
+    bulge = 2 * M_b * gamma_b
+    halo = M_h * h
+    
+    gradient = np.stack(np.broadcast_arrays(
+        2 * M_d * (gamma_d - x_d**3 * np.exp(-x_d)),
+        2 * r_d * gamma_d,
+        -2 * M_b * x_b**3 * np.exp(-x_b) / r_b,
+        2 * gamma_b,
+        -M_h * y**3 / ((1 + y)**2 * r_h),
+        h,
+    ))
+    return disk + bulge + halo, gradient
@@ -0,0 +1,182 @@
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from .mass_models import MassProfile
+from .velocity_solver import ForceTable, as_parameter_batch, solve_velocity_batch
+
+# Axis of the model index in the arrays of a sweep; the others (the radial
+# grids) are the same for every model
+_MODEL_AXIS = {'galaxy_params': 0, 'gas_params': 0, 'mass': 0, 'force_values': 1, 'force_derivatives': 1}
+
+# Default upper limit on models per task. Each model's mass and force tables
+# take a few hundred kB while they are built, so the tables of a whole large
+# batch would not fit in memory at once.
+MAX_CHUNK_SIZE = 1000
+
+# Default lower limit on models per task. Building a chunk's tables and
+# stepping through the radii cost about as much as solving a hundred models,
+# so smaller tasks would spend most of their time on that overhead.
+MIN_CHUNK_SIZE = 100
+
+def _to_shared(array):
+    """Copy an array into a new shared-memory segment."""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, array.shape, array.dtype.str
+
+def _copy_shared(spec, index=()):
+    """Copy `array[index]` out of the shared segment described by `spec`, which is closed again at once."""
+    shm_name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)[index].copy()
+    finally:
+        shm.close()
+
+def _write_shared(spec, index, values):
+    """Write `values` into `array[index]` of the shared segment described by `spec` and close it."""
+    shm_name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf)[index] = values
+    finally:
+        shm.close()
+
+def _solve_range(arrays, start, stop, method, bounds):
+    """
+    Solve models [start, stop) from the arrays of a sweep and write them into arrays['out'].
+    
+    The mass and force tables are taken from `arrays` if the caller supplied
+    them, and otherwise tabulated for this chunk only, on the grid bounds
+    of the whole batch so that the result does not depend on the chunking.
+    """
+    galaxy_params = arrays['galaxy_params'][start:stop]
+    gas_params = arrays['gas_params'][start:stop]
+    if 'mass' in arrays:
+        profile = MassProfile.from_table(galaxy_params, arrays['r_grid'], arrays['mass'][start:stop])
+    else:
+        profile = MassProfile(galaxy_params, *bounds[0])
+    if 'force_values' in arrays:
+        forces = ForceTable.from_table(gas_params, arrays['force_r_grid'], arrays['force_values'][:, start:stop],
+                                       arrays['force_derivatives'][:, start:stop])
+    else:
+        forces = ForceTable(gas_params, *bounds[1])
+    out = arrays['out'][start:stop]
+    if method == 'rk4':
+        # Each task owns a disjoint block of rows, so it integrates in place without a temporary
+        solve_velocity_batch(arrays['r'], galaxy_params, gas_params, method, profile, forces, out=out)
+    else:
+        out[...] = solve_velocity_batch(arrays['r'], galaxy_params, gas_params, method, profile, forces)
+    return start, stop
+
+def _solve_chunk(specs, start, stop, method, bounds):
+    """
+    Solve models [start, stop) in a worker process and write them into the shared result array.
+    
+    The chunk's rows are copied out of the shared segments and the segments
+    closed before solving, so a worker holds no mappings between tasks and
+    the parent's `unlink` frees them as soon as the sweep ends.
+    """
+    rows = slice(start, stop)
+    arrays = {name: _copy_shared(spec, (slice(None),) * _MODEL_AXIS[name] + (rows,) if name in _MODEL_AXIS else ())
+              for name, spec in specs.items() if name != 'out'}
+    arrays['out'] = np.empty((stop - start, len(arrays['r'])))
+    _solve_range(arrays, 0, stop - start, method, bounds)
+    _write_shared(specs['out'], rows, arrays['out'])
+    return start, stop
+
+def sweep(r, galaxy_params, gas_params, method='rk4', n_workers=None, chunk_size=None, mass_profile=None,
+          force_table=None, executor='process'):
+    """
+    Solve many rotation curves in parallel with a process or thread pool.
+    
+    Every task tabulates the enclosed-mass profiles and force terms of its
+    own chunk of models, so the tables are built in parallel and only a
+    chunk's worth is held at a time. With the process backend the radial
+    grid, the parameter arrays and any tables passed in are placed in shared
+    memory once, and every task copies its chunk's rows out of it, so
+    nothing but the segment names and chunk bounds is pickled. The thread backend skips the shared-memory copies and
+    worker start-up; it relies on NumPy releasing the GIL inside the
+    vectorized table lookups and arithmetic, and pays off for small batches
+    where process start-up dominates. Either way workers solve their chunk
+    with `solve_velocity_batch` and write straight into a preallocated result
+    array, each into its own block of rows.
+    
+    A pool passed as `executor` is used as is and left running, so a caller
+    solving a stream of batches pays the worker start-up once.
+    
+    Args:
+        r (array): Radial distances in meters.
+        galaxy_params (array): Galaxy parameters, shape (n_models, 6).
+        gas_params (array): Gas parameters, shape (n_models, 10).
+        method (str): Integration method passed to `solve_velocity`.
+        n_workers (int, optional): Number of worker processes or threads.
+            Defaults to the number of CPUs, or the size of an `executor` pool.
+        chunk_size (int, optional): Models per task. Defaults to splitting the
+            batch into about four tasks per process, or one per thread, of
+            MIN_CHUNK_SIZE to MAX_CHUNK_SIZE models.
+        mass_profile (MassProfile, optional): Batched mass table for
+            `galaxy_params`; tabulated per chunk if omitted.
+        force_table (ForceTable, optional): Batched force table for
+            `gas_params`; tabulated per chunk if omitted.
+        executor (str or Executor): 'process' or 'thread', or a running
+            ProcessPoolExecutor or ThreadPoolExecutor to submit the tasks to.
+    
+    Returns:
+        array: Velocities in m/s, shape (n_models, len(r)).
+    """
+    pool = None
+    if isinstance(executor, (ProcessPoolExecutor, ThreadPoolExecutor)):
+        pool = executor
+        executor = 'process' if isinstance(pool, ProcessPoolExecutor) else 'thread'
+        if n_workers is None:
+            n_workers = pool._max_workers
+    elif executor not in ('process', 'thread'):
+        raise ValueError("Invalid executor. Choose 'process' or 'thread'.")
+    r = np.ascontiguousarray(r, dtype=float)
+    galaxy_params, gas_params = as_parameter_batch(galaxy_params, gas_params)
+    n_models = len(galaxy_params)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        # Threads share one process, so a single large chunk each keeps the per-radius loop vectorized
+        chunks_per_worker = 1 if executor == 'thread' else 4
+        chunk_size = min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, -(-n_models // (chunks_per_worker * n_workers))))
+    
+    arrays = {'r': r, 'galaxy_params': galaxy_params, 'gas_params': gas_params, 'out': np.zeros((n_models, len(r)))}
+    if mass_profile is not None:
+        arrays.update(r_grid=np.ascontiguousarray(mass_profile.r_grid), mass=np.ascontiguousarray(mass_profile.mass))
+    if force_table is not None:
+        arrays.update(force_r_grid=np.ascontiguousarray(force_table.r_grid),
+                      force_values=np.ascontiguousarray(force_table.values),
+                      force_derivatives=np.ascontiguousarray(force_table.derivatives))
+    bounds = (MassProfile._bounds(galaxy_params), ForceTable._bounds(gas_params))
+    chunks = [(start, min(start + chunk_size, n_models)) for start in range(0, n_models, chunk_size)]
+    if n_workers == 1:
+        for start, stop in chunks:
+            _solve_range(arrays, start, stop, method, bounds)
+        return arrays['out']
+    if executor == 'thread':
+        with contextlib.nullcontext(pool) if pool is not None else ThreadPoolExecutor(n_workers) as workers:
+            for future in as_completed([workers.submit(_solve_range, arrays, start, stop, method, bounds)
+                                        for start, stop in chunks]):
+                future.result()
+        return arrays['out']
+    
+    segments = {}
+    try:
+        for name, array in arrays.items():
+            segments[name] = _to_shared(array)
+        specs = {name: (shm.name, shape, dtype) for name, (shm, shape, dtype) in segments.items()}
+        with contextlib.nullcontext(pool) if pool is not None else ProcessPoolExecutor(n_workers) as workers:
+            futures = [workers.submit(_solve_chunk, specs, start, stop, method, bounds) for start, stop in chunks]
+            for future in as_completed(futures):
+                future.result()
+        shm, shape, dtype = segments['out']
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf).copy()
+    finally:
+        for shm, _, _ in segments.values():
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,267 @@
+import json
+import os
+from dataclasses import dataclass
+import numpy as np
+from .utils import split_params
+
+GALAXY_PARAM_NAMES = ('r_d', 'M_d', 'r_b', 'M_b', 'r_h', 'M_h')
+GAS_PARAM_NAMES = ('r_g', 'M_g', 'T', 'v_turb', 'B0', 'r_B', 'reconnection_rate', 'P_cr0', 'r_cr', 'v_flow')
+PARAM_NAMES = GALAXY_PARAM_NAMES + GAS_PARAM_NAMES
+
+def _validate(kind, names, values, positive, non_negative):
+    """Raise ValueError naming the parameters whose values are non-finite or out of range."""
+    values = np.asarray(values, dtype=float).reshape(-1, len(names))
+    bad = [name for i, name in enumerate(names)
+           if not np.all(np.isfinite(values[:, i]))
+           or (name in positive and np.any(values[:, i] <= 0))
+           or (name in non_negative and np.any(values[:, i] < 0))]
+    if bad:
+        raise ValueError(f"Invalid {kind} values for: {', '.join(bad)}.")
+
+class _Params:
+    """Tuple-like behaviour shared by GalaxyParams and GasParams."""
+    __slots__ = ()
+
+    def __post_init__(self):
+        for name in self.NAMES:
+            object.__setattr__(self, name, float(getattr(self, name)))
+        _validate(type(self).__name__, self.NAMES, tuple(self), self.POSITIVE, self.NON_NEGATIVE)
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.NAMES)
+
+    def __len__(self):
+        return len(self.NAMES)
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(tuple(self), dtype=dtype)
+
+    @classmethod
+    def from_dict(cls, values):
+        """Build parameters from a mapping of names to values, ignoring other keys."""
+        return cls(**{name: values[name] for name in cls.NAMES})
+
+    def to_dict(self):
+        """Return the parameters as a dict of names to values."""
+        return {name: getattr(self, name) for name in self.NAMES}
+
+@dataclass(frozen=True)
+class GalaxyParams(_Params):
+    """
+    Parameters of the galaxy mass model in SI units.
+    
+    Instances are immutable, have no per-instance __dict__ and behave like
+    the (r_d, M_d, r_b, M_b, r_h, M_h) tuple they replace: they can be
+    unpacked, indexed and converted with np.asarray, and are accepted
+    wherever galaxy_params is.
+    
+    Args:
+        r_d (float): Disk scale radius in meters.
+        M_d (float): Disk mass in kg.
+        r_b (float): Bulge scale radius in meters.
+        M_b (float): Bulge mass in kg.
+        r_h (float): Halo scale radius in meters.
+        M_h (float): Halo mass in kg.
+    
+    Raises:
+        ValueError: If a value is non-finite or not positive.
+    """
+    __slots__ = GALAXY_PARAM_NAMES
+    NAMES = GALAXY_PARAM_NAMES
+    POSITIVE = GALAXY_PARAM_NAMES
+    NON_NEGATIVE = ()
+    
+    r_d: float
+    M_d: float
+    r_b: float
+    M_b: float
+    r_h: float
+    M_h: float
+
+@dataclass(frozen=True)
+class GasParams(_Params):
+    """
+    Parameters of the gas, magnetic-field and cosmic-ray models in SI units.
+    
+    Instances behave like the (r_g, M_g, T, v_turb, B0, r_B,
+    reconnection_rate, P_cr0, r_cr, v_flow) tuple they replace.
+    
+    Args:
+        r_g (float): Gas scale radius in meters.
+        M_g (float): Gas mass in kg.
+        T (float): Gas temperature in Kelvin.
+        v_turb (float): Turbulent velocity in m/s.
+        B0 (float): Central magnetic field strength in Tesla.
+        r_B (float): Magnetic field scale radius in meters.
+        reconnection_rate (float): Reconnection rate (dimensionless).
+        P_cr0 (float): Central cosmic ray pressure in Pa.
+        r_cr (float): Cosmic ray scale radius in meters.
+        v_flow (float): Gas flow velocity in m/s.
+    
+    Raises:
+        ValueError: If a value is non-finite, a scale radius or mass is not
+            positive, or an amplitude is negative.
+    """
+    __slots__ = GAS_PARAM_NAMES
+    NAMES = GAS_PARAM_NAMES
+    POSITIVE = ('r_g', 'M_g', 'r_B', 'r_cr')
+    NON_NEGATIVE = ('T', 'v_turb', 'B0', 'reconnection_rate', 'P_cr0')
+    
+    r_g: float
+    M_g: float
+    T: float
+    v_turb: float
+    B0: float
+    r_B: float
+    reconnection_rate: float
+    P_cr0: float
+    r_cr: float
+    v_flow: float
+
+class _ParamsBatch:
+    """
+    Many parameter sets stored as one contiguous (n_models, n_params) array.
+    
+    Columns are exposed as attributes (views into the array), single models
+    are returned as parameter objects by integer indexing, and the batch
+    converts to its array with np.asarray, so it is accepted wherever a
+    batched parameter array is.
+    
+    Args:
+        data (array): Parameter values, shape (n_models, n_params).
+    
+    Raises:
+        ValueError: If the shape is wrong or a value is out of range.
+    """
+    PARAMS = None
+
+    def __init__(self, data):
+        data = np.ascontiguousarray(np.atleast_2d(np.asarray(data, dtype=float)))
+        names = self.PARAMS.NAMES
+        if data.ndim != 2 or data.shape[1] != len(names):
+            raise ValueError(f"Expected an array of shape (n_models, {len(names)}), got {data.shape}.")
+        _validate(type(self).__name__, names, data, self.PARAMS.POSITIVE, self.PARAMS.NON_NEGATIVE)
+        self.data = data
+
+    @classmethod
+    def from_columns(cls, **columns):
+        """
+        Build a batch from one array (or scalar) per parameter.
+        
+        Args:
+            **columns: Values for every parameter name, broadcast to a common
+                length.
+        
+        Returns:
+            Batch of the given models.
+        """
+        missing = set(cls.PARAMS.NAMES) - set(columns)
+        if missing:
+            raise ValueError(f"Missing parameters: {sorted(missing)}.")
+        arrays = np.broadcast_arrays(*(np.atleast_1d(np.asarray(columns[name], dtype=float))
+                                       for name in cls.PARAMS.NAMES))
+        return cls(np.stack(arrays, axis=-1))
+
+    @classmethod
+    def from_params(cls, params):
+        """Build a batch from a sequence of parameter objects or tuples."""
+        return cls(np.array([tuple(p) for p in params], dtype=float))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self.PARAMS(*self.data[index])
+        return type(self)(self.data[index])
+
+    def __iter__(self):
+        return (self.PARAMS(*row) for row in self.data)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(n_models={len(self)})"
+
+    def split(self, ndim=0):
+        """Return one column per parameter, shaped to broadcast against `ndim`-dimensional radii."""
+        return split_params(self.data, ndim)
+
+    def to_dict(self):
+        """Return the batch as a dict of names to column lists."""
+        return {name: self.data[:, i].tolist() for i, name in enumerate(self.PARAMS.NAMES)}
+
+    @classmethod
+    def from_dict(cls, values):
+        """Build a batch from a mapping of names to columns, ignoring other keys."""
+        return cls.from_columns(**{name: values[name] for name in cls.PARAMS.NAMES})
+
+def _add_column_properties(batch_cls):
+    """Expose every parameter column of a batch class as a read-only attribute."""
+    for i, name in enumerate(batch_cls.PARAMS.NAMES):
+        setattr(batch_cls, name, property(lambda self, i=i: self.data[:, i], doc=f"Column of {name} values."))
+    return batch_cls
+
+@_add_column_properties
+class GalaxyBatch(_ParamsBatch):
+    """Array-backed batch of GalaxyParams, shape (n_models, 6); see `_ParamsBatch`."""
+    PARAMS = GalaxyParams
+
+@_add_column_properties
+class GasBatch(_ParamsBatch):
+    """Array-backed batch of GasParams, shape (n_models, 10); see `_ParamsBatch`."""
+    PARAMS = GasParams
+
+def load_parameters(path):
+    """
+    Load galaxy and gas parameters from a JSON or NPZ file.
+    
+    JSON files use the layout of data/example_galaxy_parameters.json, with
+    "galaxy_params" and "gas_params" objects mapping names to values; lists
+    of values describe a batch. NPZ files hold one array per parameter under
+    keys such as "galaxy_params/r_d", as written by `save_parameters`.
+    
+    Args:
+        path (str): File name; the format is chosen by the extension.
+    
+    Returns:
+        tuple: (GalaxyParams, GasParams) for single values, or
+        (GalaxyBatch, GasBatch) for columns.
+    """
+    if os.fspath(path).endswith('.npz'):
+        with np.load(path) as data:
+            galaxy = {name: data[f'galaxy_params/{name}'] for name in GALAXY_PARAM_NAMES}
+            gas = {name: data[f'gas_params/{name}'] for name in GAS_PARAM_NAMES}
+    else:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        galaxy, gas = data['galaxy_params'], data['gas_params']
+    if np.ndim(galaxy['r_d']) == 0:
+        return GalaxyParams.from_dict(galaxy), GasParams.from_dict(gas)
+    return GalaxyBatch.from_dict(galaxy), GasBatch.from_dict(gas)
+
+def save_parameters(path, galaxy_params, gas_params):
+    """
+    Save galaxy and gas parameters, single or batched, to a JSON or NPZ file.
+    
+    Args:
+        path (str): File name ending in .json or .npz.
+        galaxy_params (GalaxyParams, GalaxyBatch, tuple or array): Galaxy
+            parameters.
+        gas_params (GasParams, GasBatch, tuple or array): Gas parameters.
+    """
+    galaxy = np.asarray(galaxy_params, dtype=float)
+    gas = np.asarray(gas_params, dtype=float)
+    columns = {'galaxy_params': dict(zip(GALAXY_PARAM_NAMES, galaxy.T)),
+               'gas_params': dict(zip(GAS_PARAM_NAMES, gas.T))}
+    if os.fspath(path).endswith('.npz'):
+        np.savez(path, **{f'{group}/{name}': values
+                          for group, values_by_name in columns.items() for name, values in values_by_name.items()})
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({group: {name: values.tolist() for name, values in values_by_name.items()}
+                       for group, values_by_name in columns.items()}, f, indent=4)
@@ -0,0 +1,297 @@
+import math
+import numpy as np
+from functools import lru_cache
+from .gradients import SplineProfile
+from .mass_models import _interp_table
+from .utils import split_params
+
+# Registered components, keyed by name
+COMPONENTS = {}
+
+class Component:
+    """
+    Spherical density component of a mass model.
+    
+    A component declares its density, the radial derivative of the density
+    and, where one exists, its enclosed mass M(<r) in closed form. Components
+    without a closed-form mass are integrated numerically once per parameter
+    set and the table is kept in an LRU cache.
+    
+    Args:
+        name (str): Registry name.
+        param_names (tuple of str): Parameter names; the first must be the
+            scale radius, which sets the range of numerical integration.
+        density (callable): rho(r, *params) in kg/m^3.
+        density_gradient (callable, optional): d(rho)/dr(r, *params). Defaults
+            to the derivative of a cubic spline through the density, built
+            once per parameter set and kept in an LRU cache.
+        mass (callable, optional): Closed-form M(<r)(r, *params) in kg,
+            integrated from the centre.
+    """
+
+    def __init__(self, name, param_names, density, density_gradient=None, mass=None):
+        self.name = name
+        self.param_names = tuple(param_names)
+        self._density = density
+        self._density_gradient = density_gradient
+        self._mass = mass
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, {self.param_names})"
+
+    @property
+    def analytic(self):
+        """Whether the enclosed mass has a closed form."""
+        return self._mass is not None
+
+    def density(self, r, *params):
+        """Evaluate the density in kg/m^3."""
+        return self._density(r, *params)
+
+    def density_gradient(self, r, *params):
+        """Evaluate d(rho)/dr in kg/m^4, in closed form or from the cached spline."""
+        if self._density_gradient is not None:
+            return self._density_gradient(r, *params)
+        return _spline_gradient(self, r, params)
+
+    def enclosed_mass(self, r, *params):
+        """Evaluate the mass enclosed within r in kg, in closed form or from the cached integration."""
+        if self._mass is not None:
+            return self._mass(r, *params)
+        return _numeric_mass(self, r, params)
+
+    def mass_gradient(self, r, *params):
+        """Evaluate dM/dr = 4 pi r^2 rho in kg/m."""
+        return 4 * np.pi * r**2 * self.density(r, *params)
+
+    def integration_grid(self, params, n_grid=4000):
+        """Logarithmic grid for the numerical mass integration of one parameter set."""
+        return np.geomspace(1e-4 * params[0], 1e4 * params[0], n_grid)
+
+class TabulatedComponent(Component):
+    """
+    Density component interpolated from user-supplied values.
+    
+    The density is a cubic spline in log r and log rho (see SplineProfile),
+    so its gradient is the spline derivative; beyond the table the density
+    is zero. The mass is integrated numerically over the table range, with a
+    uniform-density core inside the first radius. The component has no
+    parameters.
+    
+    Args:
+        name (str): Registry name.
+        r (array): Increasing radii in meters.
+        density (array): Positive densities at `r` in kg/m^3.
+    """
+
+    def __init__(self, name, r, density):
+        spline = SplineProfile(r, density, log=True)
+        self.r = spline.r
+
+        def tabulated(x):
+            return np.where(x <= self.r[-1], spline(x), 0.0)
+
+        def tabulated_gradient(x):
+            return np.where(x <= self.r[-1], spline.gradient(x), 0.0)
+        
+        super().__init__(name, (), tabulated, tabulated_gradient)
+
+    def integration_grid(self, params, n_grid=4000):
+        return np.geomspace(self.r[0], self.r[-1], n_grid)
+
+def register_component(component):
+    """
+    Add a component to the registry under its name.
+    
+    Args:
+        component (Component): The component.
+    
+    Returns:
+        Component: The same component.
+    """
+    COMPONENTS[component.name] = component
+    return component
+
+def get_component(name):
+    """Return the registered component called `name`."""
+    try:
+        return COMPONENTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown component '{name}'. Registered: {sorted(COMPONENTS)}.") from None
+
+def _mass_table(component, params, n_grid=4000):
+    """Integrate 4*pi*r^3*rho in ln(r) on the component's grid, with a uniform core inside the first point."""
+    r_grid = component.integration_grid(params, n_grid)
+    integrand = 4 * np.pi * r_grid**3 * component.density(r_grid, *params)
+    segments = 0.5 * (integrand[1:] + integrand[:-1]) * np.diff(np.log(r_grid))
+    core = integrand[0] / 3
+    return r_grid, core + np.concatenate([[0.0], np.cumsum(segments)])
+
+@lru_cache(maxsize=256)
+def _cached_mass_table(component, params):
+    r_grid, mass = _mass_table(component, params)
+    for table in (r_grid, mass):
+        table.setflags(write=False)
+    return r_grid, mass
+
+@lru_cache(maxsize=256)
+def _cached_density_spline(component, params):
+    return SplineProfile.from_function(component.density, 1e-4 * params[0], 1e4 * params[0], *params, n_grid=2000)
+
+def _rows(params):
+    """Split scalar or per-model parameters into tuples of floats, one per model, and whether they were batched."""
+    batched = any(np.ndim(p) > 0 for p in params)
+    rows = zip(*np.broadcast_arrays(*(np.ravel(p) for p in params))) if batched else [params]
+    return [tuple(float(x) for x in row) for row in rows], batched
+
+def _spline_gradient(component, r, params):
+    """Differentiate the cached density spline of every parameter set."""
+    rows, batched = _rows(params)
+    gradients = [_cached_density_spline(component, row).gradient(r) for row in rows]
+    return np.stack(gradients) if batched else gradients[0]
+
+def _numeric_mass(component, r, params):
+    """
+    Look up the enclosed mass of a component without a closed form.
+    
+    `params` holds scalars, or arrays with one value per model; every
+    parameter set is integrated once and its table cached.
+    """
+    rows, batched = _rows(params)
+    masses = []
+    for row in rows:
+        r_grid, mass = _cached_mass_table(component, row)
+        inside = _interp_table(np.log(r), np.log(r_grid), mass)
+        masses.append(np.where(r < r_grid[0], mass[0] * (r / r_grid[0])**3, inside))
+    return np.stack(masses) if batched else masses[0]
+
+class MassModel:
+    """
+    Galaxy mass model built from registered density components.
+    
+    Parameters are a flat vector (or an (n_models, n_params) array)
+    concatenating the parameters of every component in order. The enclosed
+    mass sums the closed forms of the analytic components and integrates
+    only the others numerically, reusing their cached tables.
+    
+    Args:
+        components (sequence): Component names or Component instances.
+    """
+
+    def __init__(self, components):
+        self.components = tuple(get_component(c) if isinstance(c, str) else c for c in components)
+        self.param_names = tuple(f'{c.name}.{name}' for c in self.components for name in c.param_names)
+        bounds = np.cumsum([0] + [len(c.param_names) for c in self.components])
+        self._slices = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def __repr__(self):
+        return f"MassModel({[c.name for c in self.components]})"
+
+    @property
+    def analytic(self):
+        """Whether every component has a closed-form enclosed mass."""
+        return all(c.analytic for c in self.components)
+
+    def _split(self, r, params):
+        """Yield each component with its parameter columns shaped to broadcast against r."""
+        columns = split_params(params, np.ndim(r)) if len(self.param_names) else ()
+        for component, part in zip(self.components, self._slices):
+            yield component, tuple(columns[part])
+
+    def density(self, r, params):
+        """Evaluate the total density in kg/m^3."""
+        return sum(c.density(r, *p) for c, p in self._split(r, params))
+
+    def density_gradient(self, r, params):
+        """Evaluate d(rho)/dr of the total density in kg/m^4."""
+        return sum(c.density_gradient(r, *p) for c, p in self._split(r, params))
+
+    def enclosed_mass(self, r, params):
+        """
+        Calculate the enclosed mass.
+        
+        Args:
+            r (float or array): Radial distance(s) in meters.
+            params (tuple or array): Model parameters, shape (n_params,) or
+                (n_models, n_params).
+        
+        Returns:
+            float or array: Enclosed mass in kg, with a leading model axis for
+            batches.
+        """
+        return sum(c.enclosed_mass(r, *p) for c, p in self._split(r, params))
+
+    def mass_gradient(self, r, params):
+        """Evaluate dM/dr = 4 pi r^2 rho in kg/m."""
+        return 4 * np.pi * r**2 * self.density(r, params)
+
+# Taylor coefficients of the closed forms below about 0, where they lose
+# their precision by cancellation: (-1)^k / (k! (k + 3)) for _gamma2 and
+# (-1)^k (k + 1) / (k + 3) for _halo_mass, highest power first
+_GAMMA2_SERIES = [(-1)**k / (math.factorial(k) * (k + 3)) for k in range(18)][::-1]
+_HALO_SERIES = [(-1)**k * (k + 1) / (k + 3) for k in range(60)][::-1]
+
+def _gamma2(x):
+    """Integral of s^2 exp(-s) ds from 0 to x."""
+    x = np.asarray(x, dtype=float)
+    result = np.asarray(2 - np.exp(-x) * (x**2 + 2*x + 2))
+    small = x < 1
+    result[small] = x[small]**3 * np.polyval(_GAMMA2_SERIES, x[small])
+    return result[()]
+
+def _halo_mass(y):
+    """Integral of u^2 / (1 + u)^2 du from 0 to y."""
+    y = np.asarray(y, dtype=float)
+    result = np.asarray(y - 2 * np.log1p(y) + y / (1 + y))
+    small = y < 0.5
+    result[small] = y[small]**3 * np.polyval(_HALO_SERIES, y[small])
+    return result[()]
+
+# Components of `mass_models.mass_density`, in its normalisations
+register_component(Component(
+    'exponential_disk', ('r_d', 'M_d'),
+    density=lambda r, a, M: M / (2 * np.pi * a**2) * np.exp(-r / a),
+    density_gradient=lambda r, a, M: -M / (2 * np.pi * a**3) * np.exp(-r / a),
+    mass=lambda r, a, M: 2 * M * a * _gamma2(r / a),
+))
+register_component(Component(
+    'exponential_bulge', ('r_b', 'M_b'),
+    density=lambda r, a, M: M / (2 * np.pi * a**3) * np.exp(-r / a),
+    density_gradient=lambda r, a, M: -M / (2 * np.pi * a**4) * np.exp(-r / a),
+    mass=lambda r, a, M: 2 * M * _gamma2(r / a),
+))
+register_component(Component(
+    'halo', ('r_h', 'M_h'),
+    density=lambda r, a, M: M / (4 * np.pi * a**3) * (1 + r/a)**-2,
+    density_gradient=lambda r, a, M: -M / (2 * np.pi * a**4) * (1 + r/a)**-3,
+    mass=lambda r, a, M: M * _halo_mass(r / a),
+))
+
+# Standard profiles; M is the total mass (Hernquist) or 4*pi*rho_0*a^3
+register_component(Component(
+    'hernquist', ('a', 'M'),
+    density=lambda r, a, M: M * a / (2 * np.pi * r * (r + a)**3),
+    density_gradient=lambda r, a, M: -M * a * (4*r + a) / (2 * np.pi * r**2 * (r + a)**4),
+    mass=lambda r, a, M: M * r**2 / (r + a)**2,
+))
+register_component(Component(
+    'nfw', ('r_s', 'M'),
+    density=lambda r, a, M: M / (4 * np.pi * r * (a + r)**2),
+    density_gradient=lambda r, a, M: -M * (a + 3*r) / (4 * np.pi * r**2 * (a + r)**3),
+    mass=lambda r, a, M: M * (np.log1p(r/a) - r / (a + r)),
+))
+register_component(Component(
+    'burkert', ('r_0', 'M'),
+    density=lambda r, a, M: M / (4 * np.pi * (a + r) * (a**2 + r**2)),
+    density_gradient=lambda r, a, M: -M * (a**2 + 2*a*r + 3*r**2) / (4 * np.pi * (a + r)**2 * (a**2 + r**2)**2),
+    mass=lambda r, a, M: M / 4 * (2 * np.log1p(r/a) + np.log1p((r/a)**2) - 2 * np.arctan(r/a)),
+))
+register_component(Component(
+    'isothermal', ('r_c', 'M'),
+    density=lambda r, a, M: M / (4 * np.pi * a * (a**2 + r**2)),
+    density_gradient=lambda r, a, M: -M * r / (2 * np.pi * a * (a**2 + r**2)**2),
+    mass=lambda r, a, M: M * (r/a - np.arctan(r/a)),
+))
+
+# The disk + bulge + halo model of `mass_models.mass_density`, entirely in closed form
+DEFAULT_MODEL = MassModel(('exponential_disk', 'exponential_bulge', 'halo'))
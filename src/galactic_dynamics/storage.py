@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from .mass_models import MassProfile
+from .velocity_solver import ForceTable, as_parameter_batch, solve_velocity_batch
+
+# Arrays making up a result store, one .npy file each
+RESULT_FIELDS = ('r', 'galaxy_params', 'gas_params', 'velocity', 'enclosed_mass')
+
+class ResultStore:
+    """
+    Memory-mapped view of rotation curves written by `write_results`.
+    
+    Every array is opened with `np.load(..., mmap_mode)`, so nothing is read
+    from disk until it is sliced: `store.velocity[1000:1010]` touches only
+    those ten rows.
+    
+    Attributes:
+        path (str): Directory holding the store.
+        r (array): Radial grid in meters, shape (n_radii,).
+        galaxy_params (array): Galaxy parameters, shape (n_models, 6).
+        gas_params (array): Gas parameters, shape (n_models, 10).
+        velocity (array): Velocities in m/s, shape (n_models, n_radii).
+        enclosed_mass (array or None): Enclosed masses in kg, shape
+            (n_models, n_radii), or None if they were not written.
+        metadata (dict): Solver method, options and storage dtype.
+    """
+
+    def __init__(self, path, mode='r'):
+        self.path = path
+        with open(os.path.join(path, 'metadata.json')) as f:
+            self.metadata = json.load(f)
+        for name in RESULT_FIELDS:
+            filename = os.path.join(path, f'{name}.npy')
+            setattr(self, name, np.load(filename, mmap_mode=mode) if os.path.exists(filename) else None)
+
+    def __len__(self):
+        return len(self.velocity)
+
+    def __getitem__(self, models):
+        """
+        Load the curves of selected models into memory.
+        
+        Args:
+            models (int, slice or array): Model indices.
+        
+        Returns:
+            dict: 'galaxy_params', 'gas_params', 'velocity' and, if stored,
+            'enclosed_mass' for the selected models.
+        """
+        return {name: np.asarray(getattr(self, name)[models]) for name in RESULT_FIELDS[1:]
+                if getattr(self, name) is not None}
+
+    def __repr__(self):
+        return f"ResultStore({self.path!r}, n_models={len(self)}, n_radii={len(self.r)})"
+
+def write_results(path, r, galaxy_params, gas_params, method='rk4', chunk_size=1000, dtype=np.float64,
+                  store_mass=True, **options):
+    """
+    Solve a batch of models chunk by chunk and stream the results to disk.
+    
+    Results are written into preallocated `.npy` files in the directory
+    `path` through memory maps, so at most `chunk_size` models are held in
+    memory at a time regardless of the batch size. The files are ordinary
+    `.npy` files and can also be read with `np.load` directly.
+    
+    The store is written into a temporary directory next to `path` and only
+    moved into place once complete, so an interrupted write leaves any
+    previous results at `path` intact.
+    
+    Args:
+        path (str): Output directory. An existing directory is replaced.
+        r (array): Radial distances in meters.
+        galaxy_params (array): Galaxy parameters, shape (n_models, 6).
+        gas_params (array): Gas parameters, shape (n_models, 10).
+        method (str): Integration method passed to `solve_velocity`.
+        chunk_size (int): Number of models solved and written at a time.
+        dtype (dtype): Storage type of the velocity and mass arrays, e.g.
+            np.float32 to halve the file size. The integration itself always
+            runs in float64.
+        store_mass (bool): Whether to also write the enclosed mass M(r).
+        **options: Extra keyword options passed to the solver.
+    
+    Returns:
+        ResultStore: Read-only memory-mapped view of the written results.
+    """
+    r = np.asarray(r, dtype=float)
+    galaxy_params, gas_params = as_parameter_batch(galaxy_params, gas_params)
+    dtype = np.dtype(dtype)
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        _write_store(tmp, r, galaxy_params, gas_params, method, chunk_size, dtype, store_mass, options)
+        if os.path.exists(path):
+            # A non-empty directory cannot be replaced directly; move it aside first
+            old = tempfile.mkdtemp(dir=os.path.dirname(path), suffix=".old")
+            os.replace(path, os.path.join(old, 'store'))
+            os.replace(tmp, path)
+            shutil.rmtree(old)
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return ResultStore(path)
+
+def _write_store(path, r, galaxy_params, gas_params, method, chunk_size, dtype, store_mass, options):
+    """Write all files of a store into the empty directory `path`, metadata last."""
+    n_models = len(galaxy_params)
+    for name, array in (('r', r), ('galaxy_params', galaxy_params), ('gas_params', gas_params)):
+        np.save(os.path.join(path, f'{name}.npy'), array)
+    fields = ('velocity', 'enclosed_mass') if store_mass else ('velocity',)
+    outputs = {name: np.lib.format.open_memmap(os.path.join(path, f'{name}.npy'), mode='w+', dtype=dtype,
+                                               shape=(n_models, len(r)))
+               for name in fields}
+    
+    for start in range(0, n_models, chunk_size):
+        stop = min(start + chunk_size, n_models)
+        mass_profile = MassProfile(galaxy_params[start:stop])
+        force_table = ForceTable(gas_params[start:stop])
+        outputs['velocity'][start:stop] = solve_velocity_batch(r, galaxy_params[start:stop], gas_params[start:stop],
+                                                               method, mass_profile, force_table, **options)
+        if store_mass:
+            outputs['enclosed_mass'][start:stop] = mass_profile(r)
+    for output in outputs.values():
+        output.flush()
+    del outputs
+    
+    with open(os.path.join(path, 'metadata.json'), 'w') as f:
+        json.dump({'method': method, 'options': options, 'dtype': dtype.str, 'n_models': n_models}, f)
+
+def open_results(path, mode='r'):
+    """
+    Memory-map results written by `write_results` without loading them.
+    
+    Args:
+        path (str): Directory holding the results.
+        mode (str): Memory-map mode, 'r' for read-only or 'r+' to modify the
+            files in place.
+    
+    Returns:
+        ResultStore: Memory-mapped view of the results.
+    """
+    return ResultStore(path, mode)
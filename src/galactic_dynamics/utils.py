@@ -19,4 +19,27 @@ def m_s_to_km_s(velocity_m_s):
 def calculate_circular_velocity(mass, radius):
     """Calculate circular velocity for a given mass and radius."""
     G = 6.67430e-11  # gravitational constant
-    return np.sqrt(G * mass / radius)
\ No newline at end of file
+    return np.sqrt(G * mass / radius)
+
+def split_params(params, ndim=0):
+    """
+    Split a parameter tuple or a batch of parameter sets into columns.
+    
+    Args:
+        params (tuple or array): A single parameter tuple, or an array of
+            shape (n_models, n_params) holding one parameter set per row.
+            Parameter objects and batches from `parameters` are converted
+            with np.asarray.
+        ndim (int): Number of dimensions of the radial array the columns
+            will be combined with.
+    
+    Returns:
+        tuple: One entry per parameter. For a batch each entry has shape
+        (n_models,) followed by `ndim` singleton axes, so that profile
+        functions broadcast to a leading model axis.
+    """
+    if not isinstance(params, (tuple, list, np.ndarray)):
+        params = np.asarray(params, dtype=float)
+    if isinstance(params, np.ndarray) and params.ndim == 2:
+        return tuple(params.T.reshape(params.shape[::-1] + (1,) * ndim))
+    return tuple(params)
@@ -1,87 +1,599 @@
 import numpy as np
-from scipy.integrate import odeint
-from .constants import G, c
-from .mass_models import enclosed_mass
-from .gas_models import gas_density, pressure_gradient, turbulence_pressure
-from .magnetic_models import magnetic_field_strength, magnetic_pressure, magnetic_reconnection_heating
-from .cosmic_ray_models import cosmic_ray_pressure, cosmic_ray_gradient
-
-def total_acceleration(r, v, galaxy_params, gas_params):
-    """Calculate total acceleration including all effects."""
-    r_d, M_d, r_b, M_b, r_h, M_h = galaxy_params
-    r_g, M_g, T, v_turb, B0, r_B, reconnection_rate, P_cr0, r_cr, v_flow = gas_params
+from functools import lru_cache
+from .constants import G, c, k_B, m_p
+from .mass_models import enclosed_mass, get_mass_profile, MassProfile
+from .gas_models import gas_density, pressure_gradient, turbulence_pressure_gradient
+from .magnetic_models import magnetic_field_strength, magnetic_pressure_gradient, magnetic_reconnection_heating
+from .cosmic_ray_models import cosmic_ray_gradient
+from .utils import split_params
+from . import profiling
+
+def _hermite(grid, values, derivatives, r):
+    """Cubic Hermite interpolation of (possibly stacked) tables, clamped at the ends."""
+    idx = np.clip(np.searchsorted(grid, r), 1, len(grid) - 1)
+    width = grid[idx] - grid[idx - 1]
+    t = np.clip((r - grid[idx - 1]) / width, 0, 1)
+    h00 = (1 + 2*t) * (1 - t)**2
+    h10 = t * (1 - t)**2
+    h01 = t**2 * (3 - 2*t)
+    h11 = t**2 * (t - 1)
+    y0, y1 = values[..., idx - 1], values[..., idx]
+    d0, d1 = derivatives[..., idx - 1], derivatives[..., idx]
+    return h00*y0 + h10*width*d0 + h01*y1 + h11*width*d1
+
+class ForceTable:
+    """
+    Gas, magnetic and cosmic-ray force terms tabulated on a radial grid.
+    
+    The velocity-independent terms (gas pressure, turbulence, magnetic
+    pressure and cosmic rays) are evaluated once from their analytic radial
+    derivatives and summed. The reconnection heating per unit gas density is
+    stored separately because it is divided by v at every evaluation. Both
+    tables are served by cubic Hermite interpolation using their exact
+    derivatives, so the integrators get the full physics at every stage for
+    the cost of one table lookup. The gas flow velocity is constant in this
+    model and contributes no acceleration. Radii outside the table are
+    clamped to its edges.
+    
+    Args:
+        gas_params (tuple or array): (r_g, M_g, T, v_turb, B0, r_B,
+            reconnection_rate, P_cr0, r_cr, v_flow) in SI units, or an array of
+            shape (n_models, 10).
+        r_min (float, optional): Inner edge of the table in meters. Defaults to
+            1e-3 times the smallest scale radius.
+        r_max (float, optional): Outer edge of the table in meters. Defaults to
+            1e2 times the largest scale radius.
+        n_grid (int): Number of points in the table.
+        backend (str): Backend of the profile kernel used to tabulate the
+            terms, 'numpy' or 'numba'.
+    """
+
+    # Individually tabulated terms, in the row order of `_tabulate_components`
+    COMPONENTS = ('pressure', 'turb', 'magnetic', 'cr', 'reconnection')
+
+    def __init__(self, gas_params, r_min=None, r_max=None, n_grid=4000, backend='numpy'):
+        self.params = np.asarray(gas_params, dtype=float)
+        self.backend = backend
+        default_min, default_max = self._bounds(self.params)
+        r_min = default_min if r_min is None else r_min
+        r_max = default_max if r_max is None else r_max
+        self.r_grid = np.geomspace(r_min, r_max, n_grid)
+        self.values, self.derivatives = self._tabulate(self.r_grid, self.params, backend)
+        self._components = None
+        for table in (self.r_grid, self.values, self.derivatives):
+            table.setflags(write=False)
+
+    @staticmethod
+    def _bounds(gas_params):
+        """Default (r_min, r_max) of the table for one parameter set or a batch."""
+        scales = np.asarray(gas_params, dtype=float)[..., [0, 5, 8]]
+        return 1e-3 * scales.min(), 1e2 * scales.max()
+
+    @staticmethod
+    def _tabulate_components(r, gas_params, backend='numpy'):
+        """
+        Evaluate each term in COMPONENTS and its r-derivative.
+        
+        The profiles come from one pass of the profile kernel and the terms
+        are computed in place into two preallocated arrays.
+        """
+        from .kernels import evaluate_gas_profiles
+        r_g, M_g, T, v_turb, B0, r_B, reconnection_rate, P_cr0, r_cr, v_flow = split_params(gas_params, np.ndim(r))
+        profiles = evaluate_gas_profiles(r, gas_params, backend=backend)
+        rho_gas = profiles[0]
+        values = np.empty((len(ForceTable.COMPONENTS),) + rho_gas.shape)
+        derivatives = np.empty_like(values)
+        a_pressure, a_turb, a_magnetic, a_cr, heating = values
+        
+        np.multiply(k_B * T / (m_p * r), profiles[1], out=a_pressure)
+        a_pressure /= rho_gas
+        np.divide(profiles[3], rho_gas, out=a_turb)
+        np.negative(a_turb, out=a_turb)
+        np.divide(profiles[7], rho_gas, out=a_magnetic)
+        np.negative(a_magnetic, out=a_magnetic)
+        np.divide(profiles[9], rho_gas, out=a_cr)
+        np.multiply(profiles[4], profiles[4], out=heating)
+        heating *= reconnection_rate
+        heating /= 8 * np.pi * 4e-7
+        heating /= rho_gas
+        
+        np.divide(a_pressure, r, out=derivatives[0])
+        np.negative(derivatives[0], out=derivatives[0])
+        derivatives[1] = 0
+        np.multiply(a_magnetic, 1/r_g - 2/r_B, out=derivatives[2])
+        np.multiply(a_cr, 1/r_g - 1/r_cr, out=derivatives[3])
+        np.multiply(heating, 1/r_g - 2/r_B, out=derivatives[4])
+        return values, derivatives
+
+    @classmethod
+    def _tabulate(cls, r, gas_params, backend='numpy'):
+        """Evaluate the summed static terms and the reconnection term with their r-derivatives."""
+        values, derivatives = cls._tabulate_components(r, gas_params, backend)
+        return (np.stack([values[:4].sum(axis=0), values[4]]),
+                np.stack([derivatives[:4].sum(axis=0), derivatives[4]]))
+
+    @classmethod
+    def from_table(cls, gas_params, r_grid, values, derivatives):
+        """
+        Wrap existing force tables without evaluating them again.
+        
+        Args:
+            gas_params (tuple or array): Gas parameters the tables were built from.
+            r_grid (array): Radial grid in meters.
+            values (array): Static and reconnection terms, shape (2, n_grid) or
+                (2, n_models, n_grid).
+            derivatives (array): Their radial derivatives, same shape.
+        
+        Returns:
+            ForceTable: Table serving lookups from the given arrays.
+        """
+        table = cls.__new__(cls)
+        table.params = np.asarray(gas_params, dtype=float)
+        table.r_grid = np.asarray(r_grid, dtype=float)
+        table.values = np.asarray(values, dtype=float)
+        table.derivatives = np.asarray(derivatives, dtype=float)
+        table.backend = 'numpy'
+        table._components = None
+        return table
+
+    def terms(self, r):
+        """
+        Interpolate the tabulated terms.
+        
+        Args:
+            r (float or array): Radial distance(s) in meters.
+        
+        Returns:
+            tuple: (static, heating) where `static` is the summed
+            velocity-independent acceleration in m/s^2 and `heating` is the
+            reconnection heating per unit gas density.
+        """
+        result = _hermite(self.r_grid, self.values, self.derivatives, r)
+        return result[0], result[1]
+
+    def component(self, name, r, v):
+        """
+        Evaluate a single force term.
+        
+        The per-term tables are built on first use, so they cost nothing
+        unless individual terms are requested.
+        
+        Args:
+            name (str): One of COMPONENTS.
+            r (float or array): Radial distance(s) in meters.
+            v (float or array): Rotation velocity in m/s.
+        
+        Returns:
+            float or array: Acceleration from that term in m/s^2.
+        """
+        if self._components is None:
+            self._components = self._tabulate_components(self.r_grid, self.params, self.backend)
+        row = self.COMPONENTS.index(name)
+        values, derivatives = self._components
+        value = _hermite(self.r_grid, values[row], derivatives[row], r)
+        return value / v if name == 'reconnection' else value
+
+    def __call__(self, r, v):
+        """
+        Evaluate the non-gravitational acceleration.
+        
+        Args:
+            r (float or array): Radial distance(s) in meters.
+            v (float or array): Rotation velocity in m/s.
+        
+        Returns:
+            float or array: Acceleration in m/s^2.
+        """
+        static, heating = self.terms(r)
+        return static + heating / v
+
+@lru_cache(maxsize=128)
+def _cached_force_table(gas_params):
+    return ForceTable(gas_params)
+
+def get_force_table(gas_params):
+    """
+    Return the shared ForceTable for a set of gas parameters.
+    
+    Args:
+        gas_params (tuple): Gas parameters.
+    
+    Returns:
+        ForceTable: Tabulated force terms, kept in an LRU cache keyed on the
+        parameter tuple.
+    """
+    return _cached_force_table(tuple(float(p) for p in gas_params))
+
+def total_acceleration(r, v, galaxy_params, gas_params, mass_profile=None, force_table=None):
+    """
+    Calculate total acceleration including all effects.
+    
+    If a MassProfile is given it is used for M(r); otherwise the enclosed
+    mass is integrated from scratch with `enclosed_mass`. If a ForceTable is
+    given the gas, magnetic and cosmic-ray terms are looked up from it;
+    otherwise they are derived from the profiles. Batched parameter arrays of
+    shape (n_models, 6) and (n_models, 10) give one acceleration per model
+    along a leading axis. Inside `profiling.profile_solver` every term is
+    timed separately.
+    """
+    profile = profiling._active.get()
+    if profile is not None:
+        return _profiled_acceleration(profile, r, v, galaxy_params, gas_params, mass_profile, force_table)
     
     # Gravitational acceleration
-    a_grav = -G * enclosed_mass(r, galaxy_params) / r**2
+    if mass_profile is None:
+        M = enclosed_mass(r, galaxy_params)
+    else:
+        M = mass_profile(r)
+    a_grav = -G * M / r**2
     
     # Gravitomagnetic effect
     omega = v / r
     a_gm = v**2 * omega * r / (2 * c**2)
     
-    # Gas pressure
+    if force_table is not None:
+        return a_grav + a_gm + force_table(r, v)
+    
+    a = a_grav + a_gm
+    for term in _gas_terms(r, v, gas_params).values():
+        a = a + term
+    return a
+
+def _gas_terms(r, v, gas_params, timer=profiling._untimed):
+    """Derive the gas, magnetic, cosmic-ray and flow accelerations from the profiles' analytic gradients."""
+    r_g, M_g, T, v_turb, B0, r_B, reconnection_rate, P_cr0, r_cr, v_flow = split_params(gas_params, np.ndim(r))
     rho_gas = gas_density(r, r_g, M_g)
-    a_pressure = -pressure_gradient(r, r_g, M_g, T) / rho_gas
+    terms = {}
+    
+    # Gas pressure
+    with timer('pressure'):
+        terms['pressure'] = -pressure_gradient(r, r_g, M_g, T) / rho_gas
     
     # Turbulence
-    if np.isscalar(r):
-        a_turb = 0  # Assume no turbulence effect for single point
-    else:
-        a_turb = -np.gradient(turbulence_pressure(r, r_g, M_g, v_turb), r) / rho_gas
+    with timer('turb'):
+        terms['turb'] = -turbulence_pressure_gradient(r, r_g, M_g, v_turb) / rho_gas
     
     # Magnetic effects
     B = magnetic_field_strength(r, B0, r_B)
-    if np.isscalar(r):
-        a_magnetic = 0  # Assume no magnetic effect for single point
-    else:
-        a_magnetic = -np.gradient(magnetic_pressure(B), r) / rho_gas
+    with timer('magnetic'):
+        terms['magnetic'] = -magnetic_pressure_gradient(r, B0, r_B) / rho_gas
     
     # Cosmic ray pressure
-    a_cr = cosmic_ray_gradient(r, P_cr0, r_cr) / rho_gas
+    with timer('cr'):
+        terms['cr'] = cosmic_ray_gradient(r, P_cr0, r_cr) / rho_gas
     
     # Magnetic reconnection heating
-    a_reconnection = magnetic_reconnection_heating(r, B, reconnection_rate) / (rho_gas * v)
+    with timer('reconnection'):
+        terms['reconnection'] = magnetic_reconnection_heating(r, B, reconnection_rate) / (rho_gas * v)
     
-    # Gas flow
-    if np.isscalar(r):
-        a_flow = 0  # Assume no flow effect for single point
-    else:
-        a_flow = v_flow * np.gradient(v_flow, r)
+    # Gas flow: v_flow dv_flow/dr vanishes for the constant flow velocity of this model
+    with timer('flow'):
+        terms['flow'] = 0 * v_flow
     
-    return a_grav + a_gm + a_pressure + a_turb + a_magnetic + a_cr + a_reconnection + a_flow
+    return terms
+
+def _profiled_acceleration(profile, r, v, galaxy_params, gas_params, mass_profile, force_table):
+    """`total_acceleration` with every term timed into `profile`."""
+    timer = profile.timer
+    with timer('total_acceleration'):
+        with timer('enclosed_mass'):
+            if mass_profile is None:
+                M = enclosed_mass(r, galaxy_params)
+            else:
+                M = mass_profile(r)
+        with timer('grav'):
+            a = -G * M / r**2
+        with timer('gm'):
+            a = a + v**3 / (2 * c**2)
+        
+        if force_table is None:
+            terms = _gas_terms(r, v, gas_params, timer)
+        elif isinstance(force_table, ForceTable):
+            terms = {}
+            for name in ForceTable.COMPONENTS:
+                with timer(name):
+                    terms[name] = force_table.component(name, r, v)
+        else:
+            # Opaque force callable; it cannot be split into components
+            with timer('force_table'):
+                terms = {'force_table': force_table(r, v)}
+        for term in terms.values():
+            a = a + term
+    return a
+
+def _default_mass_profile(galaxy_params):
+    """Return the cached profile for one galaxy, or a fresh table for a batch."""
+    if np.ndim(galaxy_params) == 2:
+        return MassProfile(np.asarray(galaxy_params, dtype=float))
+    return get_mass_profile(galaxy_params)
+
+def _default_force_table(gas_params):
+    """Return the cached force table for one gas model, or a fresh table for a batch."""
+    if np.ndim(gas_params) == 2:
+        return ForceTable(np.asarray(gas_params, dtype=float))
+    return get_force_table(gas_params)
 
-def solve_velocity_odeint(r, galaxy_params, gas_params):
+def solve_velocity_odeint(r, galaxy_params, gas_params, mass_profile=None, force_table=None):
     """Solve for velocity profile using scipy's odeint."""
+    from scipy.integrate import odeint
+    if mass_profile is None:
+        mass_profile = _default_mass_profile(galaxy_params)
+    if force_table is None:
+        force_table = _default_force_table(gas_params)
+    
     def dv_dr(v, r):
-        return total_acceleration(r, v, galaxy_params, gas_params)
+        return total_acceleration(r, v, galaxy_params, gas_params, mass_profile, force_table)
     
-    v_initial = np.sqrt(G * enclosed_mass(r[0], galaxy_params) / r[0])
-    v = odeint(dv_dr, v_initial, r).flatten()
-    return v
+    v_initial = np.sqrt(G * mass_profile(r[0]) / r[0])
+    profile = profiling._active.get()
+    if profile is None:
+        v = odeint(dv_dr, np.ravel(v_initial), r)
+    else:
+        v, info = odeint(dv_dr, np.ravel(v_initial), r, full_output=True)
+        profile.add_steps('odeint', nstep=info['nst'][-1], nfev=info['nfe'][-1], njev=info['nje'][-1])
+    if np.ndim(v_initial) == 0:
+        return v.flatten()
+    return v.T
 
-def rk4_step(r, v, h, galaxy_params, gas_params):
+def rk4_step(r, v, h, galaxy_params, gas_params, mass_profile=None, force_table=None):
     """Perform a single step of the RK4 method."""
-    k1 = total_acceleration(r, v, galaxy_params, gas_params)
-    k2 = total_acceleration(r + 0.5*h, v + 0.5*h*k1, galaxy_params, gas_params)
-    k3 = total_acceleration(r + 0.5*h, v + 0.5*h*k2, galaxy_params, gas_params)
-    k4 = total_acceleration(r + h, v + h*k3, galaxy_params, gas_params)
+    k1 = total_acceleration(r, v, galaxy_params, gas_params, mass_profile, force_table)
+    k2 = total_acceleration(r + 0.5*h, v + 0.5*h*k1, galaxy_params, gas_params, mass_profile, force_table)
+    k3 = total_acceleration(r + 0.5*h, v + 0.5*h*k2, galaxy_params, gas_params, mass_profile, force_table)
+    k4 = total_acceleration(r + h, v + h*k3, galaxy_params, gas_params, mass_profile, force_table)
     return v + (h/6) * (k1 + 2*k2 + 2*k3 + k4)
 
-def solve_velocity_rk4(r, galaxy_params, gas_params):
-    """Solve for velocity profile using 4th-order Runge-Kutta method."""
-    v = np.zeros_like(r)
-    v[0] = np.sqrt(G * enclosed_mass(r[0], galaxy_params) / r[0])
+def solve_velocity_rk4(r, galaxy_params, gas_params, mass_profile=None, force_table=None, out=None):
+    """
+    Solve for velocity profile using 4th-order Runge-Kutta method.
+    
+    For batched parameters every model is advanced together, one vectorized
+    step per radius, and the result has shape (n_models, len(r)). If `out` is
+    given the solution is written into it instead of a new array.
+    """
+    if mass_profile is None:
+        mass_profile = _default_mass_profile(galaxy_params)
+    if force_table is None:
+        force_table = _default_force_table(gas_params)
+    
+    v_initial = np.sqrt(G * mass_profile(r[0]) / r[0])
+    v = np.zeros(np.shape(v_initial) + np.shape(r)) if out is None else out
+    v[..., 0] = v_initial
     
     for i in range(1, len(r)):
         h = r[i] - r[i-1]
-        v[i] = rk4_step(r[i-1], v[i-1], h, galaxy_params, gas_params)
+        v[..., i] = rk4_step(r[i-1], v[..., i-1], h, galaxy_params, gas_params, mass_profile, force_table)
     
+    profile = profiling._active.get()
+    if profile is not None:
+        profile.add_steps('rk4', nstep=len(r) - 1, nfev=4 * (len(r) - 1))
     return v
 
-def solve_velocity(r, galaxy_params, gas_params, method='rk4'):
-    """Solve for velocity profile using specified method."""
+# Dormand-Prince 5(4) tableau with the free 4th-order interpolant used for dense output
+DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+DP_A = np.array([
+    [0, 0, 0, 0, 0],
+    [1/5, 0, 0, 0, 0],
+    [3/40, 9/40, 0, 0, 0],
+    [44/45, -56/15, 32/9, 0, 0],
+    [19372/6561, -25360/2187, 64448/6561, -212/729, 0],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+])
+DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+DP_E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+DP_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+def dopri_step(r, v, h, k1, galaxy_params, gas_params, mass_profile=None, force_table=None):
+    """
+    Perform a single step of the Dormand-Prince 5(4) method.
+    
+    Args:
+        r (float): Radius at the start of the step in meters.
+        v (array): Velocity at `r` in m/s.
+        h (float): Step size in meters.
+        k1 (array): Acceleration at (r, v), reused from the previous step.
+    
+    Returns:
+        tuple: (v_new, error, K) where `error` is the embedded 4th-order error
+        estimate and K holds the seven stage derivatives; K[6] is the
+        derivative at the end of the step.
+    """
+    K = np.empty((7,) + np.shape(v))
+    K[0] = k1
+    for s in range(1, 6):
+        dv = h * np.tensordot(DP_A[s, :s], K[:s], axes=1)
+        K[s] = total_acceleration(r + DP_C[s]*h, v + dv, galaxy_params, gas_params, mass_profile, force_table)
+    v_new = v + h * np.tensordot(DP_B, K[:6], axes=1)
+    K[6] = total_acceleration(r + h, v_new, galaxy_params, gas_params, mass_profile, force_table)
+    error = h * np.tensordot(DP_E, K, axes=1)
+    return v_new, error, K
+
+def _error_norm(x, scale):
+    return np.sqrt(np.mean((x / scale)**2))
+
+def _initial_step(v0, k1, span, rtol, atol):
+    """Estimate a starting step size from the ratio of |v| to |dv/dr|."""
+    scale = atol + rtol * np.abs(v0)
+    d0 = _error_norm(v0, scale)
+    d1 = _error_norm(k1, scale)
+    if d0 < 1e-5 or d1 < 1e-5:
+        return 1e-6 * span
+    return min(0.01 * d0 / d1, span)
+
+def _dense_output(step, r):
+    """Evaluate the interpolant of an accepted step (r_start, v_start, h, K) at radii inside it."""
+    r_start, v_start, h, K = step
+    x = (r - r_start) / h
+    Q = np.tensordot(K, DP_P, axes=(0, 0))
+    return v_start[:, None] + h * Q @ np.cumprod(np.repeat(x[None, :], 4, axis=0), axis=0)
+
+def _adaptive_advance(r, out, state, galaxy_params, gas_params, mass_profile, force_table, rtol, atol, max_steps,
+                      r_stop=None):
+    """
+    Continue a Dormand-Prince integration through the radii `r`.
+    
+    `state` holds the integrator history: the current radius 'r' and
+    velocity 'v', the derivative 'k1' there, the next step size 'h', the last
+    accepted step 'step' as (r_start, v_start, h, K) for dense output, and
+    the 'info' counters. It is updated in place and the velocities at `r` are
+    written into the columns of `out`. Radii already covered by the last
+    step are interpolated from it. Steps are shortened to end at `r_stop` if
+    given; otherwise the last step may pass r[-1].
+    """
+    info = state['info']
+    r_current, v_current, k1, h = state['r'], state['v'], state['k1'], state['h']
+    j = 0
+    if state['step'] is not None:
+        j = np.searchsorted(r, r_current, side='right')
+        if j:
+            out[:, :j] = _dense_output(state['step'], r[:j])
+    
+    while j < len(r):
+        if info['nstep'] + info['nreject'] >= max_steps:
+            raise RuntimeError(f"Maximum number of steps ({max_steps}) exceeded at r={r_current:.6e} m.")
+        if r_stop is not None:
+            h = min(h, r_stop - r_current)
+        if h <= 10 * np.spacing(r_current):
+            raise RuntimeError(f"Step size underflow at r={r_current:.6e} m.")
+        
+        v_new, error, K = dopri_step(r_current, v_current, h, k1, galaxy_params, gas_params, mass_profile, force_table)
+        info['nfev'] += 6
+        scale = atol + rtol * np.maximum(np.abs(v_current), np.abs(v_new))
+        err = _error_norm(error, scale)
+        
+        if not np.isfinite(err) or err > 1:
+            info['nreject'] += 1
+            h *= 0.2 if not np.isfinite(err) else max(0.2, 0.9 * err**-0.2)
+            continue
+        
+        r_next = r_current + h if r_stop is None or r_current + h < r_stop else r_stop
+        step = (r_current, v_current, h, K)
+        stop = np.searchsorted(r, r_next, side='right')
+        if stop > j:
+            out[:, j:stop] = _dense_output(step, r[j:stop])
+            j = stop
+        
+        r_current, v_current, k1 = r_next, v_new, K[6]
+        state['step'] = step
+        info['nstep'] += 1
+        h *= 10 if err == 0 else min(10, 0.9 * err**-0.2)
+    
+    state.update(r=r_current, v=v_current, k1=k1, h=h)
+
+def solve_velocity_adaptive(r, galaxy_params, gas_params, mass_profile=None, force_table=None, rtol=1e-6, atol=1e-6,
+                            max_steps=100000, full_output=False):
+    """
+    Solve for velocity profile with an adaptive Dormand-Prince 5(4) method.
+    
+    The step size is controlled by the embedded error estimate, independently
+    of the output grid, and the solution at every requested radius is taken
+    from the dense-output interpolant of the step that contains it.
+    
+    Args:
+        r (array): Increasing output radii in meters.
+        galaxy_params (tuple or array): Galaxy parameters.
+        gas_params (tuple or array): Gas parameters.
+        mass_profile (MassProfile, optional): Precomputed mass table.
+        force_table (ForceTable, optional): Precomputed force terms.
+        rtol (float): Relative tolerance.
+        atol (float): Absolute tolerance in m/s.
+        max_steps (int): Maximum number of attempted steps.
+        full_output (bool): If True, also return a dict with the number of
+            RHS evaluations ('nfev'), accepted steps ('nstep') and rejected
+            steps ('nreject').
+    
+    Returns:
+        array: Velocities in m/s, or (velocities, info) if `full_output`.
+    """
+    if mass_profile is None:
+        mass_profile = _default_mass_profile(galaxy_params)
+    if force_table is None:
+        force_table = _default_force_table(gas_params)
+    r = np.asarray(r, dtype=float)
+    
+    v_initial = np.sqrt(G * mass_profile(r[0]) / r[0])
+    v_current = np.atleast_1d(v_initial).astype(float)
+    v = np.zeros(v_current.shape + r.shape)
+    v[:, 0] = v_current
+    
+    k1 = total_acceleration(r[0], v_current, galaxy_params, gas_params, mass_profile, force_table)
+    state = {'r': r[0], 'v': v_current, 'k1': k1, 'h': _initial_step(v_current, k1, r[-1] - r[0], rtol, atol),
+             'step': None, 'info': {'nfev': 1, 'nstep': 0, 'nreject': 0}}
+    _adaptive_advance(r[1:], v[:, 1:], state, galaxy_params, gas_params, mass_profile, force_table, rtol, atol,
+                      max_steps, r_stop=r[-1])
+    info = state['info']
+    
+    profile = profiling._active.get()
+    if profile is not None:
+        profile.add_steps('adaptive', **info)
+    if np.ndim(v_initial) == 0:
+        v = v[0]
+    if full_output:
+        return v, info
+    return v
+
+def solve_velocity(r, galaxy_params, gas_params, method='rk4', mass_profile=None, force_table=None, **options):
+    """
+    Solve for velocity profile using specified method.
+    
+    A precomputed MassProfile and ForceTable may be passed to skip the mass
+    integration and the force-term evaluation; by default the cached tables
+    for `galaxy_params` and `gas_params` are used. Extra keyword options (for
+    example `rtol` and `atol`) are passed to the solver.
+    """
     if method == 'odeint':
-        return solve_velocity_odeint(r, galaxy_params, gas_params)
+        return solve_velocity_odeint(r, galaxy_params, gas_params, mass_profile, force_table, **options)
     elif method == 'rk4':
-        return solve_velocity_rk4(r, galaxy_params, gas_params)
+        return solve_velocity_rk4(r, galaxy_params, gas_params, mass_profile, force_table, **options)
+    elif method == 'adaptive':
+        return solve_velocity_adaptive(r, galaxy_params, gas_params, mass_profile, force_table, **options)
     else:
-        raise ValueError("Invalid method. Choose 'odeint' or 'rk4'.")
\ No newline at end of file
+        raise ValueError("Invalid method. Choose 'odeint', 'rk4' or 'adaptive'.")
+
+def solve_velocity_batch(r, galaxy_params, gas_params, method='rk4', mass_profile=None, force_table=None, **options):
+    """
+    Solve for the velocity profiles of many models on a shared radial grid.
+    
+    Args:
+        r (array): Radial distances in meters.
+        galaxy_params (array): Galaxy parameters, shape (n_models, 6).
+        gas_params (array): Gas parameters, shape (n_models, 10).
+        method (str): Integration method, 'rk4', 'odeint' or 'adaptive'.
+        mass_profile (MassProfile, optional): Batched mass table for
+            `galaxy_params`.
+        force_table (ForceTable, optional): Batched force table for
+            `gas_params`.
+        **options: Extra keyword options passed to the solver.
+    
+    Returns:
+        array: Velocities in m/s, shape (n_models, len(r)).
+    """
+    galaxy_params, gas_params = as_parameter_batch(galaxy_params, gas_params)
+    return solve_velocity(r, galaxy_params, gas_params, method, mass_profile, force_table, **options)
+
+def as_parameter_batch(galaxy_params, gas_params):
+    """
+    Convert galaxy and gas parameters to validated (n_models, n_params) arrays.
+    
+    Args:
+        galaxy_params (array): Galaxy parameters, shape (6,) or (n_models, 6).
+        gas_params (array): Gas parameters, shape (10,) or (n_models, 10).
+    
+    Returns:
+        tuple: Contiguous float arrays of shape (n_models, 6) and (n_models, 10).
+    """
+    galaxy_params = np.ascontiguousarray(np.atleast_2d(np.asarray(galaxy_params, dtype=float)))
+    gas_params = np.ascontiguousarray(np.atleast_2d(np.asarray(gas_params, dtype=float)))
+    if galaxy_params.ndim != 2 or galaxy_params.shape[1] != 6 or gas_params.ndim != 2 or gas_params.shape[1] != 10:
+        raise ValueError("Expected galaxy_params of shape (n_models, 6) and gas_params of shape (n_models, 10).")
+    if len(galaxy_params) != len(gas_params):
+        raise ValueError("galaxy_params and gas_params must describe the same number of models.")
+    return galaxy_params, gas_params
\ No newline at end of file
@@ -1,6 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from galactic_dynamics import solve_velocity, enclosed_mass
+from galactic_dynamics import solve_velocity, enclosed_mass, open_results
 from galactic_dynamics.constants import G, pc
 
 def plot_rotation_curve(galaxy_params, gas_params):
@@ -33,6 +33,20 @@ def plot_rotation_curve(galaxy_params, gas_params):
     print(f"RK4: Average difference from Newtonian model: {avg_diff_rk4:.2f}%")
     print(f"Difference between ODEINT and RK4: {np.mean(np.abs(v_odeint - v_rk4))/1000:.4f} km/s")
 
+def plot_stored_curves(path, models=slice(0, 10)):
+    # Only the selected rows are read from the memory-mapped result store
+    store = open_results(path)
+    R = store.r
+    plt.figure(figsize=(12, 8))
+    for v in store.velocity[models]:
+        plt.plot(R/1000/pc, v/1000)
+    plt.xlabel('Radius (kpc)')
+    plt.ylabel('Rotation Velocity (km/s)')
+    plt.title(f'Stored Rotation Curves ({store.metadata["method"]})')
+    plt.xscale('log')
+    plt.grid(True)
+    plt.show()
+
 if __name__ == "__main__":
     # Galaxy parameters (r_d, M_d, r_b, M_b, r_h, M_h) in SI units
     galaxy_params = (3e3*pc, 5e10*1.989e30, 500*pc, 1e10*1.989e30, 20e3*pc, 1e12*1.989e30)
@@ -0,0 +1,116 @@
+import asyncio
+import time
+import numpy as np
+import pytest
+from galactic_dynamics.aio import AsyncSolver, enclosed_mass_async, solve_velocity_async
+from galactic_dynamics.velocity_solver import solve_velocity, solve_velocity_batch
+from galactic_dynamics.mass_models import enclosed_mass
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 40)
+
+def test_async_matches_sync(finite_params, radial_points):
+    galaxy, gas = finite_params
+
+    async def main():
+        v = await solve_velocity_async(radial_points, galaxy, gas, method='adaptive')
+        mass = await enclosed_mass_async(radial_points, galaxy)
+        return v, mass
+    
+    v, mass = asyncio.run(main())
+    assert np.array_equal(v, solve_velocity(radial_points, galaxy, gas, method='adaptive'))
+    assert np.array_equal(mass, enclosed_mass(radial_points, galaxy))
+
+def test_identical_requests_are_coalesced(finite_params, radial_points):
+    galaxy, gas = finite_params
+
+    async def main():
+        async with AsyncSolver(max_workers=2) as solver:
+            results = await asyncio.gather(*(solver.solve_velocity(radial_points, galaxy, gas, method='adaptive')
+                                             for _ in range(5)))
+            return results, solver.stats
+    
+    results, stats = asyncio.run(main())
+    assert stats['requests'] == 5 and stats['coalesced'] == 4 and stats['computations'] == 1
+    assert all(np.array_equal(v, results[0]) for v in results)
+    results[0][:] = 0
+    assert np.all(results[1] > 0), "Every caller should get its own copy"
+
+def test_micro_batching(finite_params, radial_points):
+    galaxy, gas = finite_params
+    galaxies = np.array(galaxy) * np.linspace(0.9, 1.1, 6)[:, None]
+
+    async def main(max_batch_size):
+        async with AsyncSolver(batch_window=0.05, max_batch_size=max_batch_size) as solver:
+            results = await asyncio.gather(*(solver.solve_velocity(radial_points, g, gas, method='adaptive')
+                                             for g in galaxies))
+            return np.array(results), solver.stats
+    
+    v, stats = asyncio.run(main(64))
+    assert stats['batches'] == 1 and stats['computations'] == 1
+    expected = solve_velocity_batch(radial_points, galaxies, np.tile(gas, (6, 1)), 'adaptive')
+    assert np.allclose(v, expected)
+    v, stats = asyncio.run(main(4))
+    assert stats['batches'] == 2
+    assert np.allclose(v, expected, rtol=1e-3)
+
+def test_event_loop_not_blocked(finite_params, radial_points):
+    galaxy, gas = finite_params
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+        
+        task = asyncio.ensure_future(ticker())
+        async with AsyncSolver() as solver:
+            start = time.perf_counter()
+            await solver.enclosed_mass(radial_points, galaxy, n_grid=2_000_000)
+            elapsed = time.perf_counter() - start
+        task.cancel()
+        return ticks, elapsed
+    
+    ticks, elapsed = asyncio.run(main())
+    assert ticks > 0.1 * elapsed / 0.001
+
+def test_errors_reach_every_caller(finite_params, radial_points):
+    galaxy, gas = finite_params
+
+    async def main(batch_window):
+        async with AsyncSolver(batch_window=batch_window) as solver:
+            return await asyncio.gather(*(solver.solve_velocity(radial_points, galaxy, gas, method='euler')
+                                          for _ in range(3)), return_exceptions=True)
+    
+    for batch_window in (None, 0.01):
+        results = asyncio.run(main(batch_window))
+        assert all(isinstance(result, ValueError) for result in results)
+
+def test_failing_request_does_not_fail_its_batch(finite_params, radial_points):
+    galaxy, gas = finite_params
+    divergent = (galaxy[0], galaxy[1] * 1e30) + galaxy[2:]
+
+    async def main():
+        async with AsyncSolver(batch_window=0.05) as solver:
+            requests = [solver.solve_velocity(radial_points, galaxy, gas, method='adaptive'),
+                        solver.solve_velocity(radial_points, galaxy[:5], gas, method='adaptive'),
+                        solver.solve_velocity(radial_points, divergent, gas, method='adaptive'),
+                        solver.solve_velocity(radial_points, np.array(galaxy) * 1.1, gas, method='adaptive')]
+            return await asyncio.gather(*requests, return_exceptions=True)
+    
+    good, malformed, failed, other = asyncio.run(main())
+    assert isinstance(malformed, ValueError)
+    assert isinstance(failed, RuntimeError)
+    assert np.allclose(good, solve_velocity(radial_points, galaxy, gas, method='adaptive'))
+    assert np.allclose(other, solve_velocity(radial_points, tuple(np.array(galaxy) * 1.1), gas, method='adaptive'))
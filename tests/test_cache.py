@@ -0,0 +1,77 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+from galactic_dynamics.cache import DiskCache
+from galactic_dynamics.velocity_solver import solve_velocity
+from galactic_dynamics.mass_models import enclosed_mass
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 40)
+
+def _cached_solve(directory, r, galaxy, gas):
+    return DiskCache(directory).solve_velocity(r, galaxy, gas, method='adaptive')
+
+def test_cache_hits_and_misses(tmp_path, finite_params, radial_points):
+    galaxy, gas = finite_params
+    cache = DiskCache(tmp_path)
+    v = cache.solve_velocity(radial_points, galaxy, gas, method='adaptive')
+    assert np.array_equal(v, solve_velocity(radial_points, galaxy, gas, method='adaptive'))
+    assert np.array_equal(cache.solve_velocity(radial_points, galaxy, gas, method='adaptive'), v)
+    cache.solve_velocity(radial_points, galaxy, gas, method='adaptive', rtol=1e-8)
+    M = cache.enclosed_mass(radial_points, galaxy)
+    assert np.array_equal(M, enclosed_mass(radial_points, galaxy))
+    assert np.array_equal(cache.enclosed_mass(radial_points, galaxy), M)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 3, 3)
+
+def test_cache_key_covers_inputs(finite_params, radial_points):
+    galaxy, gas = finite_params
+    key = DiskCache.key("solve_velocity", radial_points, (galaxy, gas), method='rk4', options={})
+    assert key == DiskCache.key("solve_velocity", radial_points.copy(), (list(galaxy), gas), method='rk4', options={})
+    assert key != DiskCache.key("solve_velocity", radial_points, (galaxy, gas), method='odeint', options={})
+    assert key != DiskCache.key("solve_velocity", radial_points[:-1], (galaxy, gas), method='rk4', options={})
+    assert key != DiskCache.key("solve_velocity", radial_points, (galaxy, gas[:-1] + (0.0,)), method='rk4', options={})
+
+def test_cache_key_hashes_array_options(radial_points):
+    # repr() abbreviates large arrays, so arrays differing in the middle must still give different keys
+    weights = np.ones(5000)
+    changed = weights.copy()
+    changed[2500] = 2.0
+    key = DiskCache.key("enclosed_mass", radial_points, (), options={'weights': weights})
+    assert key == DiskCache.key("enclosed_mass", radial_points, (), options={'weights': weights.copy()})
+    assert key != DiskCache.key("enclosed_mass", radial_points, (), options={'weights': changed})
+    with pytest.raises(TypeError):
+        DiskCache.key("enclosed_mass", radial_points, (), options={'model': object()})
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=3 * (128 + 800))
+    for i in range(3):
+        cache.put(f"{i:064x}", np.full(100, i, dtype=float))
+        time.sleep(0.01)
+    assert cache.get(f"{0:064x}") is not None
+    cache.put(f"{3:064x}", np.full(100, 3, dtype=float))
+    # Eviction goes below the cap, to 90% of it, so both older unread entries go
+    assert cache.get(f"{1:064x}") is None and cache.get(f"{2:064x}") is None
+    assert cache.get(f"{0:064x}") is not None
+    assert cache.stats()['evictions'] == 2
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+
+def test_cache_concurrent_processes(tmp_path, finite_params, radial_points):
+    galaxy, gas = finite_params
+    with ProcessPoolExecutor(4) as pool:
+        results = list(pool.map(_cached_solve, [tmp_path] * 8, [radial_points] * 8, [galaxy] * 8, [gas] * 8))
+    for v in results:
+        assert np.array_equal(v, results[0])
+    assert DiskCache(tmp_path).stats()['entries'] == 1
+    assert not [name for _, _, files in os.walk(tmp_path) for name in files if name.endswith(".tmp")]
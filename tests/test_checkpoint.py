@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from galactic_dynamics.checkpoint import SolverState
+from galactic_dynamics.velocity_solver import solve_velocity
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 300)
+
+def _segmented(r, galaxy, gas, method, path, splits=(100, 217)):
+    """Advance over segments of r, saving and reloading the state between them."""
+    state = SolverState(r[0], galaxy, gas, method, r_end=r[-1])
+    parts = []
+    for segment in np.split(r, splits):
+        parts.append(state.advance(segment))
+        state.save(path)
+        state = SolverState.load(path)
+    return np.concatenate(parts, axis=-1)
+
+@pytest.mark.parametrize('method', ['rk4', 'adaptive'])
+@pytest.mark.parametrize('batched', [False, True])
+def test_segments_match_single_run(finite_params, radial_points, tmp_path, method, batched):
+    galaxy, gas = finite_params
+    if batched:
+        galaxy, gas = np.array([galaxy] * 2), np.array([gas] * 2)
+    full = SolverState(radial_points[0], galaxy, gas, method, r_end=radial_points[-1]).advance(radial_points)
+    segmented = _segmented(radial_points, galaxy, gas, method, tmp_path / 'state.npz')
+    assert np.array_equal(full, segmented), "Resumed integration should reproduce a single run exactly"
+    assert np.allclose(full, solve_velocity(radial_points, galaxy, gas, method), rtol=1e-4)
+
+def test_rk4_matches_solver(finite_params, radial_points):
+    galaxy, gas = finite_params
+    v = SolverState(radial_points[0], galaxy, gas).advance(radial_points)
+    assert np.array_equal(v, solve_velocity(radial_points, galaxy, gas, 'rk4'))
+
+def test_odeint_restarts(finite_params, radial_points, tmp_path):
+    galaxy, gas = finite_params
+    segmented = _segmented(radial_points, galaxy, gas, 'odeint', tmp_path / 'state.npz')
+    assert np.allclose(segmented, solve_velocity(radial_points, galaxy, gas, 'odeint'), rtol=1e-4)
+
+def test_saved_tables(finite_params, radial_points, tmp_path):
+    galaxy, gas = finite_params
+    state = SolverState(radial_points[0], galaxy, gas, 'adaptive', r_end=radial_points[-1], rtol=1e-8)
+    state.advance(radial_points[:50])
+    state.save(tmp_path / 'state.npz')
+    loaded = SolverState.load(tmp_path / 'state.npz')
+    assert loaded.r == state.r and loaded.v == state.v and loaded.options == {'rtol': 1e-8}
+    assert np.array_equal(loaded.mass_profile.mass, state.mass_profile.mass)
+    assert np.array_equal(loaded.force_table.values, state.force_table.values)
+    assert loaded.history['h'] == state.history['h']
+
+def test_invalid_segments(finite_params, radial_points):
+    galaxy, gas = finite_params
+    state = SolverState(radial_points[0], galaxy, gas)
+    state.advance(radial_points[:10])
+    with pytest.raises(ValueError):
+        state.advance(radial_points[5:20])
+    with pytest.raises(ValueError):
+        SolverState(radial_points[0], galaxy, gas, 'euler')
+    with pytest.raises(TypeError):
+        SolverState(radial_points[0], galaxy, gas, 'rk4', rtol=1e-8)
+    with pytest.raises(ValueError):
+        SolverState(radial_points[0], galaxy, gas, 'adaptive')
@@ -0,0 +1,140 @@
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+from galactic_dynamics import cli, parameter_sweep
+from galactic_dynamics.cli import main, read_parameter_sets, run
+from galactic_dynamics.velocity_solver import solve_velocity_batch
+from galactic_dynamics.parameters import GALAXY_PARAM_NAMES, GAS_PARAM_NAMES, PARAM_NAMES
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def parameter_sets():
+    galaxy = np.array([3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun])
+    gas = np.array([4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3])
+    scale = np.linspace(0.9, 1.1, 5)[:, None]
+    return np.hstack([galaxy * scale, np.tile(gas, (5, 1))])
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 20)
+
+def _write_jsonl(path, params):
+    with open(path, 'w') as f:
+        for row in params:
+            f.write(json.dumps({'galaxy_params': dict(zip(GALAXY_PARAM_NAMES, row[:6])),
+                                'gas_params': dict(zip(GAS_PARAM_NAMES, row[6:]))}) + '\n')
+
+def _write_csv(path, params):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('id',) + PARAM_NAMES)
+        writer.writerows([i] + list(row) for i, row in enumerate(params))
+
+_ARGS = ['--method', 'adaptive', '--r-min', '0.1', '--r-max', '50', '--n-radii', '20', '--batch-size', '2',
+         '--workers', '1']
+
+def test_jsonl_to_npz(tmp_path, parameter_sets, radial_points, capsys):
+    _write_jsonl(tmp_path / 'models.jsonl', parameter_sets)
+    assert main([str(tmp_path / 'models.jsonl'), str(tmp_path / 'curves.npz')] + _ARGS) == 0
+    
+    with np.load(tmp_path / 'curves.npz') as data:
+        assert sorted(data.files)[:3] == ['params_000000', 'params_000001', 'params_000002']
+        params = np.concatenate([data[f'params_{i:06d}'] for i in range(3)])
+        v = np.concatenate([data[f'velocity_{i:06d}'] for i in range(3)])
+        assert np.allclose(data['r'], radial_points)
+    assert np.array_equal(params, parameter_sets)
+    expected = solve_velocity_batch(radial_points, parameter_sets[:, :6], parameter_sets[:, 6:], 'adaptive')
+    assert np.allclose(v, expected, rtol=1e-2)
+    assert 'models/s' in capsys.readouterr().err
+
+def test_csv_to_csv(tmp_path, parameter_sets):
+    _write_csv(tmp_path / 'models.csv', parameter_sets)
+    main([str(tmp_path / 'models.csv'), str(tmp_path / 'curves.csv'), '--quiet'] + _ARGS)
+    
+    with open(tmp_path / 'curves.csv') as f:
+        header = next(csv.reader(f))
+    assert header[:16] == list(PARAM_NAMES) and len(header) == 36
+    assert header[16] == 'v_0.1kpc' and header[-1] == 'v_50kpc'
+    table = np.loadtxt(tmp_path / 'curves.csv', delimiter=',', skiprows=1)
+    assert np.allclose(table[:, :16], parameter_sets)
+    assert np.all(table[:, 16:] > 0)
+
+def test_jsonl_and_csv_inputs_agree(tmp_path, parameter_sets):
+    _write_jsonl(tmp_path / 'models.jsonl', parameter_sets)
+    _write_csv(tmp_path / 'models.csv', parameter_sets)
+    with open(tmp_path / 'models.jsonl') as f:
+        from_jsonl = np.array(list(read_parameter_sets(f, 'jsonl')))
+    with open(tmp_path / 'models.csv', newline='') as f:
+        from_csv = np.array(list(read_parameter_sets(f, 'csv')))
+    assert np.array_equal(from_jsonl, parameter_sets)
+    assert np.allclose(from_csv, parameter_sets, rtol=1e-15)
+
+def test_invalid_record_names_line(tmp_path, parameter_sets, capsys):
+    parameter_sets[3, 1] = -1.0
+    _write_jsonl(tmp_path / 'models.jsonl', parameter_sets)
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path / 'models.jsonl'), str(tmp_path / 'curves.npz'), '--quiet'] + _ARGS)
+    assert exc.value.code == 1
+    assert 'Line 4' in capsys.readouterr().err
+
+def test_unknown_output_format(tmp_path, parameter_sets, capsys):
+    _write_jsonl(tmp_path / 'models.jsonl', parameter_sets)
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / 'models.jsonl'), str(tmp_path / 'curves.h5')] + _ARGS)
+    assert '--output-format' in capsys.readouterr().err
+
+def test_parquet_output(tmp_path, parameter_sets):
+    pq = pytest.importorskip('pyarrow.parquet')
+    _write_jsonl(tmp_path / 'models.jsonl', parameter_sets)
+    main([str(tmp_path / 'models.jsonl'), str(tmp_path / 'curves.parquet'), '--quiet'] + _ARGS)
+    table = pq.read_table(tmp_path / 'curves.parquet')
+    assert table.num_rows == 5
+    assert np.array_equal(table.column('r_d').to_numpy(), parameter_sets[:, 0])
+    assert len(json.loads(table.schema.metadata[b'r'])) == 20
+
+def test_json_document_input(tmp_path, parameter_sets):
+    records = [{'galaxy_params': dict(zip(GALAXY_PARAM_NAMES, row[:6])),
+                'gas_params': dict(zip(GAS_PARAM_NAMES, row[6:]))} for row in parameter_sets]
+    with open(tmp_path / 'models.json', 'w') as f:
+        json.dump(records, f, indent=4)
+    assert main([str(tmp_path / 'models.json'), str(tmp_path / 'curves.npz'), '--quiet'] + _ARGS) == 0
+    with np.load(tmp_path / 'curves.npz') as data:
+        assert np.array_equal(np.vstack([data[k] for k in sorted(data) if k.startswith('params_')]), parameter_sets)
+    with open(tmp_path / 'single.json', 'w') as f:
+        json.dump(records[0], f, indent=4)
+    with open(tmp_path / 'single.json') as f:
+        assert np.array_equal(list(read_parameter_sets(f, 'json')), parameter_sets[:1])
+
+def test_malformed_line_is_named_and_output_removed(tmp_path, parameter_sets, capsys):
+    _write_jsonl(tmp_path / 'models.jsonl', parameter_sets)
+    with open(tmp_path / 'models.jsonl', 'a') as f:
+        f.write('{"galaxy_params": \n')
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path / 'models.jsonl'), str(tmp_path / 'curves.npz'), '--quiet'] + _ARGS)
+    assert exc.value.code == 1
+    assert 'Line 6' in capsys.readouterr().err
+    assert not (tmp_path / 'curves.npz').exists()
+
+def test_run_starts_workers_once(parameter_sets, radial_points, monkeypatch):
+    pools = []
+    class CountingPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+    monkeypatch.setattr(cli, 'ProcessPoolExecutor', CountingPool)
+    monkeypatch.setattr(parameter_sweep, 'ProcessPoolExecutor', CountingPool)
+    
+    class Collect:
+        def __init__(self):
+            self.batches = []
+        def write(self, params, velocity):
+            self.batches.append(velocity)
+    writer = Collect()
+    n_models, _ = run(iter(parameter_sets), writer, radial_points, batch_size=2, n_workers=2)
+    assert n_models == 5 and len(writer.batches) == 3
+    assert len(pools) == 1, "The worker pool should be started once, not per batch"
+    for i, velocity in enumerate(writer.batches):
+        batch = parameter_sets[2*i:2*i + 2]
+        assert np.array_equal(velocity, parameter_sweep.sweep(radial_points, batch[:, :6], batch[:, 6:], n_workers=1))
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from galactic_dynamics.emulator import RotationCurveEmulator
+from galactic_dynamics.velocity_solver import solve_velocity
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(30e3*pc), 40)
+
+@pytest.fixture
+def emulator(finite_params, radial_points):
+    galaxy, gas = finite_params
+    axes = {'M_d': (0.9 * galaxy[1], 1.1 * galaxy[1], 9), 'B0': (0.9 * gas[4], 1.1 * gas[4], 5)}
+    return RotationCurveEmulator.build(radial_points, axes, galaxy, gas, method='adaptive', n_workers=1)
+
+def test_emulator_reproduces_nodes(emulator, finite_params, radial_points):
+    galaxy, gas = finite_params
+    point = (emulator.axes[0][3], emulator.axes[1][2])
+    v = solve_velocity(radial_points, galaxy[:1] + (point[0],) + galaxy[2:], gas[:4] + (point[1],) + gas[5:],
+                       method='adaptive')
+    assert emulator.table.shape == (9, 5, len(radial_points))
+    for kind in ('linear', 'cubic'):
+        assert np.allclose(emulator(point, kind), v, rtol=1e-3, atol=1e-3 * np.abs(v).max())
+
+def test_emulator_interpolates_between_nodes(emulator, finite_params):
+    galaxy, gas = finite_params
+    points = {'M_d': [0.93 * galaxy[1], 1.07 * galaxy[1]], 'B0': [1.05 * gas[4], 0.95 * gas[4]]}
+    assert emulator(points).shape == (2, len(emulator.r))
+    linear = emulator.validate(n_samples=8, kind='linear')
+    cubic = emulator.validate(n_samples=8, kind='cubic')
+    assert linear['max_rel'] < 1e-2
+    assert cubic['max_rel'] <= linear['max_rel']
+    assert emulator.error is cubic
+
+def test_emulator_rejects_points_outside_grid(emulator, finite_params):
+    galaxy, gas = finite_params
+    with pytest.raises(ValueError):
+        emulator((2 * galaxy[1], gas[4]))
+    with pytest.raises(ValueError):
+        emulator((galaxy[1], gas[4]), kind='quintic')
+
+def test_emulator_save_load(tmp_path, emulator, finite_params):
+    galaxy, gas = finite_params
+    emulator.validate(n_samples=4)
+    emulator.save(tmp_path / "emulator.npz")
+    restored = RotationCurveEmulator.load(tmp_path / "emulator.npz")
+    assert restored.names == ('M_d', 'B0')
+    assert restored.method == 'adaptive'
+    assert restored.error == emulator.error
+    point = (1.05 * galaxy[1], gas[4])
+    assert np.allclose(restored(point), emulator(point))
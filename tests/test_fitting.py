@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from galactic_dynamics.fitting import fit_rotation_curve, acceleration_gradient, RotationCurveModel, PARAM_NAMES
+from galactic_dynamics.velocity_solver import solve_velocity
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 30)
+
+def test_acceleration_gradient_matches_finite_differences(finite_params):
+    galaxy, gas = finite_params
+    r = np.geomspace(100*pc, 100e3*pc, 5)
+    v = np.full_like(r, 1e-2)
+    params = np.array(galaxy + gas)
+    a, da_dv, da_dp = acceleration_gradient(r, v, galaxy, gas)
+    for name in ('M_d', 'r_d', 'r_g', 'M_g', 'B0', 'r_B', 'reconnection_rate'):
+        i = PARAM_NAMES.index(name)
+        shifted = params.copy()
+        shifted[i] *= 1 + 1e-6
+        a_shifted, _, _ = acceleration_gradient(r, v, tuple(shifted[:6]), tuple(shifted[6:]))
+        assert np.allclose((a_shifted - a) / (params[i] * 1e-6), da_dp[i], rtol=1e-4), name
+    a_shifted, _, _ = acceleration_gradient(r, v * (1 + 1e-6), galaxy, gas)
+    assert np.allclose((a_shifted - a) / (v * 1e-6), da_dv, rtol=1e-4)
+
+def test_model_matches_solver(finite_params, radial_points):
+    galaxy, gas = finite_params
+    model = RotationCurveModel(radial_points, galaxy, gas)
+    v = model.velocity(model.x0)
+    assert np.allclose(v, solve_velocity(radial_points, galaxy, gas, method='odeint'), rtol=1e-3)
+
+def test_model_jacobian_matches_finite_differences(finite_params, radial_points):
+    galaxy, gas = finite_params
+    free = ('r_d', 'M_d', 'B0', 'r_B')
+    model = RotationCurveModel(radial_points, galaxy, gas, free, rtol=1e-10)
+    v, jacobian = model.solve(model.x0)
+    for i in range(len(free)):
+        x = model.x0.copy()
+        x[i] += 1e-5
+        finite = (model.velocity(x) - v) / 1e-5
+        assert np.allclose(finite, jacobian[:, i], rtol=1e-3, atol=1e-3 * np.abs(jacobian[:, i]).max()), free[i]
+
+def test_model_memoises_last_solve(finite_params, radial_points):
+    galaxy, gas = finite_params
+    model = RotationCurveModel(radial_points, galaxy, gas)
+    model.velocity(model.x0)
+    model.jacobian(model.x0)
+    assert model.nsolve == 1
+
+def test_failed_solve_is_rejected(finite_params, radial_points):
+    galaxy, gas = finite_params
+    model = RotationCurveModel(radial_points, galaxy, gas, ('M_d', 'B0'))
+    v, jacobian = model.solve(np.log([8.7e8, 1.14e-14]))
+    assert np.all(np.isnan(v)) and np.all(np.isnan(jacobian))
+    assert model._last is None and model.h0 == 0.0
+
+@pytest.mark.filterwarnings("error::scipy.integrate.ODEintWarning")
+def test_fit_recovers_parameters(finite_params, radial_points):
+    galaxy, gas = finite_params
+    free = ('M_d', 'B0')
+    v_obs = RotationCurveModel(radial_points, galaxy, gas, free).velocity(np.log([galaxy[1], gas[4]]))
+    guess_galaxy = galaxy[:1] + (1.3 * galaxy[1],) + galaxy[2:]
+    guess_gas = gas[:4] + (0.8 * gas[4],) + gas[5:]
+    result = fit_rotation_curve(radial_points, v_obs, guess_galaxy, guess_gas, sigma=0.01 * v_obs, free=free)
+    assert result.success
+    assert np.isclose(result.galaxy_params[1], galaxy[1], rtol=1e-4)
+    assert np.isclose(result.gas_params[4], gas[4], rtol=1e-4)
+    assert np.allclose(result.velocity, v_obs, rtol=1e-5)
+    
+    refit = fit_rotation_curve(radial_points, v_obs, None, None, sigma=0.01 * v_obs, free=free, warm_start=result)
+    assert refit.nfev <= 3
+
+def test_fit_rejects_invalid_free_parameters(finite_params, radial_points):
+    galaxy, gas = finite_params
+    with pytest.raises(ValueError):
+        RotationCurveModel(radial_points, galaxy, gas, free=('M_x',))
+    with pytest.raises(ValueError):
+        RotationCurveModel(radial_points, galaxy, gas, free=('v_flow',))
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from galactic_dynamics.forward_model import BeamKernel, SkyProjection, velocity_field
+from galactic_dynamics.constants import pc
+
+@pytest.fixture
+def rotation_curve():
+    r = np.linspace(100*pc, 20e3*pc, 200)
+    v = 2e5 * np.tanh(r / (2e3*pc))
+    return r, v
+
+def test_project_matches_pixel_loop(rotation_curve):
+    r, v = rotation_curve
+    shape, scale, inclination, position_angle = (33, 41), 500*pc, 60.0, 30.0
+    field = SkyProjection(r, shape, scale, inclination, position_angle, v_sys=1e6).project(v)
+    
+    inc, pa = np.radians(inclination), np.radians(position_angle)
+    expected = np.full(shape, np.nan)
+    for j in range(shape[0]):
+        for i in range(shape[1]):
+            x, y = (i - 20) * scale, (j - 16) * scale
+            x_major = -x * np.sin(pa) + y * np.cos(pa)
+            y_minor = (-x * np.cos(pa) - y * np.sin(pa)) / np.cos(inc)
+            radius = np.hypot(x_major, y_minor)
+            if radius <= r[-1]:
+                v_rot = np.interp(radius, np.concatenate([[0], r]), np.concatenate([[0], v]))
+                cos_theta = x_major / radius if radius > 0 else 0.0
+                expected[j, i] = 1e6 + v_rot * np.sin(inc) * cos_theta
+    assert np.allclose(field, expected, rtol=1e-12, equal_nan=True)
+
+def test_major_and_minor_axes(rotation_curve):
+    r, v = rotation_curve
+    field = SkyProjection(r, (65, 65), 250*pc, 45.0, 0.0).project(v)
+    assert np.isclose(field[32 + 20, 32], np.interp(5e3*pc, r, v) * np.sin(np.radians(45)))
+    assert np.isclose(field[32 - 20, 32], -field[32 + 20, 32]), "Approaching side should mirror the receding side"
+    assert np.allclose(field[32, :][np.isfinite(field[32, :])], 0.0)
+
+def test_beam_matches_direct_convolution():
+    from scipy.signal import convolve2d
+    rng = np.random.default_rng(0)
+    maps = rng.normal(size=(3, 40, 50))
+    beam = BeamKernel.gaussian(3.0, (40, 50))
+    expected = np.array([convolve2d(m, beam.kernel, mode='same') for m in maps])
+    assert np.allclose(beam(maps), expected)
+    assert np.isclose(beam.kernel.sum(), 1.0)
+
+def test_smearing(rotation_curve):
+    r, v = rotation_curve
+    kwargs = dict(shape=(64, 64), pixel_scale=800*pc, inclination=60.0, position_angle=120.0, v_sys=1e6)
+    smeared = SkyProjection(r, beam=2e3*pc, **kwargs)
+    sharp = SkyProjection(r, **kwargs).project(v)
+    assert np.array_equal(np.isnan(smeared(v)), np.isnan(sharp))
+    assert np.nanmax(np.abs(smeared(v) - 1e6)) < np.nanmax(np.abs(sharp - 1e6)), "Smearing should lower peak velocities"
+    
+    delta = SkyProjection(r, beam=BeamKernel([[1.0]], (64, 64)), **kwargs)
+    assert np.allclose(delta(v), sharp, equal_nan=True)
+    face_on = SkyProjection(r, beam=2e3*pc, **dict(kwargs, inclination=0.0))
+    assert np.allclose(face_on(v)[np.isfinite(sharp)], 1e6)
+
+def test_batched_models(rotation_curve):
+    r, v = rotation_curve
+    projection = SkyProjection(r, (48, 48), 1e3*pc, 70.0, 45.0, beam=3e3*pc, intensity=lambda R: np.exp(-R / (5e3*pc)))
+    batch = np.array([v, 0.5 * v, 1.5 * v])
+    maps = projection(batch)
+    assert maps.shape == (3, 48, 48)
+    for model, curve in zip(maps, batch):
+        assert np.allclose(model, projection(curve), equal_nan=True)
+    assert np.allclose(velocity_field(r, batch, (48, 48), 1e3*pc, 70.0, 45.0)[1], projection.project(0.5 * v),
+                       equal_nan=True)
+
+def test_shape_mismatch(rotation_curve):
+    r, v = rotation_curve
+    with pytest.raises(ValueError):
+        BeamKernel.gaussian(3.0, (40, 50))(np.zeros((50, 40)))
+    projection = SkyProjection(r, (32, 32), 1e3*pc, 60.0, 30.0)
+    with pytest.raises(ValueError):
+        projection(v[:-1])
+    with pytest.raises(ValueError):
+        projection.project(np.stack([v, v]).T)
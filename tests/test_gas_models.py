@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from galactic_dynamics.gas_models import gas_density, pressure_gradient, turbulence_pressure
+from galactic_dynamics.gas_models import gas_density, gas_density_gradient, pressure_gradient, turbulence_pressure, turbulence_pressure_gradient
 from galactic_dynamics.constants import pc, M_sun
 
 @pytest.fixture
@@ -25,4 +25,10 @@ def test_turbulence_pressure(gas_params):
     r_g, M_g, _, v_turb = gas_params
     pressure = turbulence_pressure(r, r_g, M_g, v_turb)
     assert np.all(pressure > 0), "Turbulence pressure should be positive"
-    assert pressure[0] > pressure[-1], "Turbulence pressure should decrease with radius"
\ No newline at end of file
+    assert pressure[0] > pressure[-1], "Turbulence pressure should decrease with radius"
+
+def test_analytic_gradients(gas_params):
+    r = np.logspace(np.log10(100*pc), np.log10(100e3*pc), 2000)
+    r_g, M_g, _, v_turb = gas_params
+    assert np.allclose(gas_density_gradient(r, r_g, M_g)[1:-1], np.gradient(gas_density(r, r_g, M_g), r)[1:-1], rtol=1e-3)
+    assert np.allclose(turbulence_pressure_gradient(r, r_g, M_g, v_turb), gas_density_gradient(r, r_g, M_g) * v_turb**2)
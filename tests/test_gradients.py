@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from galactic_dynamics.gradients import SplineProfile, radial_gradient
+from galactic_dynamics.gas_models import gas_density, gas_density_gradient, pressure_gradient
+from galactic_dynamics.magnetic_models import (magnetic_field_strength, magnetic_field_gradient,
+                                               magnetic_reconnection_heating, magnetic_reconnection_heating_gradient)
+from galactic_dynamics.mass_models import MassProfile
+from galactic_dynamics.velocity_solver import ForceTable, total_acceleration
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 60)
+
+def test_closed_form_gradients(radial_points):
+    r = radial_points
+    h = 1e-6 * r
+    B = lambda x: magnetic_field_strength(x, 1e-9, 5e3*pc)
+    assert np.allclose(magnetic_field_gradient(r, 1e-9, 5e3*pc), (B(r + h) - B(r - h)) / (2*h), rtol=1e-6)
+    heating = lambda x: magnetic_reconnection_heating(x, B(x), 0.1)
+    assert np.allclose(magnetic_reconnection_heating_gradient(r, 1e-9, 5e3*pc, 0.1),
+                       (heating(r + h) - heating(r - h)) / (2*h), rtol=1e-6)
+
+def test_pressure_gradient_pointwise(radial_points):
+    args = (4e3*pc, 1e10*M_sun, 1e4)
+    grad = pressure_gradient(radial_points, *args)
+    assert np.allclose([pressure_gradient(r, *args) for r in radial_points], grad, rtol=1e-14)
+    # The old np.gradient estimate was worst at the grid edges
+    assert np.allclose(pressure_gradient(radial_points[[0, -1]], *args), grad[[0, -1]], rtol=1e-14)
+
+def test_spline_fallback(radial_points):
+    r_g, M_g = 4e3*pc, 1e10*M_sun
+    spline = SplineProfile.from_function(gas_density, 50*pc, 100e3*pc, r_g, M_g, n_grid=256)
+    exact = gas_density_gradient(radial_points, r_g, M_g)
+    assert np.allclose(spline(radial_points), gas_density(radial_points, r_g, M_g), rtol=1e-6)
+    assert np.allclose(spline.gradient(radial_points), exact, rtol=1e-5)
+    assert np.isclose(spline.gradient(radial_points[7]), exact[7], rtol=1e-5)
+    
+    # Batched tables give one row per model, and the spline beats np.gradient at the edges
+    grid = np.geomspace(100*pc, 50e3*pc, 60)
+    batch = SplineProfile(grid, np.stack([gas_density(grid, r_g, M_g), gas_density(grid, 2*r_g, M_g)]))
+    assert batch.gradient(grid).shape == (2, 60)
+    spline_error = np.abs(batch.gradient(grid)[0] / exact - 1)
+    numpy_error = np.abs(np.gradient(gas_density(grid, r_g, M_g), grid) / exact - 1)
+    assert spline_error[[0, -1]].max() < 0.1 * numpy_error[[0, -1]].max()
+
+def test_radial_gradient_dispatch(radial_points):
+    r_g, M_g = 4e3*pc, 1e10*M_sun
+    exact = gas_density_gradient(radial_points, r_g, M_g)
+    assert np.array_equal(radial_gradient(gas_density, radial_points, r_g, M_g), exact)
+
+    def custom(r, r_g, M_g):
+        return gas_density(r, r_g, M_g)
+    
+    assert np.allclose(radial_gradient(custom, radial_points, r_g, M_g), exact, rtol=1e-5)
+    assert np.isclose(radial_gradient(custom, radial_points[5], r_g, M_g, r_range=(50*pc, 60e3*pc)), exact[5],
+                      rtol=1e-5)
+    with pytest.raises(ValueError):
+        radial_gradient(custom, radial_points[5], r_g, M_g)
+
+def test_direct_terms_match_force_table(finite_params, radial_points):
+    galaxy, gas = finite_params
+    profile = MassProfile(galaxy)
+    v = np.full_like(radial_points, 1e5)
+    direct = total_acceleration(radial_points, v, galaxy, gas, profile)
+    tabulated = total_acceleration(radial_points, v, galaxy, gas, profile, ForceTable(gas))
+    assert np.allclose(direct, tabulated, rtol=1e-6)
+    pointwise = [total_acceleration(r, 1e5, galaxy, gas, profile) for r in radial_points]
+    assert np.allclose(pointwise, direct, rtol=1e-12)
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+import galactic_dynamics
+
+def _run(code):
+    """Run `code` in a fresh interpreter and return the JSON on the last line of its output."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    out = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+_LOADED = "print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in ('scipy', 'numba'))))"
+
+def test_import_loads_no_submodules():
+    loaded = _run("import json, sys, galactic_dynamics\n"
+                  "print(json.dumps(sorted(m for m in sys.modules if m.startswith('galactic_dynamics.'))))")
+    assert loaded == []
+
+def test_solvers_defer_scipy():
+    loaded = _run(f"""
+import json, sys
+import numpy as np
+import galactic_dynamics as gd
+galaxy = (1e20, 1e40, 1e19, 1e39, 1e21, 1e41)
+gas = (1e20, 1e40, 1e4, 0.0, 0.0, 1e20, 0.0, 0.0, 1e20, 0.0)
+gd.kpc_to_m(1.0)
+gd.mass_density(1e19, galaxy)
+gd.solve_velocity(np.linspace(1e19, 1e20, 5), galaxy, gas, method='rk4')
+{_LOADED}
+""")
+    assert loaded == []
+    loaded = _run(f"""
+import json, sys
+import numpy as np
+from galactic_dynamics.velocity_solver import solve_velocity
+solve_velocity(np.linspace(1e19, 1e20, 5), (1e20, 1e40, 1e19, 1e39, 1e21, 1e41),
+               (1e20, 1e40, 1e4, 0.0, 0.0, 1e20, 0.0, 0.0, 1e20, 0.0), method='odeint')
+{_LOADED}
+""")
+    assert 'scipy.integrate' in loaded
+
+def test_import_defers_heavy_dependencies():
+    loaded = _run(f"import json, sys, galactic_dynamics\n{_LOADED}")
+    assert loaded == []
+
+def test_public_names_resolve():
+    for name in galactic_dynamics.__all__:
+        assert getattr(galactic_dynamics, name) is not None
+    assert set(galactic_dynamics.__all__) <= set(dir(galactic_dynamics))
+
+def test_sweep_function_not_shadowed():
+    import galactic_dynamics.parameter_sweep
+    import galactic_dynamics.emulator
+    assert galactic_dynamics.sweep is galactic_dynamics.parameter_sweep.sweep
+
+def test_unknown_name():
+    with pytest.raises(AttributeError):
+        galactic_dynamics.no_such_function
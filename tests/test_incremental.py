@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from galactic_dynamics.incremental import IncrementalSolver
+from galactic_dynamics.velocity_solver import solve_velocity
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 400)
+
+def test_matches_rk4_solver(finite_params, radial_points):
+    galaxy, gas = finite_params
+    solver = IncrementalSolver(radial_points, galaxy, gas)
+    assert np.allclose(solver.solve(), solve_velocity(radial_points, galaxy, gas, 'rk4'), rtol=1e-12, atol=0)
+    assert set(solver.recomputed) == set(solver.evaluations)
+
+@pytest.mark.parametrize('changes, expected', [
+    ({'B0': 1.1e-14, 'r_B': 5.5e3*pc}, {'magnetic', 'reconnection'}),
+    ({'P_cr0': 2e-12}, {'cr'}),
+    ({'r_h': 25e3*pc, 'M_h': 1.1e-20*M_sun}, {'gravity'}),
+    ({'r_g': 4.4e3*pc}, {'pressure', 'turb', 'magnetic', 'cr', 'reconnection'}),
+])
+def test_only_invalidated_terms_are_recomputed(finite_params, radial_points, changes, expected):
+    galaxy, gas = finite_params
+    solver = IncrementalSolver(radial_points, galaxy, gas)
+    solver.solve()
+    v = solver.solve(**changes)
+    assert set(solver.recomputed) == expected
+    
+    fresh = IncrementalSolver(radial_points, galaxy, gas)
+    fresh.update(**changes)
+    assert np.array_equal(v, fresh.solve()), "Reused terms should give the same result as a fresh solve"
+    solver.solve(**changes)
+    assert solver.recomputed == ()
+
+def test_scan_with_parameter_tuples(finite_params, radial_points):
+    galaxy, gas = finite_params
+    solver = IncrementalSolver(radial_points, galaxy, gas)
+    for B0 in np.linspace(0.9e-14, 1.1e-14, 3):
+        scanned = gas[:4] + (B0,) + gas[5:]
+        v = solver.solve(galaxy, scanned)
+        assert np.allclose(v, solve_velocity(radial_points, galaxy, scanned, 'rk4'), rtol=1e-12, atol=0)
+    assert solver.evaluations['gravity'] == 1 and solver.evaluations['magnetic'] == 3
+
+def test_unknown_parameter(finite_params, radial_points):
+    galaxy, gas = finite_params
+    with pytest.raises(ValueError):
+        IncrementalSolver(radial_points, galaxy, gas).solve(B1=1.0)
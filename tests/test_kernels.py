@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from galactic_dynamics.kernels import evaluate_profiles, PROFILE_FIELDS
+from galactic_dynamics.mass_models import MassProfile, mass_density
+from galactic_dynamics.gas_models import gas_density, turbulence_pressure
+from galactic_dynamics.magnetic_models import magnetic_field_strength, magnetic_pressure
+from galactic_dynamics.cosmic_ray_models import cosmic_ray_pressure, cosmic_ray_gradient
+from galactic_dynamics.velocity_solver import ForceTable
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def galaxy_params():
+    return (3e3*pc, 5e10*M_sun, 500*pc, 1e10*M_sun, 20e3*pc, 1e12*M_sun)
+
+@pytest.fixture
+def gas_params():
+    return (4e3*pc, 1e10*M_sun, 1e4, 1e4, 1e-10, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(100e3*pc), 100)
+
+def test_numpy_backend_matches_profiles(galaxy_params, gas_params, radial_points):
+    r_g, M_g, T, v_turb, B0, r_B, _, P_cr0, r_cr, _ = gas_params
+    out = evaluate_profiles(radial_points, galaxy_params, gas_params, backend='numpy')
+    fields = dict(zip(PROFILE_FIELDS, out))
+    assert np.allclose(fields['mass_density'], mass_density(radial_points, galaxy_params))
+    assert np.allclose(fields['gas_density'], gas_density(radial_points, r_g, M_g))
+    assert np.allclose(fields['turbulence_pressure'], turbulence_pressure(radial_points, r_g, M_g, v_turb))
+    assert np.allclose(fields['magnetic_pressure'], magnetic_pressure(magnetic_field_strength(radial_points, B0, r_B)))
+    assert np.allclose(fields['cosmic_ray_pressure'], cosmic_ray_pressure(radial_points, P_cr0, r_cr))
+    assert np.allclose(fields['cosmic_ray_gradient'], cosmic_ray_gradient(radial_points, P_cr0, r_cr))
+
+def test_numba_backend_matches_numpy(galaxy_params, gas_params, radial_points):
+    pytest.importorskip("numba")
+    fused = evaluate_profiles(radial_points, galaxy_params, gas_params, backend='numba')
+    reference = evaluate_profiles(radial_points, galaxy_params, gas_params, backend='numpy')
+    assert np.allclose(fused, reference, rtol=1e-12, atol=0), "Fused kernel should reproduce the NumPy profiles"
+
+def test_evaluate_profiles_fills_caller_buffer(galaxy_params, gas_params, radial_points):
+    out = np.empty((len(PROFILE_FIELDS), len(radial_points)))
+    assert evaluate_profiles(radial_points, galaxy_params, gas_params, out=out) is out
+    batch = evaluate_profiles(radial_points, np.array([galaxy_params] * 2), np.array([gas_params] * 2))
+    assert batch.shape == (len(PROFILE_FIELDS), 2, len(radial_points))
+    assert np.allclose(batch[:, 1], out)
+    with pytest.raises(ValueError):
+        evaluate_profiles(radial_points, galaxy_params, gas_params, out=np.empty((3, len(radial_points))))
+    with pytest.raises(ValueError):
+        evaluate_profiles(radial_points, galaxy_params, gas_params, out=np.empty((len(radial_points), len(PROFILE_FIELDS))))
+
+def test_tables_match_across_backends(galaxy_params, gas_params):
+    pytest.importorskip("numba")
+    mass = MassProfile(galaxy_params, n_grid=500, integrate=True)
+    fused = MassProfile(galaxy_params, n_grid=500, integrate=True, backend='numba')
+    assert np.allclose(fused.mass, mass.mass, rtol=1e-12, atol=0)
+    forces = ForceTable(gas_params, n_grid=500)
+    fused = ForceTable(gas_params, n_grid=500, backend='numba')
+    assert np.allclose(fused.values, forces.values, rtol=1e-12, atol=0)
+    assert np.allclose(fused.derivatives, forces.derivatives, rtol=1e-12, atol=0)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from galactic_dynamics.likelihood import RotationCurveLikelihood
+from galactic_dynamics.velocity_solver import solve_velocity
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 40)
+
+@pytest.fixture
+def walkers(finite_params):
+    galaxy, gas = finite_params
+    theta = np.tile(galaxy + gas, (8, 1))
+    theta[:, 1] *= np.linspace(0.9, 1.1, 8)
+    return theta
+
+def test_likelihood_matches_single_solves(finite_params, radial_points, walkers):
+    galaxy, gas = finite_params
+    v_obs = solve_velocity(radial_points, galaxy, gas, method='adaptive')
+    sigma = 0.05 * v_obs
+    likelihood = RotationCurveLikelihood(radial_points, v_obs, sigma, method='adaptive')
+    log_prob = likelihood(walkers)
+    assert log_prob.shape == (8,)
+    for theta, value in zip(walkers, log_prob):
+        v = solve_velocity(radial_points, tuple(theta[:6]), tuple(theta[6:]), method='adaptive')
+        expected = -0.5 * np.sum(((v - v_obs) / sigma)**2) - np.sum(np.log(np.sqrt(2 * np.pi) * sigma))
+        assert np.isclose(value, expected, rtol=1e-3)
+        assert np.isclose(likelihood(theta), value, rtol=1e-3)
+
+def test_likelihood_peaks_at_truth(finite_params, radial_points, walkers):
+    galaxy, gas = finite_params
+    v_obs = solve_velocity(radial_points, galaxy, gas, method='adaptive')
+    likelihood = RotationCurveLikelihood(radial_points, v_obs, 0.05 * v_obs, method='adaptive')
+    log_prob = likelihood(np.vstack([walkers, galaxy + gas]))
+    assert np.argmax(log_prob) == len(walkers)
+
+def test_likelihood_rejects_invalid_walkers(finite_params, radial_points, walkers):
+    galaxy, gas = finite_params
+    v_obs = solve_velocity(radial_points, galaxy, gas, method='adaptive')
+    likelihood = RotationCurveLikelihood(radial_points, v_obs, 0.05 * v_obs, method='adaptive',
+                                         log_prior=lambda theta: np.where(theta[:, 1] > galaxy[1], -np.inf, 0.0))
+    walkers[0, 0] = -1.0
+    log_prob = likelihood(walkers)
+    assert log_prob[0] == -np.inf
+    assert np.all(log_prob[walkers[:, 1] > galaxy[1]] == -np.inf)
+    assert np.all(np.isfinite(log_prob[1:][walkers[1:, 1] <= galaxy[1]]))
+    with pytest.raises(ValueError):
+        likelihood(walkers[:, :15])
+
+def test_likelihood_on_integration_grid(finite_params, radial_points):
+    galaxy, gas = finite_params
+    r_grid = np.logspace(np.log10(100*pc), np.log10(50e3*pc), 400)
+    v_fine = solve_velocity(r_grid, galaxy, gas, method='adaptive')
+    r_obs = r_grid[::10]
+    likelihood = RotationCurveLikelihood(r_obs, v_fine[::10], 0.05 * v_fine[::10], method='adaptive',
+                                         r_grid=r_grid)
+    assert np.allclose(likelihood.model_velocity(np.array([galaxy + gas]))[0], v_fine[::10])
+
+def test_likelihood_isolates_divergent_walker(finite_params, radial_points, walkers):
+    galaxy, gas = finite_params
+    v_obs = solve_velocity(radial_points, galaxy, gas, method='adaptive')
+    likelihood = RotationCurveLikelihood(radial_points, v_obs, 0.05 * v_obs, method='adaptive')
+    expected = likelihood(walkers)
+    walkers[3, 1] *= 1e30
+    log_prob = likelihood(walkers)
+    assert log_prob[3] == -np.inf
+    assert np.all(np.isfinite(np.delete(log_prob, 3)))
+    assert np.allclose(np.delete(log_prob, 3), np.delete(expected, 3), rtol=1e-3)
@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from galactic_dynamics.magnetic_models import magnetic_field_strength, magnetic_pressure, magnetic_reconnection_heating
+from galactic_dynamics.magnetic_models import magnetic_field_strength, magnetic_pressure, magnetic_pressure_gradient, magnetic_reconnection_heating
 from galactic_dynamics.constants import pc
 
 @pytest.fixture
@@ -28,4 +28,10 @@ def test_magnetic_reconnection_heating(magnetic_params):
     B = magnetic_field_strength(r, B0, r_B)
     heating = magnetic_reconnection_heating(r, B, reconnection_rate)
     assert np.all(heating > 0), "Magnetic reconnection heating should be positive"
-    assert heating[0] > heating[-1], "Magnetic reconnection heating should decrease with radius"
\ No newline at end of file
+    assert heating[0] > heating[-1], "Magnetic reconnection heating should decrease with radius"
+
+def test_magnetic_pressure_gradient(magnetic_params):
+    r = np.logspace(np.log10(100*pc), np.log10(100e3*pc), 2000)
+    B0, r_B, _ = magnetic_params
+    numerical = np.gradient(magnetic_pressure(magnetic_field_strength(r, B0, r_B)), r)
+    assert np.allclose(magnetic_pressure_gradient(r, B0, r_B)[1:-1], numerical[1:-1], rtol=1e-3)
@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from galactic_dynamics.mass_models import mass_density, enclosed_mass, analytical_mass
+from galactic_dynamics.mass_models import mass_density, enclosed_mass, analytical_mass, MassProfile, get_mass_profile
 from galactic_dynamics.constants import pc, M_sun
 
 @pytest.fixture
@@ -49,4 +49,43 @@ def test_specific_radii(galaxy_params):
     # At 10*r_h, should have almost all mass
     total_mass = sum(galaxy_params[1::2])
     mass_at_10rh = enclosed_mass(np.array([10*r_h]), galaxy_params)[0]
-    assert np.isclose(mass_at_10rh, total_mass, rtol=0.01), f"Mass at 10*r_h should be close to total mass. Expected {total_mass}, got {mass_at_10rh}"
\ No newline at end of file
+    assert np.isclose(mass_at_10rh, total_mass, rtol=0.01), f"Mass at 10*r_h should be close to total mass. Expected {total_mass}, got {mass_at_10rh}"
+
+def test_enclosed_mass_matches_quadrature(galaxy_params):
+    from scipy.integrate import quad
+    r = np.array([500*pc, 3e3*pc, 30e3*pc])
+    mass = enclosed_mass(r, galaxy_params)
+    expected = [quad(lambda x: 4 * np.pi * x**2 * mass_density(x, galaxy_params), r.min() / 10, ri, limit=200)[0]
+                for ri in r]
+    assert np.allclose(mass, expected, rtol=1e-4), "Cumulative integration should match adaptive quadrature"
+
+def test_enclosed_mass_analytic_matches_integral(galaxy_params):
+    from scipy.integrate import quad
+    r = np.logspace(np.log10(100*pc), np.log10(100e3*pc), 10)
+    exact = enclosed_mass(r, galaxy_params, analytic=True)
+    expected = [quad(lambda x: 4 * np.pi * x**2 * mass_density(x, galaxy_params), 0, ri, limit=200)[0] for ri in r]
+    assert np.allclose(exact, expected, rtol=1e-8), "Closed form should integrate mass_density exactly"
+
+
+def test_mass_profile_matches_quadrature(galaxy_params):
+    from scipy.integrate import quad
+    r = np.array([100*pc, 3e3*pc, 30e3*pc])
+    profile = MassProfile(galaxy_params)
+    expected = [quad(lambda x: 4 * np.pi * x**2 * mass_density(x, galaxy_params), 0, ri, limit=200)[0] for ri in r]
+    assert np.allclose(profile(r), expected, rtol=1e-4), "Tabulated profile should match direct integration"
+    assert np.allclose(profile.mass, MassProfile(galaxy_params, integrate=True).mass, rtol=1e-3), \
+        "Closed-form and integrated tables should agree up to the core model of the integration"
+    assert np.ndim(profile(r[0])) == 0, "Scalar radius should give a scalar mass"
+
+def test_get_mass_profile_is_cached(galaxy_params):
+    profile = get_mass_profile(galaxy_params)
+    assert get_mass_profile(list(galaxy_params)) is profile, "Profiles should be shared between calls with equal parameters"
+    assert not profile.mass.flags.writeable, "Shared tables should be read-only"
+
+
+def test_mass_density_batch(galaxy_params):
+    r = np.logspace(np.log10(100*pc), np.log10(100e3*pc), 100)
+    batch = np.array([galaxy_params, galaxy_params]) * np.array([[1.0], [2.0]])
+    density = mass_density(r, batch)
+    assert density.shape == (2, len(r)), "Batched parameters should add a leading model axis"
+    assert np.allclose(density[1], mass_density(r, tuple(batch[1])))
@@ -0,0 +1,82 @@
+import os
+import numpy as np
+import pytest
+from galactic_dynamics.parameters import (GalaxyParams, GasParams, GalaxyBatch, GasBatch, load_parameters,
+                                          save_parameters)
+from galactic_dynamics.velocity_solver import solve_velocity, solve_velocity_batch
+from galactic_dynamics.mass_models import mass_density, enclosed_mass
+from galactic_dynamics.gas_models import gas_density
+from galactic_dynamics.constants import pc, M_sun
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), os.pardir, "data", "example_galaxy_parameters.json")
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(50e3*pc), 40)
+
+def test_params_behave_like_tuples(finite_params):
+    galaxy, gas = finite_params
+    params = GalaxyParams(*galaxy)
+    r_d, M_d, r_b, M_b, r_h, M_h = params
+    assert (r_d, M_h) == (galaxy[0], galaxy[5])
+    assert tuple(params) == galaxy
+    assert params[1] == params.M_d == galaxy[1]
+    assert np.array_equal(np.asarray(GasParams(*gas)), gas)
+    with pytest.raises(AttributeError):
+        params.extra = 1.0
+    with pytest.raises(Exception):
+        params.M_d = 1.0
+
+def test_params_validation(finite_params):
+    galaxy, gas = finite_params
+    with pytest.raises(ValueError, match="M_d"):
+        GalaxyParams(galaxy[0], -1.0, *galaxy[2:])
+    with pytest.raises(ValueError, match="B0"):
+        GasParams(*gas[:4], np.nan, *gas[5:])
+    assert GasParams(*gas[:9], 1e3).v_flow == 1e3
+    with pytest.raises(ValueError):
+        GalaxyBatch(np.ones((3, 5)))
+
+def test_params_accepted_by_models(finite_params, radial_points):
+    galaxy, gas = finite_params
+    galaxy_obj, gas_obj = GalaxyParams(*galaxy), GasParams(*gas)
+    assert np.array_equal(mass_density(radial_points, galaxy_obj), mass_density(radial_points, galaxy))
+    assert np.array_equal(enclosed_mass(radial_points, galaxy_obj), enclosed_mass(radial_points, galaxy))
+    assert np.array_equal(solve_velocity(radial_points, galaxy_obj, gas_obj, method='adaptive'),
+                          solve_velocity(radial_points, galaxy, gas, method='adaptive'))
+
+def test_batches_accepted_by_solver(finite_params, radial_points):
+    galaxy, gas = finite_params
+    galaxy_batch = GalaxyBatch.from_columns(**dict(zip(GalaxyParams.NAMES, galaxy)) | {'M_d': [0.9 * galaxy[1], galaxy[1]]})
+    gas_batch = GasBatch.from_params([GasParams(*gas)] * 2)
+    assert len(galaxy_batch) == 2 and galaxy_batch.data.flags.c_contiguous
+    assert np.array_equal(galaxy_batch.M_d, [0.9 * galaxy[1], galaxy[1]])
+    assert tuple(galaxy_batch[1]) == galaxy
+    v = solve_velocity(radial_points, galaxy_batch, gas_batch, method='adaptive')
+    assert np.array_equal(v, solve_velocity_batch(radial_points, galaxy_batch.data, gas_batch.data, method='adaptive'))
+    assert mass_density(radial_points, galaxy_batch).shape == (2, len(radial_points))
+    r_g, M_g, *_ = gas_batch.split(1)
+    assert gas_density(radial_points, r_g, M_g).shape == (2, len(radial_points))
+
+def test_load_example_parameters():
+    galaxy, gas = load_parameters(DATA_FILE)
+    assert isinstance(galaxy, GalaxyParams) and isinstance(gas, GasParams)
+    assert galaxy.M_h == 1e42 and gas.v_flow == -1e3
+
+@pytest.mark.parametrize("suffix", [".json", ".npz"])
+def test_save_load_round_trip(tmp_path, finite_params, suffix):
+    galaxy, gas = finite_params
+    path = os.fspath(tmp_path / f"params{suffix}")
+    save_parameters(path, GalaxyParams(*galaxy), GasParams(*gas))
+    assert load_parameters(path) == (GalaxyParams(*galaxy), GasParams(*gas))
+    batch = GalaxyBatch(np.tile(galaxy, (3, 1))), GasBatch(np.tile(gas, (3, 1)))
+    save_parameters(path, *batch)
+    galaxy_batch, gas_batch = load_parameters(path)
+    assert isinstance(galaxy_batch, GalaxyBatch) and len(gas_batch) == 3
+    assert np.array_equal(galaxy_batch.data, batch[0].data)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from scipy.integrate import quad
+from galactic_dynamics.profiles import (COMPONENTS, DEFAULT_MODEL, Component, MassModel, TabulatedComponent,
+                                        _cached_density_spline, _cached_mass_table, _gamma2, _halo_mass,
+                                        get_component)
+from galactic_dynamics.mass_models import enclosed_mass, enclosed_mass_gradient, mass_density, mass_density_gradient
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def galaxy_params():
+    return (3e3*pc, 5e10*M_sun, 500*pc, 1e10*M_sun, 20e3*pc, 1e12*M_sun)
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(100e3*pc), 50)
+
+@pytest.mark.parametrize('name', sorted(COMPONENTS))
+def test_component_closed_forms(name):
+    component = get_component(name)
+    params = (2e3*pc, 1e11*M_sun)
+    r = np.array([50*pc, 1e3*pc, 2e3*pc, 30e3*pc])
+    expected = [quad(lambda x: 4 * np.pi * x**2 * component.density(x, *params), 0, ri, limit=200)[0] for ri in r]
+    assert np.allclose(component.enclosed_mass(r, *params), expected, rtol=1e-7)
+    h = 1e-6 * r
+    numeric = (component.density(r + h, *params) - component.density(r - h, *params)) / (2 * h)
+    assert np.allclose(component.density_gradient(r, *params), numeric, rtol=1e-6)
+
+def test_default_model_matches_mass_density(galaxy_params, radial_points):
+    assert DEFAULT_MODEL.analytic
+    assert np.allclose(DEFAULT_MODEL.density(radial_points, galaxy_params), mass_density(radial_points, galaxy_params))
+    assert np.allclose(DEFAULT_MODEL.density_gradient(radial_points, galaxy_params),
+                       mass_density_gradient(radial_points, galaxy_params))
+    assert np.allclose(enclosed_mass(radial_points, galaxy_params, model=DEFAULT_MODEL),
+                       enclosed_mass_gradient(radial_points, galaxy_params)[0])
+    batch = np.array(galaxy_params) * np.array([[1.0], [1.2]])
+    assert np.allclose(DEFAULT_MODEL.enclosed_mass(radial_points, batch)[1],
+                       DEFAULT_MODEL.enclosed_mass(radial_points, batch[1]))
+
+def test_numerical_components_are_cached(radial_points):
+    einasto = Component('einasto', ('r_s', 'rho_s'), lambda r, a, rho: rho * np.exp(-2 / 0.17 * ((r / a)**0.17 - 1)))
+    model = MassModel([einasto, 'nfw'])
+    assert not model.analytic
+    params = (20e3*pc, 1e-22, 15e3*pc, 1e11*M_sun)
+    
+    _cached_mass_table.cache_clear()
+    mass = model.enclosed_mass(radial_points, params)
+    model.enclosed_mass(radial_points[::2], params)
+    info = _cached_mass_table.cache_info()
+    assert info.misses == 1 and info.hits == 1, "Only the component without a closed form is integrated, once"
+    
+    expected = [quad(lambda x: 4 * np.pi * x**2 * model.density(x, params), 0, ri, limit=200)[0]
+                for ri in radial_points[::7]]
+    assert np.allclose(mass[::7], expected, rtol=1e-4)
+    _cached_density_spline.cache_clear()
+    assert np.allclose(einasto.density_gradient(radial_points, *params[:2]),
+                       np.gradient(einasto.density(radial_points, *params[:2]), radial_points), rtol=0.05)
+    einasto.density_gradient(radial_points[::2], *params[:2])
+    assert _cached_density_spline.cache_info().misses == 1, "The gradient spline should be built once"
+
+def test_closed_forms_near_centre():
+    # Integrals of s^2 exp(-s) and u^2 / (1 + u)^2, which both start as x^3 / 3
+    x = np.array([1e-8, 1e-5, 1e-3])
+    assert np.allclose(_gamma2(x), x**3 / 3 - x**4 / 4 + x**5 / 10 - x**6 / 36, rtol=1e-11, atol=0)
+    assert np.allclose(_halo_mass(x), x**3 / 3 - x**4 / 2 + 3 * x**5 / 5 - 2 * x**6 / 3, rtol=1e-11, atol=0)
+
+def test_mass_gradient_near_centre(galaxy_params):
+    r = np.array([1e-6, 1e-3]) * pc
+    mass, gradient = enclosed_mass_gradient(r, galaxy_params)
+    assert np.allclose(mass, DEFAULT_MODEL.enclosed_mass(r, galaxy_params), rtol=1e-13, atol=0)
+    r_d, M_d = galaxy_params[:2]
+    x = r / r_d
+    # d/dr_d of the leading term 2 M_d r^3 / (3 r_d^2)
+    assert np.allclose(gradient[0], -4 / 3 * M_d * x**3 * (1 - 9 / 8 * x), rtol=1e-8, atol=0)
+
+def test_tabulated_component(radial_points):
+    nfw = get_component('nfw')
+    grid = np.geomspace(1*pc, 1e6*pc, 400)
+    tabulated = TabulatedComponent('observed_halo', grid, nfw.density(grid, 15e3*pc, 1e11*M_sun))
+    model = MassModel([tabulated])
+    assert np.allclose(model.density(radial_points, ()), nfw.density(radial_points, 15e3*pc, 1e11*M_sun), rtol=1e-6)
+    assert np.allclose(model.density_gradient(radial_points, ()),
+                       nfw.density_gradient(radial_points, 15e3*pc, 1e11*M_sun), rtol=1e-4)
+    assert np.allclose(model.enclosed_mass(radial_points, ()), nfw.enclosed_mass(radial_points, 15e3*pc, 1e11*M_sun),
+                       rtol=1e-4)
+
+def test_unknown_component():
+    with pytest.raises(ValueError):
+        MassModel(['exponential_disk', 'plummer'])
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from galactic_dynamics import profiling
+from galactic_dynamics.profiling import profile_solver, SolverProfile
+from galactic_dynamics.velocity_solver import solve_velocity, total_acceleration, ForceTable, get_force_table
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def finite_params():
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(100e3*pc), 50)
+
+def test_profile_counts_rk4_calls(finite_params, radial_points):
+    galaxy, gas = finite_params
+    with profile_solver() as profile:
+        v = solve_velocity(radial_points, galaxy, gas, method='rk4')
+    n_steps = len(radial_points) - 1
+    assert profile.steps['rk4'] == {'nstep': n_steps, 'nfev': 4 * n_steps}
+    assert profile.calls['total_acceleration'] == 4 * n_steps
+    for name in ('enclosed_mass', 'grav', 'gm') + ForceTable.COMPONENTS:
+        assert profile.calls[name] == 4 * n_steps
+    assert sum(profile.times[name] for name in ForceTable.COMPONENTS) <= profile.times['total_acceleration']
+    assert np.allclose(v, solve_velocity(radial_points, galaxy, gas, method='rk4'), rtol=1e-10)
+
+def test_profile_records_adaptive_statistics(finite_params, radial_points):
+    galaxy, gas = finite_params
+    with profile_solver() as profile:
+        _, info = solve_velocity(radial_points, galaxy, gas, method='adaptive', full_output=True)
+    assert profile.steps['adaptive'] == info
+    assert profile.calls['total_acceleration'] == info['nfev']
+
+def test_profile_records_odeint_statistics(finite_params, radial_points):
+    galaxy, gas = finite_params
+    with profile_solver() as profile:
+        solve_velocity(radial_points, galaxy, gas, method='odeint')
+    assert profile.steps['odeint']['nstep'] > 0
+    assert profile.calls['total_acceleration'] >= profile.steps['odeint']['nfev']
+
+def test_profile_splits_legacy_terms(finite_params):
+    galaxy, gas = finite_params
+    with profile_solver() as profile:
+        a = total_acceleration(5e3*pc, 1e3, galaxy, gas)
+    assert np.isclose(a, total_acceleration(5e3*pc, 1e3, galaxy, gas))
+    for name in ('enclosed_mass', 'grav', 'gm', 'pressure', 'turb', 'magnetic', 'cr', 'reconnection', 'flow'):
+        assert profile.calls[name] == 1
+
+def test_profile_components_match_table(finite_params, radial_points):
+    _, gas = finite_params
+    table = get_force_table(gas)
+    total = sum(table.component(name, radial_points, 1e3) for name in ForceTable.COMPONENTS)
+    assert np.allclose(total, table(radial_points, 1e3))
+
+def test_profile_disabled_outside_context(finite_params, radial_points):
+    galaxy, gas = finite_params
+    outer = SolverProfile()
+    with profile_solver(outer):
+        with profile_solver() as inner:
+            solve_velocity(radial_points, galaxy, gas, method='rk4')
+        assert profiling._active.get() is outer
+    assert profiling._active.get() is None
+    assert outer.calls == {}
+    assert 'total_acceleration' in inner.report()
+    assert inner.as_dict()['steps']['rk4']['nstep'] == len(radial_points) - 1
+
+def test_profile_is_local_to_thread(finite_params, radial_points):
+    galaxy, gas = finite_params
+    with profile_solver() as profile:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(solve_velocity, radial_points, galaxy, gas, 'rk4').result()
+        assert profile.calls == {}
+        solve_velocity(radial_points, galaxy, gas, method='rk4')
+    assert profile.steps['rk4']['nstep'] == len(radial_points) - 1
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from galactic_dynamics.storage import write_results, open_results
+from galactic_dynamics.velocity_solver import solve_velocity_batch
+from galactic_dynamics.mass_models import MassProfile
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def parameter_batch():
+    galaxy = np.tile([3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun], (7, 1))
+    galaxy[:, 1::2] *= np.linspace(0.8, 1.2, 7)[:, None]
+    gas = np.tile([4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3], (7, 1))
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(100e3*pc), 50)
+
+def test_write_results_matches_batch_solver(tmp_path, parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    store = write_results(tmp_path / "run", radial_points, galaxy, gas, chunk_size=3)
+    assert isinstance(store.velocity, np.memmap)
+    assert store.velocity.shape == (7, len(radial_points))
+    assert np.allclose(store.velocity, solve_velocity_batch(radial_points, galaxy, gas))
+    assert np.allclose(store.enclosed_mass[:3], MassProfile(galaxy[:3])(radial_points))
+    assert np.array_equal(store.r, radial_points)
+
+def test_write_results_float32(tmp_path, parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    write_results(tmp_path / "run", radial_points, galaxy, gas, dtype=np.float32, store_mass=False)
+    store = open_results(tmp_path / "run")
+    assert store.velocity.dtype == np.float32
+    assert store.enclosed_mass is None
+    v = solve_velocity_batch(radial_points, galaxy, gas)
+    assert np.allclose(store.velocity, v, rtol=1e-6, atol=1e-6 * np.abs(v).max())
+    selected = store[2:4]
+    assert selected['velocity'].shape == (2, len(radial_points))
+    assert np.array_equal(selected['galaxy_params'], galaxy[2:4])
+
+def test_open_results_is_read_only(tmp_path, parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    write_results(tmp_path / "run", radial_points, galaxy, gas)
+    store = open_results(tmp_path / "run")
+    with pytest.raises(ValueError):
+        store.velocity[0, 0] = 0
+
+def test_interrupted_write_keeps_previous_results(tmp_path, parameter_batch, radial_points, monkeypatch):
+    galaxy, gas = parameter_batch
+    write_results(tmp_path / "run", radial_points, galaxy, gas)
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr("galactic_dynamics.storage.solve_velocity_batch", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        write_results(tmp_path / "run", radial_points, galaxy[:2], gas[:2], store_mass=False)
+    store = open_results(tmp_path / "run")
+    assert len(store) == 7 and store.enclosed_mass is not None
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run"]
+
+def test_overwrite_replaces_store(tmp_path, parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    write_results(tmp_path / "run", radial_points, galaxy, gas)
+    store = write_results(tmp_path / "run", radial_points, galaxy[:2], gas[:2], store_mass=False)
+    assert len(store) == 2 and store.enclosed_mass is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run"]
@@ -0,0 +1,80 @@
+import os
+import numpy as np
+import pytest
+from galactic_dynamics.parameter_sweep import _solve_chunk, _to_shared, sweep
+from galactic_dynamics.mass_models import MassProfile
+from galactic_dynamics.velocity_solver import ForceTable, solve_velocity_batch
+from galactic_dynamics.constants import pc, M_sun
+
+@pytest.fixture
+def parameter_batch():
+    galaxy = np.tile([3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun], (12, 1))
+    galaxy[:, 1::2] *= np.linspace(0.8, 1.2, 12)[:, None]
+    gas = np.tile([4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3], (12, 1))
+    return galaxy, gas
+
+@pytest.fixture
+def radial_points():
+    return np.logspace(np.log10(100*pc), np.log10(100e3*pc), 50)
+
+def test_sweep_matches_batch_solver(parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    v_sweep = sweep(radial_points, galaxy, gas, n_workers=2, chunk_size=5)
+    v_batch = solve_velocity_batch(radial_points, galaxy, gas)
+    assert v_sweep.shape == (12, len(radial_points))
+    assert np.allclose(v_sweep, v_batch), "Parallel sweep should reproduce the batched solve"
+
+def test_sweep_single_worker(parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    v_sweep = sweep(radial_points, galaxy, gas, n_workers=1)
+    assert np.allclose(v_sweep, solve_velocity_batch(radial_points, galaxy, gas))
+
+def test_chunked_tables_match_batch_tables(parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    v_sweep = sweep(radial_points, galaxy, gas, n_workers=1, chunk_size=5)
+    assert np.array_equal(v_sweep, solve_velocity_batch(radial_points, galaxy, gas)), \
+        "Tables built per chunk should use the grid of the whole batch"
+
+@pytest.mark.parametrize('method', ['rk4', 'adaptive'])
+def test_thread_executor_matches_process(parameter_batch, radial_points, method):
+    galaxy, gas = parameter_batch
+    r = radial_points[radial_points <= 50e3*pc]
+    v_thread = sweep(r, galaxy, gas, method, n_workers=3, chunk_size=5, executor='thread')
+    v_process = sweep(r, galaxy, gas, method, n_workers=2, chunk_size=5, executor='process')
+    assert v_thread.shape == (12, len(r))
+    assert np.all(np.isfinite(v_thread))
+    assert np.allclose(v_thread, v_process)
+
+def test_process_sweep_with_tables(parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    profile, forces = MassProfile(galaxy), ForceTable(gas)
+    v_sweep = sweep(radial_points, galaxy, gas, n_workers=2, chunk_size=5, mass_profile=profile, force_table=forces)
+    assert np.allclose(v_sweep, solve_velocity_batch(radial_points, galaxy, gas, 'rk4', profile, forces))
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/maps'), reason="needs /proc/self/maps")
+def test_chunk_closes_shared_segments(parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    arrays = {'r': radial_points, 'galaxy_params': galaxy, 'gas_params': gas, 'out': np.zeros((12, len(radial_points)))}
+    segments = {name: _to_shared(array) for name, array in arrays.items()}
+    try:
+        specs = {name: (shm.name, shape, dtype) for name, (shm, shape, dtype) in segments.items()}
+        def mappings():
+            with open('/proc/self/maps') as f:
+                return sum(shm.name in line for line in f for shm, _, _ in segments.values())
+        before = mappings()
+        _solve_chunk(specs, 5, 10, 'rk4', (MassProfile._bounds(galaxy), ForceTable._bounds(gas)))
+        assert mappings() == before, "A task should not keep the segments mapped"
+        shm, shape, dtype = segments['out']
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        assert np.array_equal(out[5:10], sweep(radial_points, galaxy, gas, n_workers=1)[5:10])
+        assert not out[:5].any()
+        del out
+    finally:
+        for shm, _, _ in segments.values():
+            shm.close()
+            shm.unlink()
+
+def test_invalid_executor(parameter_batch, radial_points):
+    galaxy, gas = parameter_batch
+    with pytest.raises(ValueError):
+        sweep(radial_points, galaxy, gas, n_workers=2, executor='mpi')
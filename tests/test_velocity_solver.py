@@ -1,6 +1,8 @@
 import numpy as np
 import pytest
-from galactic_dynamics.velocity_solver import solve_velocity, solve_velocity_odeint, solve_velocity_rk4
+from galactic_dynamics.velocity_solver import (solve_velocity, solve_velocity_odeint, solve_velocity_rk4, solve_velocity_batch,
+                                               solve_velocity_adaptive, total_acceleration, ForceTable)
+from galactic_dynamics.mass_models import MassProfile
 from galactic_dynamics.constants import pc, M_sun, G
 
 @pytest.fixture
@@ -11,6 +13,13 @@ def galaxy_params():
 def gas_params():
     return (4e3*pc, 1e10*M_sun, 1e4, 1e4, 1e-10, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
 
+@pytest.fixture
+def finite_params():
+    # Scaled-down masses, turbulence and field strength keep the integration finite over the test grid
+    galaxy = (3e3*pc, 5e-22*M_sun, 500*pc, 1e-22*M_sun, 20e3*pc, 1e-20*M_sun)
+    gas = (4e3*pc, 1e10*M_sun, 1e4, 1e-2, 1e-14, 5e3*pc, 0.1, 1e-12, 10e3*pc, -1e3)
+    return galaxy, gas
+
 @pytest.fixture
 def radial_points():
     return np.logspace(np.log10(100*pc), np.log10(100e3*pc), 100)
@@ -41,4 +50,68 @@ def test_solve_velocity_keplerian_limit(galaxy_params, gas_params):
     v = solve_velocity(r, galaxy_params, gas_params, method='rk4')
     M_total = sum(galaxy_params[1::2])  # Sum of all mass components
     v_keplerian = np.sqrt(G * M_total / r)
-    assert np.allclose(v, v_keplerian, rtol=0.1), "Velocity should approach Keplerian limit at large radii"
\ No newline at end of file
+    assert np.allclose(v, v_keplerian, rtol=0.1), "Velocity should approach Keplerian limit at large radii"
+
+def test_solve_velocity_reuses_mass_profile(galaxy_params, gas_params, radial_points):
+    profile = MassProfile(galaxy_params)
+    v_default = solve_velocity(radial_points[:10], galaxy_params, gas_params)
+    v_profile = solve_velocity(radial_points[:10], galaxy_params, gas_params, mass_profile=profile)
+    assert np.allclose(v_default, v_profile), "An explicit mass profile should give the same result as the cached one"
+
+
+def test_solve_velocity_batch_matches_single(finite_params, radial_points):
+    galaxy, gas = finite_params
+    galaxy_batch = np.tile(galaxy, (3, 1))
+    galaxy_batch[:, 1::2] *= np.array([0.8, 1.0, 1.2])[:, None]
+    gas_batch = np.tile(gas, (3, 1))
+    gas_batch[:, 2] *= np.array([1.0, 2.0, 3.0])
+    v_batch = solve_velocity_batch(radial_points, galaxy_batch, gas_batch)
+    assert v_batch.shape == (3, len(radial_points))
+    for i in range(3):
+        v_single = solve_velocity(radial_points, tuple(galaxy_batch[i]), tuple(gas_batch[i]))
+        assert np.allclose(v_batch[i], v_single, rtol=1e-4), "Batched and single-model solves should agree"
+
+def test_solve_velocity_batch_invalid_shapes(galaxy_params, gas_params, radial_points):
+    with pytest.raises(ValueError):
+        solve_velocity_batch(radial_points, [galaxy_params], [gas_params, gas_params])
+
+
+def test_solve_velocity_adaptive_matches_odeint(finite_params, radial_points):
+    galaxy, gas = finite_params
+    v_adaptive, info = solve_velocity(radial_points, galaxy, gas, method='adaptive', rtol=1e-8, atol=1e-10, full_output=True)
+    v_odeint = solve_velocity(radial_points, galaxy, gas, method='odeint')
+    assert np.allclose(v_adaptive, v_odeint, rtol=1e-5, atol=1e-6 * np.abs(v_odeint).max()), "Adaptive and ODEINT solutions should agree"
+    assert info['nfev'] == 1 + 6 * (info['nstep'] + info['nreject']), "Every attempted step costs six RHS evaluations"
+
+def test_solve_velocity_adaptive_dense_output(finite_params, radial_points):
+    galaxy, gas = finite_params
+    r_fine = np.union1d(radial_points, np.logspace(np.log10(radial_points[0]), np.log10(radial_points[-1]), 5000))
+    v_coarse, info_coarse = solve_velocity_adaptive(radial_points, galaxy, gas, full_output=True)
+    v_fine, info_fine = solve_velocity_adaptive(r_fine, galaxy, gas, full_output=True)
+    assert info_fine['nfev'] == info_coarse['nfev'], "The step sequence should not depend on the output grid"
+    assert np.allclose(v_fine[np.isin(r_fine, radial_points)], v_coarse), "Dense output should not depend on the output grid"
+
+def test_solve_velocity_adaptive_batch(finite_params, radial_points):
+    galaxy, gas = finite_params
+    galaxy_batch = np.tile(galaxy, (2, 1))
+    galaxy_batch[1, 1::2] *= 1.1
+    v_batch = solve_velocity_batch(radial_points, galaxy_batch, np.tile(gas, (2, 1)), method='adaptive', rtol=1e-8, atol=1e-10)
+    v_single = solve_velocity_adaptive(radial_points, tuple(galaxy_batch[1]), gas, rtol=1e-8, atol=1e-10)
+    assert v_batch.shape == (2, len(radial_points))
+    assert np.allclose(v_batch[1], v_single, rtol=1e-5, atol=1e-6 * np.abs(v_single).max())
+
+
+def test_force_table_matches_analytic_terms(gas_params, radial_points):
+    table = ForceTable(gas_params)
+    static, heating = table.terms(radial_points)
+    exact = ForceTable._tabulate(radial_points, np.array(gas_params))[0]
+    assert np.allclose(static, exact[0], rtol=1e-5), "Interpolated static terms should match their analytic values"
+    assert np.allclose(heating, exact[1], rtol=1e-5), "Interpolated reconnection term should match its analytic value"
+
+def test_force_table_keeps_pointwise_physics(galaxy_params, gas_params):
+    r, v = 5e3*pc, 2e5
+    quiet_gas = gas_params[:3] + (0.0,) + gas_params[4:]
+    a_full = total_acceleration(r, v, galaxy_params, gas_params, force_table=ForceTable(gas_params))
+    a_quiet = total_acceleration(r, v, galaxy_params, quiet_gas, force_table=ForceTable(quiet_gas))
+    v_turb = gas_params[3]
+    assert np.isclose(a_full - a_quiet, v_turb**2 / gas_params[0], rtol=1e-6), "Turbulence should act at a single radius"